@@ -0,0 +1,53 @@
+# agents/agent_state.py
+
+from dataclasses import dataclass, field
+
+
+@dataclass(slots=True)
+class AgentState:
+    """
+    Supervisor가 관리하는 하위 에이전트 상태
+
+    진행률 갱신처럼 자주 바뀌는 필드를 dict 조회 대신 slot 속성으로 접근합니다.
+    """
+    status: str = "idle"
+    assigned_task: str = ""
+    progress: float = 0.0
+    results: dict = field(default_factory=dict)
+
+
+@dataclass(slots=True)
+class SupervisorAgentState:
+    """Supervisor 자신의 상태와 에이전트별 분석 결과"""
+    status: str = "active"
+    current_task: str = "initializing"
+    progress: float = 0.0
+    market_research_results: dict = field(default_factory=dict)
+    stock_analysis_results: dict = field(default_factory=dict)
+    geopolitical_analysis_results: dict = field(default_factory=dict)
+    report_draft: dict = field(default_factory=dict)
+
+
+def make_default_state():
+    """
+    기본 워크플로우 상태 생성
+
+    에이전트 상태는 dataclass로, 쿼리/출력 정보는 dict로 구성합니다.
+    """
+    return {
+        "supervisor": SupervisorAgentState(),
+        "market_researcher": AgentState(),
+        "stock_analyzer": AgentState(),
+        "geopolitical_analyst": AgentState(),
+        "report_compiler": AgentState(),
+        "query": {
+            "original_query": "",
+            "processed_query": {},
+            "has_geopolitical_component": False,
+            "has_trump_reference": False,
+        },
+        "output": {
+            "status": "not_started",
+            "final_report": ""
+        }
+    }
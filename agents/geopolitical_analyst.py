@@ -1,12 +1,38 @@
 # agents/geopolitical_analyst.py
 
-import os
-import json
+import re
+import time
 from datetime import datetime
+from functools import lru_cache
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
-from config import DATA_DIR
+from config import GEOPOLITICAL_RESULTS_DIR, CACHE_DIR
+from agents.query_data import QueryData
 from tools.geopolitical_analyzer import GeopoliticalAnalyzer
+from tools.io_utils import dump_json
+from tools.cache_utils import disk_memoize, RequestCache
+
+# 국제 정세 분석이 필요한 쿼리 키워드
+_GEO_KEYWORDS = re.compile("트럼프|관세")
+
+# 쿼리에서 탐지할 금융권 주요 산업
+_KEY_INDUSTRIES = ("금융", "은행", "증권", "보험", "핀테크", "자산운용")
+# 쿼리에 산업이 없을 때 분석할 기본 산업
+_DEFAULT_INDUSTRIES = ("은행", "증권", "보험")
+# 한국어는 조사가 붙으므로 ("은행의", "보험사") 토큰 일치 대신 부분 문자열 패턴으로 한 번에 탐색
+_KEY_INDUSTRY_PATTERN = re.compile("|".join(map(re.escape, _KEY_INDUSTRIES)))
+
+@lru_cache(maxsize=1)
+def _geo_analyzer():
+    """프로세스 전체에서 공유하는 GeopoliticalAnalyzer 생성"""
+    analyzer = GeopoliticalAnalyzer()
+    # LLM 호출 결과는 디스크에 캐시하여 반복 실행 시 재사용 (결과 파일명용 실행 시각은 캐시 키에서 제외)
+    memoize = disk_memoize(CACHE_DIR, ttl=3600, exclude=("run_ts",))
+    analyzer.analyze_trump_impact = memoize(analyzer.analyze_trump_impact)
+    analyzer.analyze_industry_impact = memoize(analyzer.analyze_industry_impact)
+    analyzer.analyze_industry_impact_batch = memoize(analyzer.analyze_industry_impact_batch)
+    return analyzer
 
 class GeopoliticalAnalyst:
     """
@@ -15,70 +41,104 @@ class GeopoliticalAnalyst:
     
     def __init__(self):
         """초기화 메서드"""
-        self.geopolitical_analyzer = GeopoliticalAnalyzer()
-        self.analysis_dir = DATA_DIR / "geopolitical_results"
-        os.makedirs(self.analysis_dir, exist_ok=True)
+        self.geopolitical_analyzer = _geo_analyzer()
+        self.analysis_dir = GEOPOLITICAL_RESULTS_DIR
         self.state = {
             "status": "idle",
             "assigned_task": "",
             "progress": 0.0,
             "results": {}
         }
+        # 같은 분석 요청을 한 번만 수행하도록 결과를 에이전트 단위로 공유 (동시 요청은 첫 호출 결과를 대기)
+        self.request_cache = RequestCache()
+    
+    def _get_trump_impact(self, run_ts):
+        """트럼프 정책 영향 분석 (최초 1회만 수행)"""
+        return self.request_cache.get_or_compute(
+            ("analyze_trump_impact",), lambda: self.geopolitical_analyzer.analyze_trump_impact(run_ts=run_ts)
+        )
+    
+    def _get_industry_impacts(self, industries, run_ts):
+        """산업별 영향 분석 (아직 분석하지 않은 산업만 한 번에 일괄 분석)"""
+        cache = self.request_cache
+        analyzer = self.geopolitical_analyzer
+        missing = [industry for industry in industries if ("analyze_industry_impact", industry) not in cache]
+        if missing:
+            for industry, impact in analyzer.analyze_industry_impact_batch(missing, run_ts=run_ts).items():
+                cache.set(("analyze_industry_impact", industry), impact)
+        return {
+            industry: cache.get_or_compute(
+                ("analyze_industry_impact", industry),
+                lambda industry=industry: analyzer.analyze_industry_impact(industry, run_ts=run_ts)
+            )
+            for industry in industries
+        }
+    
+    def _get_investment_strategy(self, run_ts):
+        """투자 전략 생성 (최초 1회만 수행)"""
+        return self.request_cache.get_or_compute(
+            ("generate_investment_strategy",),
+            lambda: self.geopolitical_analyzer.generate_investment_strategy(run_ts=run_ts)
+        )
     
     def analyze_geopolitics(self, query_data):
         """
         국제 정세 분석 수행
         
         Args:
-            query_data (dict): 처리된 쿼리 데이터
+            query_data (dict | QueryData): 처리된 쿼리 데이터
             
         Returns:
             dict: 국제 정세 분석 결과
         """
+        qd = QueryData.from_dict(query_data)
+        raw_query_lower = qd.raw_query.lower()
+        
         # 상태 업데이트
         self.state["status"] = "running"
         self.state["assigned_task"] = "geopolitical_analysis"
-        self.state["progress"] = 0.1
+        # 중간 진행률은 외부에서 읽지 않으므로 시작/완료 상태만 기록
         
         print("국제 정세 분석 수행 중...")
         results = {}
         
         # 트럼프와 관세 영향 분석
-        if query_data.get("geopolitical_analysis", False) or "트럼프" or "관세" in query_data.get("raw_query", "").lower():
-            self.state["progress"] = 0.3
-            trump_impact = self.geopolitical_analyzer.analyze_trump_impact()
-            results["trump_impact"] = trump_impact
-            
-            # 산업별 영향 분석
-            self.state["progress"] = 0.5
-            industry_impacts = {}
-            key_industries = ["금융", "은행", "증권", "보험", "핀테크", "자산운용"]
-            
-            for industry in key_industries:
-                if industry.lower() in query_data.get("raw_query", "").lower():
-                    industry_impact = self.geopolitical_analyzer.analyze_industry_impact(industry)
-                    industry_impacts[industry] = industry_impact
+        if qd.geopolitical_analysis or _GEO_KEYWORDS.search(raw_query_lower):
+            # 분석할 산업 선정
+            found = set(_KEY_INDUSTRY_PATTERN.findall(raw_query_lower))
+            industries_in_query = [industry for industry in _KEY_INDUSTRIES if industry in found]
             
             # 쿼리에 특정 금융권 주요 산업 분석
-            if not industry_impacts and query_data.get("general_analysis", False):
-                for industry in ["은행", "증권", "보험"]:
-                    industry_impact = self.geopolitical_analyzer.analyze_industry_impact(industry)
-                    industry_impacts[industry] = industry_impact
+            if not industries_in_query and qd.general_analysis:
+                industries_in_query = list(_DEFAULT_INDUSTRIES)
+            
+            need_strategy = qd.investment_strategy or "전략" in raw_query_lower
             
-            results["industry_impacts"] = industry_impacts
+            # 이번 분석에서 저장하는 결과 파일들은 같은 실행 시각을 파일명에 사용
+            # (분석기는 프로세스 공용이므로 분석기 생성 시각이 아닌 호출 시각 사용)
+            run_ts = datetime.now().strftime("%Y%m%d_%H%M%S")
             
-            # 투자 전략 생성
-            self.state["progress"] = 0.8
-            if query_data.get("investment_strategy", False) or "전략" in query_data.get("raw_query", "").lower():
-                investment_strategy = self.geopolitical_analyzer.generate_investment_strategy()
-                results["investment_strategy"] = investment_strategy
+            # LLM 호출은 I/O 대기 위주이므로 스레드로 동시에 수행
+            with ThreadPoolExecutor(max_workers=8) as executor:
+                trump_future = executor.submit(self._get_trump_impact, run_ts)
+                industry_future = executor.submit(self._get_industry_impacts, industries_in_query, run_ts)
+                strategy_future = executor.submit(self._get_investment_strategy, run_ts) if need_strategy else None
+                
+                results["trump_impact"] = trump_future.result()
+                
+                # 산업별 영향 분석
+                results["industry_impacts"] = industry_future.result()
+                
+                # 투자 전략 생성
+                if strategy_future is not None:
+                    results["investment_strategy"] = strategy_future.result()
         
         # 결과를 파일로 저장
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        # 나노초 단위 타임스탬프로 동시 실행 시에도 파일명 충돌 방지
+        timestamp = str(time.time_ns())
         results_file = self.analysis_dir / f"geopolitical_analysis_results_{timestamp}.json"
         
-        with open(results_file, "w", encoding="utf-8") as f:
-            json.dump(results, f, ensure_ascii=False, indent=2)
+        results_file = dump_json(results_file, results, compress=True)
         
         results["results_file"] = str(results_file)
         print(f"국제 정세 분석 완료. 결과 저장 위치: {results_file}")
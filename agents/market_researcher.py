@@ -1,12 +1,48 @@
 # agents/market_researcher.py
 
-import os
-import json
-from datetime import datetime
+import asyncio
+import re
+import time
+from functools import lru_cache
 from pathlib import Path
 
-from config import DATA_DIR, MARKET_REPORTS_DIR
-from tools.rag_tools import MarketTrendAnalyzer, FinancialRagToolkit
+from config import DATA_DIR, MARKET_REPORTS_DIR, CACHE_DIR
+from agents.query_data import QueryData
+from tools.rag_tools import MarketTrendAnalyzer, FinancialRagToolkit, has_search_results
+from tools.io_utils import NdjsonWriter
+from tools.cache_utils import disk_memoize
+
+# 쿼리 키워드 -> 투자 테마 매핑 (테마 순서는 분석 결과 순서)
+_THEME_KEYWORDS = {"AI": "AI", "인공지능": "AI", "빅데이터": "빅데이터", "핀테크": "핀테크"}
+_THEME_ORDER = ("AI", "빅데이터", "핀테크")
+_THEME_PATTERN = re.compile("|".join(map(re.escape, _THEME_KEYWORDS)), re.IGNORECASE)
+
+# 쿼리에 업종/테마가 없을 때 분석할 기본값
+_DEFAULT_SECTORS = ("은행", "증권", "보험")
+_DEFAULT_THEMES = ("핀테크", "AI")
+
+# 웹 검색 기반 분석 결과는 디스크에 캐시하여 반복 실행 시 재사용 (검색 결과가 하나도 없으면 저장하지 않음)
+_memoize = disk_memoize(CACHE_DIR, ttl=3600, should_cache=has_search_results)
+
+@lru_cache(maxsize=1)
+def _trend_analyzer():
+    """프로세스 전체에서 공유하는 MarketTrendAnalyzer 생성"""
+    # 툴킷과 같은 검색 도구(HTTP 세션)를 사용
+    analyzer = MarketTrendAnalyzer(_rag_toolkit().search_tool)
+    analyzer.analyze_market_trend = _memoize(analyzer.analyze_market_trend)
+    analyzer.analyze_sector_trend = _memoize(analyzer.analyze_sector_trend)
+    return analyzer
+
+@lru_cache(maxsize=1)
+def _rag_toolkit():
+    """프로세스 전체에서 공유하는 FinancialRagToolkit 생성"""
+    toolkit = FinancialRagToolkit()
+    toolkit.analyze_investment_theme = _memoize(toolkit.analyze_investment_theme)
+    # 최신 뉴스는 자주 바뀌지 않으므로 5분 동안만 재사용
+    toolkit.fetch_current_events = disk_memoize(CACHE_DIR, ttl=300, should_cache=has_search_results)(
+        toolkit.fetch_current_events
+    )
+    return toolkit
 
 class MarketResearcher:
     """
@@ -15,79 +51,112 @@ class MarketResearcher:
     
     def __init__(self):
         """초기화 메서드"""
-        self.trend_analyzer = MarketTrendAnalyzer()
-        self.rag_toolkit = FinancialRagToolkit()
+        self.trend_analyzer = _trend_analyzer()
+        self.rag_toolkit = _rag_toolkit()
         self.reports_dir = MARKET_REPORTS_DIR
-        os.makedirs(self.reports_dir, exist_ok=True)
     
     def analyze_market(self, query_data):
+        """
+        시장 분석 수행 (동기 호출용 래퍼)
+        
+        Args:
+            query_data (dict | QueryData): 처리된 쿼리 데이터
+            
+        Returns:
+            dict: 시장 분석 결과
+        """
+        return asyncio.run(self.analyze_market_async(query_data))
+    
+    def _record(self, writer, kind, name, func, arg):
+        """분석을 수행하고 결과를 즉시 NDJSON 레코드로 기록"""
+        data = func(arg)
+        writer.write({"kind": kind, "name": name, "data": data})
+        return data
+    
+    async def _run(self, writer, kind, name, func, arg):
+        """동기 분석기를 스레드에서 실행"""
+        return await asyncio.to_thread(self._record, writer, kind, name, func, arg)
+    
+    async def _gather_named(self, writer, kind, func, names):
+        """이름별 분석을 동시에 수행하여 {이름: 결과} 딕셔너리로 반환"""
+        outputs = await asyncio.gather(*(self._run(writer, kind, name, func, name) for name in names))
+        return dict(zip(names, outputs))
+    
+    async def _noop(self):
+        return None
+    
+    async def analyze_market_async(self, query_data):
         """
         시장 분석 수행
         
+        시장 트렌드, 업종, 테마, 최신 이벤트 분석은 서로 독립적인 네트워크 요청이므로
+        asyncio.gather로 동시에 수행합니다.
+        
         Args:
-            query_data (dict): 처리된 쿼리 데이터
+            query_data (dict | QueryData): 처리된 쿼리 데이터
             
         Returns:
             dict: 시장 분석 결과
         """
+        qd = QueryData.from_dict(query_data)
+        orig = qd.original_query
+        
         print("시장 분석 수행 중...")
         results = {}
         
+        # 분석할 업종 선정
+        sectors = []
+        if qd.sector_analysis:
+            # 같은 업종이 여러 번 지정되어도 한 번만 분석 (순서 유지)
+            sectors = list(dict.fromkeys(target["name"] for target in qd.targets if target["type"] == "sector"))
+            
+            # 타겟이 없는 경우 기본 업종 분석
+            if not sectors:
+                sectors = list(_DEFAULT_SECTORS)
+        
+        # 분석할 테마 선정
+        themes = []
+        if "테마" in orig:
+            found = {_THEME_KEYWORDS[keyword.upper()] for keyword in _THEME_PATTERN.findall(orig)}
+            themes = [theme for theme in _THEME_ORDER if theme in found]
+            
+            if not themes:
+                themes = list(_DEFAULT_THEMES)
+        
+        # 최신 이벤트는 최신성이 필요한 쿼리 또는 시장 분석에서만 검색
+        need_events = qd.current_events or qd.market_analysis
+        
+        # 결과는 분석이 끝나는 대로 NDJSON 파일에 한 줄씩 기록
+        # 나노초 단위 타임스탬프로 동시 실행 시에도 파일명 충돌 방지
+        timestamp = str(time.time_ns())
+        results_file = self.reports_dir / f"market_research_results_{timestamp}.ndjson"
+        
+        # 동기 분석기는 스레드에서 실행하고 네 그룹을 동시에 대기
+        with NdjsonWriter(results_file) as writer:
+            market_trend, sector_results, theme_results, current_events = await asyncio.gather(
+                self._run(writer, "market_trend", "금융시장", self.trend_analyzer.analyze_market_trend, "금융시장")
+                if qd.market_analysis else self._noop(),
+                self._gather_named(writer, "sector_trend", self.trend_analyzer.analyze_sector_trend, sectors),
+                self._gather_named(writer, "theme_analysis", self.rag_toolkit.analyze_investment_theme, themes),
+                self._run(writer, "current_events", "금융시장", self.rag_toolkit.fetch_current_events, "금융시장")
+                if need_events else self._noop()
+            )
+        
         # 시장 분석이 필요한 경우
-        if query_data.get("market_analysis", False):
-            market_trend = self.trend_analyzer.analyze_market_trend("금융시장")
+        if qd.market_analysis:
             results["market_trend"] = market_trend
         
         # 업종 분석이 필요한 경우
-        if query_data.get("sector_analysis", False):
-            sector_results = {}
-            
-            # 타겟 업종 분석
-            for target in query_data.get("targets", []):
-                if target["type"] == "sector":
-                    sector_name = target["name"]
-                    sector_trend = self.trend_analyzer.analyze_sector_trend(sector_name)
-                    sector_results[sector_name] = sector_trend
-            
-            # 타겟이 없는 경우 기본 업종 분석
-            if not sector_results and query_data.get("sector_analysis", False):
-                # 기본 업종 (은행, 증권, 보험) 분석
-                for sector in ["은행", "증권", "보험"]:
-                    sector_trend = self.trend_analyzer.analyze_sector_trend(sector)
-                    sector_results[sector] = sector_trend
-            
+        if qd.sector_analysis:
             results["sector_trends"] = sector_results
         
         # 테마 분석
-        if "테마" in query_data.get("original_query", "").lower():
-            themes = []
-            if "AI" in query_data.get("original_query", "").upper() or "인공지능" in query_data.get("original_query", ""):
-                themes.append("AI")
-            if "빅데이터" in query_data.get("original_query", ""):
-                themes.append("빅데이터")
-            if "핀테크" in query_data.get("original_query", ""):
-                themes.append("핀테크")
-            
-            if not themes:
-                themes = ["핀테크", "AI"]  # 기본 테마
-            
-            theme_results = {}
-            for theme in themes:
-                theme_analysis = self.rag_toolkit.analyze_investment_theme(theme)
-                theme_results[theme] = theme_analysis
-            
+        if themes:
             results["theme_analysis"] = theme_results
         
         # 최신 이벤트 검색
-        current_events = self.rag_toolkit.fetch_current_events("금융시장")
-        results["current_events"] = current_events
-        
-        # 결과를 파일로 저장
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        results_file = self.reports_dir / f"market_research_results_{timestamp}.json"
-        
-        with open(results_file, "w", encoding="utf-8") as f:
-            json.dump(results, f, ensure_ascii=False, indent=2)
+        if need_events:
+            results["current_events"] = current_events
         
         results["results_file"] = str(results_file)
         print(f"시장 분석 완료. 결과 저장 위치: {results_file}")
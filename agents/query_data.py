@@ -0,0 +1,45 @@
+# agents/query_data.py
+
+from dataclasses import dataclass, fields
+
+
+@dataclass(slots=True, frozen=True)
+class QueryData:
+    """
+    Supervisor가 파싱한 쿼리 데이터
+
+    에이전트 내부에서 반복 조회되는 필드를 dict.get 대신 속성으로 접근하기 위한 불변 객체입니다.
+    """
+    raw_query: str = ""
+    original_query: str = ""
+    market_analysis: bool = False
+    stock_analysis: bool = False
+    sector_analysis: bool = False
+    current_events: bool = False
+    geopolitical_analysis: bool = False
+    has_trump_reference: bool = False
+    investment_strategy: bool = False
+    general_analysis: bool = False
+    report_type: str = "pdf"
+    targets: tuple = ()
+
+    @classmethod
+    def from_dict(cls, data):
+        """
+        파싱된 쿼리 dict를 QueryData로 변환 (이미 QueryData면 그대로 반환)
+
+        Args:
+            data (dict | QueryData): 처리된 쿼리 데이터
+
+        Returns:
+            QueryData: 변환된 쿼리 데이터
+        """
+        if isinstance(data, cls):
+            return data
+        values = {name: data[name] for name in _FIELD_NAMES if name in data}
+        if "targets" in values:
+            values["targets"] = tuple(values["targets"])
+        return cls(**values)
+
+
+_FIELD_NAMES = tuple(f.name for f in fields(QueryData))
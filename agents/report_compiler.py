@@ -2,28 +2,313 @@
 
 import os
 import json
+import html
+import multiprocessing
+from functools import lru_cache
+from types import MappingProxyType
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
 from pathlib import Path
 import pandas as pd
+import matplotlib
+# GUI 백엔드 탐색을 피하기 위해 pyplot 임포트 전에 비대화형 백엔드 지정 (MPLBACKEND로 변경 가능)
+matplotlib.use(os.getenv("MPLBACKEND", "Agg"))
 import matplotlib.pyplot as plt
-import subprocess
-import tempfile
-import shutil
 
 from config import OUTPUTS_DIR, REPORTS_DIR, CHARTS_DIR
 from tools.visualizer import StockVisualizer
+from tools.io_utils import ensure_dir
+
+# PDF 보고서 스타일시트
+_REPORT_CSS = """
+@import url('https://fonts.googleapis.com/css2?family=Noto+Sans+KR:wght@400;700&display=swap');
+body {
+    font-family: 'Noto Sans KR', Arial, sans-serif;
+    line-height: 1.6;
+    color: #333;
+    max-width: 900px;
+    margin: 0 auto;
+    padding: 20px;
+    background-color: #f9f9f9;
+}
+h1 {
+    color: #0066cc;
+    border-bottom: 2px solid #0066cc;
+    padding-bottom: 10px;
+    margin-top: 30px;
+}
+h2 {
+    color: #0080ff;
+    border-bottom: 1px solid #0080ff;
+    padding-bottom: 5px;
+    margin-top: 25px;
+}
+h3 {
+    color: #0099ff;
+    margin-top: 20px;
+}
+table {
+    border-collapse: collapse;
+    width: 100%;
+    margin: 20px 0;
+}
+th, td {
+    border: 1px solid #ddd;
+    padding: 8px;
+    text-align: left;
+}
+th {
+    background-color: #f2f2f2;
+}
+img {
+    max-width: 100%;
+    height: auto;
+}
+.header {
+    text-align: center;
+    margin-bottom: 30px;
+}
+.footer {
+    text-align: center;
+    margin-top: 30px;
+    font-size: 0.9em;
+    color: #777;
+}
+"""
+
+@lru_cache(maxsize=1)
+def _pdf_runtime():
+    """
+    WeasyPrint 렌더링 자원을 프로세스당 한 번만 준비
+    
+    스타일시트 파싱과 웹 폰트 다운로드는 매 보고서마다 반복할 필요가 없으므로
+    HTML 클래스, 파싱된 CSS, FontConfiguration을 캐시하여 재사용합니다.
+    
+    Returns:
+        tuple: (HTML 클래스, 스타일시트 CSS 객체, FontConfiguration)
+    """
+    from weasyprint import HTML, CSS
+    from weasyprint.text.fonts import FontConfiguration
+    
+    font_config = FontConfiguration()
+    stylesheet = CSS(string=_REPORT_CSS, font_config=font_config)
+    return HTML, stylesheet, font_config
+
+# 차트 작업 프로세스별로 재사용하는 시각화 객체와 Axes
+_chart_worker = {}
+# 프로세스 풀을 사용하는 최소 차트 수. spawn 작업 프로세스는 pandas/matplotlib/numba/config를 다시 임포트하느라
+# 시작에 약 1.2초가 걸리고 차트 한 장은 약 0.16초에 그려지므로, 이보다 적으면 현재 프로세스에서 차례로 그림
+_PROCESS_POOL_MIN_CHARTS = 12
+
+def _render_comparison_chart(df, title, save_path):
+    """
+    성과 비교 차트 한 장을 그려 저장 (프로세스 풀에서 호출할 수 있도록 모듈 수준 함수)
+    
+    Returns:
+        str: 저장된 파일 경로 (실패 시 None)
+    """
+    try:
+        if not _chart_worker:
+            _, ax = plt.subplots(figsize=(12, 6), layout="constrained")
+            _chart_worker["visualizer"] = StockVisualizer()
+            _chart_worker["ax"] = ax
+        return _chart_worker["visualizer"].plot_stock_comparison(
+            df, title=title, save_path=save_path, ax=_chart_worker["ax"]
+        )
+    except Exception as e:
+        print(f"차트 생성 중 오류: {e}")
+        return None
+
+# 투자 전략 목록 섹션 (키, 마크다운 목록 뒤 빈 줄) - 출력 순서대로
+_STRATEGY_SECTIONS = (
+    ("단기 전략", "\n"),
+    ("중장기 전략", "\n"),
+    ("트럼프 정책 관련 전략", "\n"),
+    ("주목할 포인트", "\n\n"),
+)
+
+def _copy_template(template):
+    """읽기 전용 템플릿을 수정 가능한 dict로 복사 (튜플 값은 list로 변환)"""
+    return {k: list(v) if isinstance(v, tuple) else v for k, v in template.items()}
+
+def _results(section, key):
+    """분석 결과 dict에서 section[key]["결과"] 목록을 꺼냄 (없거나 None이면 빈 목록)"""
+    return (section.get(key) or {}).get("결과") or []
+
+@lru_cache(maxsize=1024)
+def _truncate(content, limit=100):
+    """내용을 limit자로 제한 (여러 섹션에 같은 검색 결과가 반복되므로 캐시)"""
+    return content if len(content) <= limit else content[:limit - 3] + "..."
+
+def _write_bytes(path, payload):
+    """
+    인코딩된 바이트를 TextIOWrapper 없이 write 시스템 콜로 기록
+    
+    임시 파일에 기록한 뒤 교체하므로 보고서 경로를 읽는 쪽에서 쓰다 만 파일을 보지 않습니다.
+    """
+    tmp = f"{path}.{os.getpid()}.tmp"
+    fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, "O_BINARY", 0), 0o644)
+    try:
+        view = memoryview(payload)
+        while view:
+            # 대용량 버퍼는 한 번에 모두 기록되지 않을 수 있으므로 남은 부분을 이어서 기록
+            view = view[os.write(fd, view):]
+    finally:
+        os.close(fd)
+    os.replace(tmp, path)
+
+def _esc(text):
+    """HTML 출력용 이스케이프"""
+    return html.escape(str(text), quote=True)
+
+@lru_cache(maxsize=256)
+def _heading_markup(fmt, level, text):
+    """제목 문자열 (섹션 제목은 매번 같으므로 한 번 만든 문자열을 재사용)"""
+    if fmt == "md":
+        return f"{'#' * level} {text}\n"
+    return f"<h{level}>{_esc(text)}</h{level}>\n"
+
+def _heading(parts, fmt, level, text, body=None):
+    """제목 (본문 한 줄이 바로 이어지는 경우 body 지정)"""
+    parts.append(_heading_markup(fmt, level, text))
+    if fmt == "md":
+        parts.append("\n" if body is None else f"{body}\n\n")
+    elif body is not None:
+        parts.append(f"<p>{_esc(body)}</p>\n")
+
+def _paragraph(parts, fmt, text, bold=False):
+    """문단"""
+    if fmt == "md":
+        parts.append(f"**{text}**\n\n" if bold else f"{text}\n\n")
+    else:
+        parts.append(f"<p><strong>{_esc(text)}</strong></p>\n" if bold else f"<p>{_esc(text)}</p>\n")
+
+def _list(parts, fmt, items, bold=False, prefix="", tail="\n"):
+    """글머리 기호 목록 (tail은 마크다운 목록 뒤에 붙는 빈 줄)"""
+    # 항목마다 조각을 추가하지 않고 목록 하나를 문자열 하나로 만들어 추가
+    if fmt == "md":
+        if bold:
+            body = "".join(f"- {prefix}**{item}**\n" for item in items)
+        else:
+            body = "".join(f"- {prefix}{item}\n" for item in items)
+        parts.append(body + tail)
+    else:
+        prefix = _esc(prefix)
+        if bold:
+            body = "".join(f"<li>{prefix}<strong>{_esc(item)}</strong></li>\n" for item in items)
+        else:
+            body = "".join(f"<li>{prefix}{_esc(item)}</li>\n" for item in items)
+        parts.append("<ul>\n" + body + "</ul>\n")
+
+def _insight_lines(insights):
+    """인사이트를 '제목: 내용' 문자열로 변환"""
+    return [f"{insight.get('제목', '')}: {insight.get('내용', '')}" for insight in insights]
+
+def _emit_insights(parts, fmt, title, insights):
+    """제목/내용/출처 형식의 인사이트 섹션 추가"""
+    _heading(parts, fmt, 3, title)
+    for insight in insights:
+        title_text, content, url = insight.get('제목', ''), insight.get('내용', ''), insight.get('출처', '#')
+        if fmt == "md":
+            parts.append("**{}**\n\n{}\n\n출처: [{}]({})\n\n".format(title_text, content, url, url))
+        else:
+            parts.append("<p><strong>{}</strong></p>\n<p>{}</p>\n<p>출처: <a href=\"{}\">{}</a></p>\n".format(
+                _esc(title_text), _esc(content), _esc(url), _esc(url)
+            ))
+
+def _image(parts, fmt, alt, src):
+    """이미지"""
+    if fmt == "md":
+        parts.append(f"![{alt}]({src})\n\n")
+    else:
+        # 절대 경로는 file:// URI로 바꾸어 렌더러가 base_url 해석 없이 바로 읽도록 함
+        if os.path.isabs(src):
+            src = Path(src).as_uri()
+        parts.append(f"<p><img src=\"{_esc(src)}\" alt=\"{_esc(alt)}\"></p>\n")
+
+def _code_block(parts, fmt, text):
+    """서식 없는 텍스트 블록"""
+    if fmt == "md":
+        parts.append(f"```\n{text}\n```\n\n")
+    else:
+        parts.append(f"<pre><code>{_esc(text)}</code></pre>\n")
 
 class ReportCompiler:
     """
     분석 결과를 종합하여 보고서를 생성하는 에이전트
     """
     
-    def __init__(self):
-        """초기화 메서드"""
+    # 투자 전략 기본 템플릿 (읽기 전용, 목록은 호출 시 복사)
+    _BASE_STRATEGY = MappingProxyType({
+        "시장 전망": "현재 시장 상황을 고려할 때, 다음과 같은 투자 전략을 고려할 수 있습니다.",
+        "단기 전략": (
+            "시장 변동성이 높은 시기에는 위험 관리에 중점을 두는 것이 중요합니다.",
+            "성장성과 안정성이 균형 잡힌 포트폴리오 구성을 권장합니다."
+        ),
+        "중장기 전략": (
+            "기본적으로 튼튼한 기업에 대한 장기 투자가 권장됩니다.",
+            "업종별 대표 기업에 분산 투자하는 전략이 유효할 수 있습니다."
+        ),
+        "주목할 포인트": (
+            "글로벌 경제 지표 및 정책 변화에 주목해야 합니다.",
+            "기업의 실적과 함께 사업 전략 및 미래 성장성을 고려하세요."
+        )
+    })
+    
+    _TRUMP_STRATEGY = (
+        "미국 정책 변화에 민감한 산업에 대한 투자는 신중하게 진행하세요.",
+        "보호무역 강화 시 내수 중심 기업에 더 높은 비중을 고려할 수 있습니다.",
+        "환율 변동성 대비가 필요합니다."
+    )
+    
+    # 결론 기본 템플릿 (읽기 전용, 목록은 호출 시 복사)
+    _BASE_CONCLUSION = MappingProxyType({
+        "요약": "본 보고서는 금융 시장 및 주요 기업에 대한 분석을 제공했습니다.",
+        "주요 결론": (
+            "시장은 변동성이 있으나 장기적 관점에서 기회가 있습니다.",
+            "업종별 대표 기업들은 상대적으로 안정적인 성과를 보이고 있습니다.",
+            "투자 결정 시 분산 투자와 리스크 관리가 중요합니다."
+        ),
+        "향후 모니터링 포인트": (
+            "글로벌 경제 지표의 변화",
+            "기업들의 실적 발표",
+            "정책 변화 및 규제 환경"
+        )
+    })
+    
+    # PDF 변환용 HTML 골격 (스타일은 _pdf_runtime의 스타일시트로 적용)
+    _HTML_TEMPLATE = """<!DOCTYPE html>
+<html>
+<head>
+    <meta charset="UTF-8">
+    <title>{title}</title>
+</head>
+<body>
+    <div class="header">
+        <h1>{title}</h1>
+        <p>생성일: {date}</p>
+    </div>
+{body}
+    <div class="footer">
+        <p>© {footer_year} 금융 시장 분석 시스템</p>
+    </div>
+</body>
+</html>
+"""
+    
+    def __init__(self, verbose=False, auto_open=False):
+        """
+        초기화 메서드
+        
+        Args:
+            verbose (bool): 진행 상황 메시지 출력 여부 (오류 메시지는 항상 출력)
+            auto_open (bool): PDF 생성 후 기본 브라우저로 자동으로 열지 여부
+        """
+        self.verbose = verbose
+        self.auto_open = auto_open
         self.reports_dir = REPORTS_DIR
         self.charts_dir = CHARTS_DIR
-        os.makedirs(self.reports_dir, exist_ok=True)
-        os.makedirs(self.charts_dir, exist_ok=True)
+        # 디렉토리는 처음 파일을 저장할 때 생성 (프로세스당 1회)
         self.visualizer = StockVisualizer()
         # 상태 정보 추가
         self.state = {
@@ -33,7 +318,38 @@ class ReportCompiler:
             "report_draft": {}
         }
     
-    def generate_report(self, query_data, market_research_results, stock_analysis_results, geopolitical_analysis_results=None):
+    def _render_comparison_charts(self, chart_jobs):
+        """
+        업종별 성과 비교 차트 렌더링
+        
+        차트가 많을 때만 래스터화/이미지 인코딩을 프로세스 풀로 나누어 수행하고,
+        적으면 (보고서당 업종 차트는 최대 3장) 프로세스 생성 비용을 피하기 위해 현재 프로세스에서 차례로 그립니다.
+        
+        Args:
+            chart_jobs (list): (업종명, 데이터프레임, 제목, 저장 경로) 목록
+            
+        Returns:
+            dict: 업종명 -> 저장된 차트 경로 (실패 시 None)
+        """
+        if not chart_jobs:
+            return {}
+        
+        ensure_dir(str(self.charts_dir))
+        sectors, frames, titles, paths = zip(*chart_jobs)
+        max_workers = min(len(chart_jobs), 8, os.cpu_count() or 1)
+        if len(chart_jobs) < _PROCESS_POOL_MIN_CHARTS or max_workers < 2:
+            return dict(zip(sectors, map(_render_comparison_chart, frames, titles, paths)))
+        
+        # 차트 쓰기/HTTP 스레드가 떠 있는 상태에서 fork하면 잠금이 잡힌 채로 복제될 수 있으므로 spawn으로 작업 프로세스 생성
+        with ProcessPoolExecutor(max_workers=max_workers, mp_context=multiprocessing.get_context("spawn")) as executor:
+            return dict(zip(sectors, executor.map(_render_comparison_chart, frames, titles, paths)))
+    
+    def _log(self, message):
+        """verbose 모드에서만 진행 상황 출력"""
+        if self.verbose:
+            print(message)
+    
+    def generate_report(self, query_data, market_research_results, stock_analysis_results, geopolitical_analysis_results=None, save_markdown=True):
         """
         보고서 생성
         
@@ -42,6 +358,7 @@ class ReportCompiler:
             market_research_results (dict): 시장 분석 결과
             stock_analysis_results (dict): 주식 분석 결과
             geopolitical_analysis_results (dict, optional): 국제 정세 분석 결과
+            save_markdown (bool): 보고서를 마크다운 파일로 저장할지 여부
             
         Returns:
             dict: 보고서 결과
@@ -51,7 +368,7 @@ class ReportCompiler:
         self.state["assigned_task"] = "generate_report"
         self.state["progress"] = 0.1
         
-        print("보고서 생성 중...")
+        self._log("보고서 생성 중...")
         results = {}
         
         # 보고서 제목 및 기본 정보
@@ -104,9 +421,9 @@ class ReportCompiler:
         if market_research_results.get("market_trend"):
             market_trend = market_research_results["market_trend"]
             report["내용"]["시장 동향"] = {
-                "최근 동향": self._extract_market_insights(market_trend.get("시장동향", {}).get("결과", [])),
-                "주요 이슈": self._extract_market_insights(market_trend.get("주요이슈", {}).get("결과", [])),
-                "전문가 전망": self._extract_market_insights(market_trend.get("전문가전망", {}).get("결과", []))
+                "최근 동향": self._extract_market_insights(_results(market_trend, "시장동향")),
+                "주요 이슈": self._extract_market_insights(_results(market_trend, "주요이슈")),
+                "전문가 전망": self._extract_market_insights(_results(market_trend, "전문가전망"))
             }
         else:
             report["내용"]["시장 동향"] = {"정보": "시장 동향 분석을 수행하지 않았습니다."}
@@ -121,9 +438,9 @@ class ReportCompiler:
                 sector_insights = {}
                 for sector, data in market_research_results["sector_trends"].items():
                     sector_insights[sector] = {
-                        "동향": self._extract_market_insights(data.get("업종동향", {}).get("결과", [])),
-                        "주요 기업 소식": self._extract_market_insights(data.get("주요기업소식", {}).get("결과", [])),
-                        "투자 전망": self._extract_market_insights(data.get("투자전망", {}).get("결과", []))
+                        "동향": self._extract_market_insights(_results(data, "업종동향")),
+                        "주요 기업 소식": self._extract_market_insights(_results(data, "주요기업소식")),
+                        "투자 전망": self._extract_market_insights(_results(data, "투자전망"))
                     }
                 report["내용"]["업종 분석"]["업종 트렌드"] = sector_insights
             
@@ -131,29 +448,32 @@ class ReportCompiler:
             if stock_analysis_results.get("sector_comparison"):
                 comparison_insights = {}
                 
+                # 성과 비교 차트 작업 수집
+                chart_jobs = []
                 for sector, data in stock_analysis_results["sector_comparison"].items():
-                    qualitative = data.get("qualitative_comparison", {})
-                    performance = data.get("performance_data", {})
-                    
-                    # 성과 비교 시각화
-                    if performance:
-                        chart_path = None
+                    performance = data.get("performance_data")
+                    if isinstance(performance, pd.DataFrame) and not performance.empty or isinstance(performance, dict) and performance:
                         try:
-                            # 성과 데이터를 데이터프레임으로 변환
-                            if isinstance(performance, dict):
-                                df = pd.DataFrame(performance)
-                                if isinstance(df.index, pd.DatetimeIndex):
-                                    df.index = df.index.astype(str) 
-                                chart_filename = f"{sector}_업종_성과비교_{timestamp}.png"
-                                chart_path = os.path.join(self.charts_dir, chart_filename)
-                                self.visualizer.plot_stock_comparison(df, title=f"{sector} 업종 성과 비교", save_path=chart_path)
+                            # 성과 데이터를 데이터프레임으로 변환 (이미 데이터프레임이면 그대로, dict의 배열은 복사하지 않고 사용)
+                            df = performance if isinstance(performance, pd.DataFrame) else pd.DataFrame(performance, copy=False)
+                            if isinstance(df.index, pd.DatetimeIndex):
+                                # 원본 데이터프레임을 변경하지 않도록 인덱스만 바꾼 새 객체 사용
+                                df = df.set_axis(df.index.astype(str))
+                            chart_filename = f"{sector}_업종_성과비교_{timestamp}.png"
+                            chart_path = os.path.join(self.charts_dir, chart_filename)
+                            chart_jobs.append((sector, df, f"{sector} 업종 성과 비교", chart_path))
                         except Exception as e:
                             print(f"차트 생성 중 오류: {e}")
-                    
+                
+                # 성과 비교 시각화
+                chart_paths = self._render_comparison_charts(chart_jobs)
+                
+                for sector, data in stock_analysis_results["sector_comparison"].items():
+                    qualitative = data.get("qualitative_comparison") or {}
                     comparison_insights[sector] = {
-                        "경쟁력 비교": self._extract_company_insights(qualitative.get("경쟁력비교", {}).get("결과", [])),
-                        "투자 매력도": self._extract_company_insights(qualitative.get("투자매력도", {}).get("결과", [])),
-                        "성과 비교 차트": chart_path
+                        "경쟁력 비교": self._extract_company_insights(_results(qualitative, "경쟁력비교")),
+                        "투자 매력도": self._extract_company_insights(_results(qualitative, "투자매력도")),
+                        "성과 비교 차트": chart_paths.get(sector)
                     }
                 
                 report["내용"]["업종 분석"]["업종 내 기업 비교"] = comparison_insights
@@ -166,8 +486,8 @@ class ReportCompiler:
             report["내용"]["기업 분석"] = {}
             
             for code, company_data in stock_analysis_results["company_analysis"].items():
-                company_info = company_data.get("company_info", {})
-                technical = company_data.get("technical_analysis", {})
+                company_info = company_data.get("company_info") or {}
+                technical = company_data.get("technical_analysis") or {}
                 
                 company_name = company_info.get("기업명", f"종목({code})")
                 
@@ -186,11 +506,11 @@ class ReportCompiler:
                 
                 # 기업 정보 정리
                 company_analysis = {
-                    "기업 개요": self._extract_company_insights(company_info.get("기업정보", {}).get("결과", [])),
-                    "최근 뉴스": self._extract_company_insights(company_info.get("최근뉴스", {}).get("결과", [])),
-                    "재무 정보": self._extract_company_insights(company_info.get("재무정보", {}).get("결과", [])),
-                    "투자 의견": self._extract_company_insights(company_info.get("투자의견", {}).get("결과", [])),
-                    "사업 전략": self._extract_company_insights(company_info.get("사업전략", {}).get("결과", [])),
+                    "기업 개요": self._extract_company_insights(_results(company_info, "기업정보")),
+                    "최근 뉴스": self._extract_company_insights(_results(company_info, "최근뉴스")),
+                    "재무 정보": self._extract_company_insights(_results(company_info, "재무정보")),
+                    "투자 의견": self._extract_company_insights(_results(company_info, "투자의견")),
+                    "사업 전략": self._extract_company_insights(_results(company_info, "사업전략")),
                     "기술적 분석": technical.get("기본 정보", {}),
                     "차트": chart_paths
                 }
@@ -208,15 +528,17 @@ class ReportCompiler:
             
             # 산업별 영향 추가
             if "industry_impacts" in geopolitical_analysis_results:
-                industry_impacts = {}
-                for industry, impact in geopolitical_analysis_results["industry_impacts"].items():
-                    industry_impacts[industry] = impact.get("analysis", f"{industry} 산업 영향 분석 정보가 없습니다.")
+                # 대체 문구(f-string)는 분석 결과가 없을 때만 생성
+                industry_impacts = {
+                    industry: impact.get("analysis") or f"{industry} 산업 영향 분석 정보가 없습니다."
+                    for industry, impact in geopolitical_analysis_results["industry_impacts"].items()
+                }
                 
                 report["내용"]["국제 정세 분석"]["산업별 영향"] = industry_impacts
             
             # 투자 전략 추가
             if "investment_strategy" in geopolitical_analysis_results:
-                report["내용"]["국제 정세 분석"]["투자 전략 제안"] = geopolitical_analysis_results["investment_strategy"].get("strategy", "투자 전략 정보가 없습니다.")
+                report["내용"]["국제 정세 분석"]["투자 전략 제안"] = geopolitical_analysis_results["investment_strategy"].get("strategy") or "투자 전략 정보가 없습니다."
         
         # 6. 투자 전략
         self.state["progress"] = 0.7
@@ -233,13 +555,16 @@ class ReportCompiler:
         self.state["progress"] = 0.85
         report["내용"]["요약"] = self._generate_executive_summary(report)
         
-        # 보고서를 마크다운 파일로 저장
-        self.state["progress"] = 0.9
-        report_path = self._save_report_as_markdown(report, timestamp)
-        
         results["report"] = report
-        results["report_path"] = report_path
-        print(f"보고서 생성 완료. 저장 위치: {report_path}")
+        results["report_name"] = f"{report['제목'].replace(' ', '_')}_{timestamp}"
+        
+        # 보고서를 마크다운 파일로 저장
+        if save_markdown:
+            self.state["progress"] = 0.9
+            self._with_markdown(results)
+            self._log(f"보고서 생성 완료. 저장 위치: {results['report_path']}")
+        else:
+            self._log("보고서 생성 완료.")
         
         # 상태 업데이트
         self.state["status"] = "completed"
@@ -248,169 +573,91 @@ class ReportCompiler:
         
         return results
     
-    def generate_pdf_report(self, query_data, market_research_results, stock_analysis_results, geopolitical_analysis_results=None):
+    def generate_pdf_report(self, query_data, market_research_results, stock_analysis_results, geopolitical_analysis_results=None, save_markdown=False):
         """
         WeasyPrint를 사용하여 PDF 보고서 생성
         
+        보고서 구조에서 HTML을 메모리에서 바로 만들어 변환하므로 중간 마크다운 파일이 필요 없습니다.
+        PDF 생성에 실패하면 마크다운 파일을 저장하여 그 경로를 대신 반환합니다.
+        
         Args:
             query_data (dict): 처리된 쿼리 데이터
             market_research_results (dict): 시장 분석 결과
             stock_analysis_results (dict): 주식 분석 결과
             geopolitical_analysis_results (dict, optional): 국제 정세 분석 결과
+            save_markdown (bool): PDF와 함께 마크다운 파일도 저장할지 여부
                 
         Returns:
             dict: 보고서 결과 (PDF 경로 포함)
         """
-        # 먼저 마크다운 보고서 생성
+        # 먼저 보고서 구조 생성
         md_results = self.generate_report(
             query_data, 
             market_research_results, 
             stock_analysis_results, 
-            geopolitical_analysis_results
+            geopolitical_analysis_results,
+            save_markdown=save_markdown
         )
         
         try:
-            import markdown
-            import os
-            
             # WeasyPrint 설치 여부 확인
             try:
-                from weasyprint import HTML
-                print("WeasyPrint 라이브러리가 설치되어 있습니다.")
+                HTML, stylesheet, font_config = _pdf_runtime()
+                self._log("WeasyPrint 라이브러리가 설치되어 있습니다.")
             except ImportError:
                 print("WeasyPrint 라이브러리가 설치되어 있지 않습니다.")
                 print("설치하려면 터미널에서 다음 명령을 실행하세요: pip install weasyprint")
-                return md_results
-            
-            markdown_file = md_results["report_path"]
+                return self._with_markdown(md_results)
             
             # 출력 PDF 파일 경로 설정
-            pdf_filename = os.path.splitext(os.path.basename(markdown_file))[0] + '.pdf'
-            pdf_filepath = os.path.join(self.reports_dir, pdf_filename)
+            pdf_filepath = os.path.join(self.reports_dir, md_results["report_name"] + '.pdf')
+            ensure_dir(str(self.reports_dir))
             
-            # 마크다운 파일 읽기
-            with open(markdown_file, 'r', encoding='utf-8') as f:
-                md_content = f.read()
-            
-            # 마크다운을 HTML로 변환
-            html_content = markdown.markdown(md_content, extensions=['tables', 'fenced_code'])
+            # 마크다운 변환 없이 보고서 구조에서 HTML을 바로 생성
+            html_content = self._render(md_results["report"], "html")
             
             # HTML에 스타일 추가
-            styled_html = f"""
-            <!DOCTYPE html>
-            <html>
-            <head>
-                <meta charset="UTF-8">
-                <title>{md_results["report"]["제목"]}</title>
-                <style>
-                    @import url('https://fonts.googleapis.com/css2?family=Noto+Sans+KR:wght@400;700&display=swap');
-                    body {{
-                        font-family: 'Noto Sans KR', Arial, sans-serif;
-                        line-height: 1.6;
-                        color: #333;
-                        max-width: 900px;
-                        margin: 0 auto;
-                        padding: 20px;
-                        background-color: #f9f9f9;
-                    }}
-                    h1 {{
-                        color: #0066cc;
-                        border-bottom: 2px solid #0066cc;
-                        padding-bottom: 10px;
-                        margin-top: 30px;
-                    }}
-                    h2 {{
-                        color: #0080ff;
-                        border-bottom: 1px solid #0080ff;
-                        padding-bottom: 5px;
-                        margin-top: 25px;
-                    }}
-                    h3 {{
-                        color: #0099ff;
-                        margin-top: 20px;
-                    }}
-                    table {{
-                        border-collapse: collapse;
-                        width: 100%;
-                        margin: 20px 0;
-                    }}
-                    th, td {{
-                        border: 1px solid #ddd;
-                        padding: 8px;
-                        text-align: left;
-                    }}
-                    th {{
-                        background-color: #f2f2f2;
-                    }}
-                    img {{
-                        max-width: 100%;
-                        height: auto;
-                    }}
-                    .header {{
-                        text-align: center;
-                        margin-bottom: 30px;
-                    }}
-                    .footer {{
-                        text-align: center;
-                        margin-top: 30px;
-                        font-size: 0.9em;
-                        color: #777;
-                    }}
-                </style>
-            </head>
-            <body>
-                <div class="header">
-                    <h1>{md_results["report"]["제목"]}</h1>
-                    <p>생성일: {md_results["report"]["작성일"]}</p>
-                </div>
-                {html_content}
-                <div class="footer">
-                    <p>© 2025 금융 시장 분석 시스템</p>
-                </div>
-            </body>
-            </html>
-            """
-            
-            # 임시 HTML 파일 생성
-            temp_html_file = os.path.join(self.reports_dir, os.path.splitext(os.path.basename(markdown_file))[0] + '_temp.html')
-            with open(temp_html_file, 'w', encoding='utf-8') as f:
-                f.write(styled_html)
-            
-            print(f"임시 HTML 파일 생성: {temp_html_file}")
+            report = md_results["report"]
+            styled_html = self._HTML_TEMPLATE.format(
+                title=_esc(report["제목"]),
+                date=_esc(report["작성일"]),
+                body=html_content,
+                footer_year=datetime.now().year
+            )
             
-            # HTML을 PDF로 변환
+            # HTML을 PDF로 변환 (임시 파일 없이 메모리에서 바로 렌더링, 상대 경로 이미지는 차트 디렉토리 기준)
             try:
-                print("HTML을 PDF로 변환 중...")
-                HTML(temp_html_file).write_pdf(pdf_filepath)
-                print(f"PDF 보고서 생성 완료. 저장 위치: {pdf_filepath}")
+                self._log("HTML을 PDF로 변환 중...")
+                HTML(string=styled_html, base_url=str(self.charts_dir)).write_pdf(
+                    pdf_filepath, stylesheets=[stylesheet], font_config=font_config
+                )
+                self._log(f"PDF 보고서 생성 완료. 저장 위치: {pdf_filepath}")
                 
-                # 자동으로 PDF 열기
-                try:
-                    import webbrowser
-                    webbrowser.open('file://' + os.path.abspath(pdf_filepath))
-                    print("PDF 보고서가 브라우저에서 열렸습니다.")
-                except Exception as e:
-                    print(f"PDF 파일 열기 실패: {e}")
+                # 자동으로 PDF 열기 (대화형 실행에서만)
+                if self.auto_open:
+                    try:
+                        import webbrowser
+                        webbrowser.open('file://' + os.path.abspath(pdf_filepath))
+                        self._log("PDF 보고서가 브라우저에서 열렸습니다.")
+                    except Exception as e:
+                        print(f"PDF 파일 열기 실패: {e}")
                 
-                return {
-                    "report": md_results["report"],
-                    "report_path": md_results["report_path"],
-                    "pdf_path": pdf_filepath
-                }
+                md_results["pdf_path"] = pdf_filepath
+                return md_results
                 
             except Exception as e:
                 import traceback
                 print(f"PDF 생성 중 오류 발생: {e}")
                 print("오류 상세 정보:")
                 traceback.print_exc()
-                return md_results
+                return self._with_markdown(md_results)
                     
         except Exception as e:
             import traceback
             print(f"PDF 변환 중 오류 발생: {e}")
             print("오류 상세 정보:")
             traceback.print_exc()
-            return md_results
+            return self._with_markdown(md_results)
 
     def _generate_executive_summary(self, report):
         """
@@ -429,17 +676,19 @@ class ReportCompiler:
             "주요 지표 요약": {}
         }
         
+        content = report["내용"]
+        
         # 보고서 내용에서 핵심 정보 추출
-        if "시장 동향" in report["내용"]:
+        if "시장 동향" in content:
             trend_summary = "시장은 "
-            if isinstance(report["내용"]["시장 동향"], dict) and "최근 동향" in report["내용"]["시장 동향"]:
-                insights = report["내용"]["시장 동향"]["최근 동향"]
+            if isinstance(content["시장 동향"], dict) and "최근 동향" in content["시장 동향"]:
+                insights = content["시장 동향"]["최근 동향"]
                 if insights and len(insights) > 0:
                     trend_summary += f"{insights[0].get('제목', '').split('.')[-1].strip()}. "
                     summary["주요 발견사항"].append(f"시장 동향: {insights[0].get('제목', '')}")
                     
-            if isinstance(report["내용"]["시장 동향"], dict) and "주요 이슈" in report["내용"]["시장 동향"]:
-                issues = report["내용"]["시장 동향"]["주요 이슈"]
+            if isinstance(content["시장 동향"], dict) and "주요 이슈" in content["시장 동향"]:
+                issues = content["시장 동향"]["주요 이슈"]
                 if issues and len(issues) > 0:
                     trend_summary += f"주요 이슈로는 {issues[0].get('제목', '')}이(가) 있습니다."
                     summary["주요 발견사항"].append(f"주요 이슈: {issues[0].get('제목', '')}")
@@ -447,17 +696,17 @@ class ReportCompiler:
             summary["핵심 요약"] = trend_summary
         
         # 업종 분석 정보 추출
-        if "업종 분석" in report["내용"] and isinstance(report["내용"]["업종 분석"], dict):
-            if "업종 트렌드" in report["내용"]["업종 분석"]:
-                for sector, data in report["내용"]["업종 분석"]["업종 트렌드"].items():
+        if "업종 분석" in content and isinstance(content["업종 분석"], dict):
+            if "업종 트렌드" in content["업종 분석"]:
+                for sector, data in content["업종 분석"]["업종 트렌드"].items():
                     if "동향" in data and data["동향"] and len(data["동향"]) > 0:
                         summary["주요 발견사항"].append(f"{sector} 업종: {data['동향'][0].get('제목', '')}")
                     if "투자 전망" in data and data["투자 전망"] and len(data["투자 전망"]) > 0:
                         summary["투자 시사점"].append(f"{sector} 업종: {data['투자 전망'][0].get('제목', '')}")
         
         # 기업 분석 정보 추출
-        if "기업 분석" in report["내용"] and isinstance(report["내용"]["기업 분석"], dict):
-            for company, data in report["내용"]["기업 분석"].items():
+        if "기업 분석" in content and isinstance(content["기업 분석"], dict):
+            for company, data in content["기업 분석"].items():
                 if company != "정보":  # "정보" 항목이 아닌 실제 기업 데이터만 처리
                     company_summary = f"{company}: "
                     
@@ -480,28 +729,28 @@ class ReportCompiler:
                             summary["주요 지표 요약"][company] = tech_data
         
         # 국제 정세 분석 정보 추출
-        if "국제 정세 분석" in report["내용"] and isinstance(report["내용"]["국제 정세 분석"], dict):
-            if "트럼프 정책 영향" in report["내용"]["국제 정세 분석"]:
-                impact = report["내용"]["국제 정세 분석"]["트럼프 정책 영향"]
+        if "국제 정세 분석" in content and isinstance(content["국제 정세 분석"], dict):
+            if "트럼프 정책 영향" in content["국제 정세 분석"]:
+                impact = content["국제 정세 분석"]["트럼프 정책 영향"]
                 if isinstance(impact, str):
                     # 문자열에서 첫 문장만 추출
                     first_sentence = impact.split('.')[0] + '.' if '.' in impact else impact
                     summary["주요 발견사항"].append(f"트럼프 정책: {first_sentence}")
                 
-            if "산업별 영향" in report["내용"]["국제 정세 분석"]:
-                for industry, impact in report["내용"]["국제 정세 분석"]["산업별 영향"].items():
+            if "산업별 영향" in content["국제 정세 분석"]:
+                for industry, impact in content["국제 정세 분석"]["산업별 영향"].items():
                     if isinstance(impact, str):
                         # 문자열에서 첫 문장만 추출
                         first_sentence = impact.split('.')[0] + '.' if '.' in impact else impact
                         summary["투자 시사점"].append(f"{industry} 산업: {first_sentence}")
         
         # 투자 전략 정보 추출
-        if "투자 전략" in report["내용"] and isinstance(report["내용"]["투자 전략"], dict):
-            if "단기 전략" in report["내용"]["투자 전략"] and report["내용"]["투자 전략"]["단기 전략"]:
-                summary["투자 시사점"].append(f"단기 전략: {report['내용']['투자 전략']['단기 전략'][0]}")
+        if "투자 전략" in content and isinstance(content["투자 전략"], dict):
+            if "단기 전략" in content["투자 전략"] and content["투자 전략"]["단기 전략"]:
+                summary["투자 시사점"].append(f"단기 전략: {content['투자 전략']['단기 전략'][0]}")
             
-            if "중장기 전략" in report["내용"]["투자 전략"] and report["내용"]["투자 전략"]["중장기 전략"]:
-                summary["투자 시사점"].append(f"중장기 전략: {report['내용']['투자 전략']['중장기 전략'][0]}")
+            if "중장기 전략" in content["투자 전략"] and content["투자 전략"]["중장기 전략"]:
+                summary["투자 시사점"].append(f"중장기 전략: {content['투자 전략']['중장기 전략'][0]}")
         
         # 발견사항과 시사점 최대 5개로 제한
         summary["주요 발견사항"] = summary["주요 발견사항"][:5]
@@ -510,25 +759,15 @@ class ReportCompiler:
         return summary
     
     def _extract_market_insights(self, results):
-        """웹 검색 결과에서 인사이트 추출"""
-        insights = []
-        
-        for result in results[:3]:  # 상위 3개 결과만 사용
-            title = result.get("title", "제목 없음")
-            content = result.get("content", "내용 없음")
-            url = result.get("url", "#")
-            
-            # 내용을 100자로 제한
-            if len(content) > 100:
-                content = content[:97] + "..."
-            
-            insights.append({
-                "제목": title,
-                "내용": content,
-                "출처": url
-            })
-        
-        return insights
+        """웹 검색 결과에서 인사이트 추출 (상위 3개 결과만 사용)"""
+        return [
+            {
+                "제목": result.get("title", "제목 없음"),
+                "내용": _truncate(result.get("content", "내용 없음")),
+                "출처": result.get("url", "#")
+            }
+            for result in results[:3]
+        ]
     
     def _extract_company_insights(self, results):
         """기업 관련 웹 검색 결과에서 인사이트 추출"""
@@ -537,48 +776,18 @@ class ReportCompiler:
     def _generate_investment_strategy(self, market_research, stock_analysis, geopolitical_analysis=None):
         """투자 전략 생성"""
         # 실제 프로젝트에서는 더 고급 알고리즘 또는 LLM을 사용하여 전략을 생성할 수 있음
-        strategy = {
-            "시장 전망": "현재 시장 상황을 고려할 때, 다음과 같은 투자 전략을 고려할 수 있습니다.",
-            "단기 전략": [
-                "시장 변동성이 높은 시기에는 위험 관리에 중점을 두는 것이 중요합니다.",
-                "성장성과 안정성이 균형 잡힌 포트폴리오 구성을 권장합니다."
-            ],
-            "중장기 전략": [
-                "기본적으로 튼튼한 기업에 대한 장기 투자가 권장됩니다.",
-                "업종별 대표 기업에 분산 투자하는 전략이 유효할 수 있습니다."
-            ],
-            "주목할 포인트": [
-                "글로벌 경제 지표 및 정책 변화에 주목해야 합니다.",
-                "기업의 실적과 함께 사업 전략 및 미래 성장성을 고려하세요."
-            ]
-        }
+        strategy = _copy_template(self._BASE_STRATEGY)
         
         # 국제 정세 분석 결과가 있는 경우 투자 전략에 반영
         if geopolitical_analysis and geopolitical_analysis.get("investment_strategy"):
-            strategy["트럼프 정책 관련 전략"] = [
-                "미국 정책 변화에 민감한 산업에 대한 투자는 신중하게 진행하세요.",
-                "보호무역 강화 시 내수 중심 기업에 더 높은 비중을 고려할 수 있습니다.",
-                "환율 변동성 대비가 필요합니다."
-            ]
+            strategy["트럼프 정책 관련 전략"] = list(self._TRUMP_STRATEGY)
         
         return strategy
     
     def _generate_conclusion(self, content):
         """결론 생성"""
         # 실제 프로젝트에서는 더 고급 알고리즘 또는 LLM을 사용하여 결론을 생성할 수 있음
-        conclusion = {
-            "요약": "본 보고서는 금융 시장 및 주요 기업에 대한 분석을 제공했습니다.",
-            "주요 결론": [
-                "시장은 변동성이 있으나 장기적 관점에서 기회가 있습니다.",
-                "업종별 대표 기업들은 상대적으로 안정적인 성과를 보이고 있습니다.",
-                "투자 결정 시 분산 투자와 리스크 관리가 중요합니다."
-            ],
-            "향후 모니터링 포인트": [
-                "글로벌 경제 지표의 변화",
-                "기업들의 실적 발표",
-                "정책 변화 및 규제 환경"
-            ]
-        }
+        conclusion = _copy_template(self._BASE_CONCLUSION)
         
         # 국제 정세 분석 결과가 있는 경우 결론에 반영
         if "국제 정세 분석" in content:
@@ -592,289 +801,255 @@ class ReportCompiler:
         """주요 발견 사항 생성"""
         findings = []
         
+        # 하위 목록 전체를 복사하지 않고 첫 항목만 꺼내서 사용
         # 시장 동향에서 발견
-        if "시장 동향" in content and isinstance(content["시장 동향"], dict):
-            if "최근 동향" in content["시장 동향"] and content["시장 동향"]["최근 동향"]:
-                for insight in content["시장 동향"]["최근 동향"][:1]:
-                    findings.append(f"시장 동향: {insight.get('제목', '')}")
+        market = content.get("시장 동향")
+        if isinstance(market, dict):
+            first = next(iter(market.get("최근 동향") or ()), None)
+            if first is not None:
+                findings.append(f"시장 동향: {first.get('제목', '')}")
         
         # 업종 분석에서 발견
-        if "업종 분석" in content and isinstance(content["업종 분석"], dict):
-            if "업종 트렌드" in content["업종 분석"]:
-                for sector, data in list(content["업종 분석"]["업종 트렌드"].items())[:1]:
-                    if "동향" in data and data["동향"]:
-                        findings.append(f"{sector} 업종: {data['동향'][0].get('제목', '')}")
+        sector_analysis = content.get("업종 분석")
+        if isinstance(sector_analysis, dict):
+            sector, data = next(iter((sector_analysis.get("업종 트렌드") or {}).items()), (None, None))
+            # 분석하지 않은 경우 {"정보": 안내 문구}이므로 딕셔너리 항목만 사용
+            first = next(iter(data.get("동향") or ()), None) if isinstance(data, dict) else None
+            if first is not None:
+                findings.append(f"{sector} 업종: {first.get('제목', '')}")
         
         # 기업 분석에서 발견
-        if "기업 분석" in content and isinstance(content["기업 분석"], dict):
-            for company, data in list(content["기업 분석"].items())[:1]:
-                if "투자 의견" in data and data["투자 의견"]:
-                    findings.append(f"{company}: {data['투자 의견'][0].get('제목', '')}")
+        company_analysis = content.get("기업 분석")
+        if isinstance(company_analysis, dict):
+            company, data = next(iter(company_analysis.items()), (None, None))
+            first = next(iter(data.get("투자 의견") or ()), None) if isinstance(data, dict) else None
+            if first is not None:
+                findings.append(f"{company}: {first.get('제목', '')}")
         
         # 국제 정세 분석에서 발견
-        if "국제 정세 분석" in content and isinstance(content["국제 정세 분석"], dict):
-            if "트럼프 정책 영향" in content["국제 정세 분석"]:
+        geopolitics = content.get("국제 정세 분석")
+        if isinstance(geopolitics, dict):
+            if "트럼프 정책 영향" in geopolitics:
                 findings.append("트럼프 정책: 한국 금융 시장에 상당한 영향을 미칠 것으로 예상")
             
-            if "산업별 영향" in content["국제 정세 분석"]:
-                for industry in list(content["국제 정세 분석"]["산업별 영향"].keys())[:1]:
-                    findings.append(f"트럼프 정책의 {industry} 산업 영향: 집중 분석 수행")
+            industry = next(iter(geopolitics.get("산업별 영향") or ()), None)
+            if industry is not None:
+                findings.append(f"트럼프 정책의 {industry} 산업 영향: 집중 분석 수행")
         
         return findings
     
-    def _save_report_as_markdown(self, report, timestamp):
-        """보고서를 마크다운 파일로 저장"""
-        report_title = report["제목"].replace(" ", "_")
-        filename = f"{report_title}_{timestamp}.md"
-        filepath = os.path.join(self.reports_dir, filename)
-        
-        with open(filepath, "w", encoding="utf-8") as f:
-            # 제목과 날짜 (더 큰 폰트와 정렬)
-            f.write(f"<div align='center'>\n\n")
-            f.write(f"# {report['제목']}\n\n")
-            f.write(f"**작성일: {report['작성일']}**\n\n")
-            f.write(f"</div>\n\n")
+    def _render(self, report, fmt="md"):
+        """
+        보고서를 문자열로 렌더링
+        
+        Args:
+            report (dict): 보고서 데이터
+            fmt (str): 출력 형식 ('md' 또는 'html')
             
-            # SUMMARY 챕터 추가 (보고서 맨 앞에 배치)
-            f.write("## 📊 SUMMARY\n\n")
+        Returns:
+            str: 렌더링된 보고서 (html은 <body>에 들어갈 본문 조각)
+        """
+        md = fmt == "md"
+        parts = []
+        
+        # 제목과 날짜 (더 큰 폰트와 정렬) - HTML은 템플릿 머리말에 포함
+        if md:
+            parts.append(f"<div align='center'>\n\n# {report['제목']}\n\n**작성일: {report['작성일']}**\n\n</div>\n\n")
+        
+        # SUMMARY 챕터 추가 (보고서 맨 앞에 배치)
+        _heading(parts, fmt, 2, "📊 SUMMARY")
+        
+        # 요약 정보 (보고서 내용을 기반으로 생성)
+        if "요약" in report["내용"]:
+            summary = report["내용"]["요약"]
             
-            # 요약 정보 (보고서 내용을 기반으로 생성)
-            if "요약" in report["내용"]:
-                summary = report["내용"]["요약"]
-                
-                f.write(f"### 핵심 요약\n{summary.get('핵심 요약', '')}\n\n")
-                
-                if "주요 발견사항" in summary and summary["주요 발견사항"]:
-                    f.write("### 주요 발견사항\n\n")
-                    for finding in summary["주요 발견사항"]:
-                        f.write(f"- **{finding}**\n")
-                    f.write("\n")
-                
-                if "투자 시사점" in summary and summary["투자 시사점"]:
-                    f.write("### 투자 시사점\n\n")
-                    for implication in summary["투자 시사점"]:
-                        f.write(f"- **{implication}**\n")
-                    f.write("\n")
-                
-                if "주요 지표 요약" in summary and summary["주요 지표 요약"]:
-                    f.write("### 주요 지표 요약\n\n")
-                    f.write("| 기업 | 현재가 | 등락률 | RSI | MACD |\n")
-                    f.write("|------|--------|--------|-----|------|\n")
-                    for company, indicators in summary["주요 지표 요약"].items():
-                        current_price = indicators.get("현재가", "-")
-                        change_rate = indicators.get("등락률", "-")
-                        rsi = indicators.get("RSI", "-")
-                        macd = indicators.get("MACD", "-")
-                        f.write(f"| {company} | {current_price} | {change_rate} | {rsi} | {macd} |\n")
-                    f.write("\n\n")
+            _heading(parts, fmt, 3, "핵심 요약", summary.get('핵심 요약', ''))
             
-            # 목차 (네비게이션 리스트로)
-            f.write("## 📑 목차\n\n")
-            # SUMMARY를 목차 첫 번째 항목으로 추가
-            f.write(f"1. [SUMMARY](#summary)\n")
-            for i, item in enumerate(report["목차"], 2):  # 2부터 시작 (SUMMARY가 1번)
-                f.write(f"{i}. [{item}](#{item.lower().replace(' ', '-')})\n")
-            f.write("\n\n")
+            if "주요 발견사항" in summary and summary["주요 발견사항"]:
+                _heading(parts, fmt, 3, "주요 발견사항")
+                _list(parts, fmt, summary["주요 발견사항"], bold=True)
             
-            # 개요
-            f.write("## 📋 개요\n\n")
-            if "개요" in report["내용"]:
-                overview = report["내용"]["개요"]
-                f.write(f"### 🎯 분석 목적\n{overview.get('분석 목적', '')}\n\n")
-                f.write(f"### 🔍 분석 방법\n{overview.get('분석 방법', '')}\n\n")
-                
-                f.write("### ✨ 주요 결과\n\n")
-                for finding in overview.get("주요 결과", []):
-                    f.write(f"- **{finding}**\n")
-                f.write("\n\n")
+            if "투자 시사점" in summary and summary["투자 시사점"]:
+                _heading(parts, fmt, 3, "투자 시사점")
+                _list(parts, fmt, summary["투자 시사점"], bold=True)
             
-            # 시장 동향
-            f.write("## 📈 시장 동향\n\n")
-            if "시장 동향" in report["내용"]:
-                market_trend = report["내용"]["시장 동향"]
-                
-                if isinstance(market_trend, dict) and market_trend != {"정보": "시장 동향 분석을 수행하지 않았습니다."}:
-                    # 최근 동향
-                    f.write("### 최근 동향\n\n")
-                    for insight in market_trend.get("최근 동향", []):
-                        f.write(f"**{insight.get('제목', '')}**\n\n")
-                        f.write(f"{insight.get('내용', '')}\n\n")
-                        f.write(f"출처: [{insight.get('출처', '#')}]({insight.get('출처', '#')})\n\n")
-                    
-                    # 주요 이슈
-                    f.write("### 주요 이슈\n\n")
-                    for insight in market_trend.get("주요 이슈", []):
-                        f.write(f"**{insight.get('제목', '')}**\n\n")
-                        f.write(f"{insight.get('내용', '')}\n\n")
-                        f.write(f"출처: [{insight.get('출처', '#')}]({insight.get('출처', '#')})\n\n")
-                    
-                    # 전문가 전망
-                    f.write("### 전문가 전망\n\n")
-                    for insight in market_trend.get("전문가 전망", []):
-                        f.write(f"**{insight.get('제목', '')}**\n\n")
-                        f.write(f"{insight.get('내용', '')}\n\n")
-                        f.write(f"출처: [{insight.get('출처', '#')}]({insight.get('출처', '#')})\n\n")
+            if "주요 지표 요약" in summary and summary["주요 지표 요약"]:
+                _heading(parts, fmt, 3, "주요 지표 요약")
+                rows = [
+                    (company, indicators.get("현재가", "-"), indicators.get("등락률", "-"),
+                     indicators.get("RSI", "-"), indicators.get("MACD", "-"))
+                    for company, indicators in summary["주요 지표 요약"].items()
+                ]
+                if md:
+                    parts.append("| 기업 | 현재가 | 등락률 | RSI | MACD |\n")
+                    parts.append("|------|--------|--------|-----|------|\n")
+                    for row in rows:
+                        parts.append("| {} | {} | {} | {} | {} |\n".format(*row))
+                    parts.append("\n\n")
                 else:
-                    f.write(market_trend.get("정보", "정보가 없습니다.") + "\n\n")
+                    parts.append("<table>\n<thead><tr><th>기업</th><th>현재가</th><th>등락률</th><th>RSI</th><th>MACD</th></tr></thead>\n<tbody>\n")
+                    for row in rows:
+                        parts.append("<tr>" + "".join(f"<td>{_esc(cell)}</td>" for cell in row) + "</tr>\n")
+                    parts.append("</tbody>\n</table>\n")
+        
+        # 목차 (네비게이션 리스트로)
+        _heading(parts, fmt, 2, "📑 목차")
+        # SUMMARY를 목차 첫 번째 항목으로 추가
+        toc = [("SUMMARY", "summary")] + [(item, item.lower().replace(' ', '-')) for item in report["목차"]]
+        if md:
+            for i, (item, anchor) in enumerate(toc, 1):
+                parts.append(f"{i}. [{item}](#{anchor})\n")
+            parts.append("\n\n")
+        else:
+            parts.append("<ol>\n")
+            for item, anchor in toc:
+                parts.append(f"<li><a href=\"#{_esc(anchor)}\">{_esc(item)}</a></li>\n")
+            parts.append("</ol>\n")
+        
+        # 개요
+        _heading(parts, fmt, 2, "📋 개요")
+        if "개요" in report["내용"]:
+            overview = report["내용"]["개요"]
+            _heading(parts, fmt, 3, "🎯 분석 목적", overview.get('분석 목적', ''))
+            _heading(parts, fmt, 3, "🔍 분석 방법", overview.get('분석 방법', ''))
             
-            # 업종 분석
-            f.write("## 🏢 업종 분석\n\n")
-            if "업종 분석" in report["내용"]:
-                sector_analysis = report["내용"]["업종 분석"]
-                
-                if isinstance(sector_analysis, dict) and sector_analysis != {"정보": "업종 분석을 수행하지 않았습니다."}:
-                    # 업종 트렌드
-                    if "업종 트렌드" in sector_analysis:
-                        f.write("### 업종 트렌드\n\n")
-                        for sector, data in sector_analysis["업종 트렌드"].items():
-                            f.write(f"#### {sector} 업종\n\n")
-                            
-                            f.write("**동향**\n\n")
-                            for insight in data.get("동향", []):
-                                f.write(f"- {insight.get('제목', '')}: {insight.get('내용', '')}\n")
-                            f.write("\n")
-                            
-                            f.write("**주요 기업 소식**\n\n")
-                            for insight in data.get("주요 기업 소식", []):
-                                f.write(f"- {insight.get('제목', '')}: {insight.get('내용', '')}\n")
-                            f.write("\n")
-                            
-                            f.write("**투자 전망**\n\n")
-                            for insight in data.get("투자 전망", []):
-                                f.write(f"- {insight.get('제목', '')}: {insight.get('내용', '')}\n")
-                            f.write("\n\n")
-                    
-                    # 업종 내 기업 비교
-                    if "업종 내 기업 비교" in sector_analysis:
-                        f.write("### 업종 내 기업 비교\n\n")
-                        for sector, data in sector_analysis["업종 내 기업 비교"].items():
-                            f.write(f"#### {sector} 업종 기업 비교\n\n")
-                            
-                            f.write("**경쟁력 비교**\n\n")
-                            for insight in data.get("경쟁력 비교", []):
-                                f.write(f"- {insight.get('제목', '')}: {insight.get('내용', '')}\n")
-                            f.write("\n")
-                            
-                            f.write("**투자 매력도**\n\n")
-                            for insight in data.get("투자 매력도", []):
-                                f.write(f"- {insight.get('제목', '')}: {insight.get('내용', '')}\n")
-                            f.write("\n")
-                            
-                            if "성과 비교 차트" in data and data["성과 비교 차트"]:
-                                f.write(f"![{sector} 업종 성과 비교]({data['성과 비교 차트']})\n\n")
-                else:
-                    f.write(sector_analysis.get("정보", "정보가 없습니다.") + "\n\n")
+            _heading(parts, fmt, 3, "✨ 주요 결과")
+            _list(parts, fmt, overview.get("주요 결과", []), bold=True, tail="\n\n")
+        
+        # 시장 동향
+        _heading(parts, fmt, 2, "📈 시장 동향")
+        if "시장 동향" in report["내용"]:
+            market_trend = report["내용"]["시장 동향"]
             
-            # 기업 분석
-            f.write("## 🏭 기업 분석\n\n")
-            if "기업 분석" in report["내용"]:
-                company_analysis = report["내용"]["기업 분석"]
+            if isinstance(market_trend, dict) and market_trend != {"정보": "시장 동향 분석을 수행하지 않았습니다."}:
+                _emit_insights(parts, fmt, "최근 동향", market_trend.get("최근 동향", []))
+                _emit_insights(parts, fmt, "주요 이슈", market_trend.get("주요 이슈", []))
+                _emit_insights(parts, fmt, "전문가 전망", market_trend.get("전문가 전망", []))
+            else:
+                _paragraph(parts, fmt, market_trend.get("정보", "정보가 없습니다."))
+        
+        # 업종 분석
+        _heading(parts, fmt, 2, "🏢 업종 분석")
+        if "업종 분석" in report["내용"]:
+            sector_analysis = report["내용"]["업종 분석"]
+            
+            if isinstance(sector_analysis, dict) and sector_analysis != {"정보": "업종 분석을 수행하지 않았습니다."}:
+                # 업종 트렌드
+                if "업종 트렌드" in sector_analysis:
+                    _heading(parts, fmt, 3, "업종 트렌드")
+                    for sector, data in sector_analysis["업종 트렌드"].items():
+                        _heading(parts, fmt, 4, f"{sector} 업종")
+                        for label in ("동향", "주요 기업 소식", "투자 전망"):
+                            _paragraph(parts, fmt, label, bold=True)
+                            _list(parts, fmt, _insight_lines(data.get(label, [])))
+                        if md:
+                            parts.append("\n")
                 
-                if isinstance(company_analysis, dict) and company_analysis != {"정보": "기업 분석을 수행하지 않았습니다."}:
-                    for company, data in company_analysis.items():
-                        f.write(f"### {company}\n\n")
-                        
-                        f.write("#### 기업 개요\n\n")
-                        for insight in data.get("기업 개요", []):
-                            f.write(f"- {insight.get('제목', '')}: {insight.get('내용', '')}\n")
-                        f.write("\n")
+                # 업종 내 기업 비교
+                if "업종 내 기업 비교" in sector_analysis:
+                    _heading(parts, fmt, 3, "업종 내 기업 비교")
+                    for sector, data in sector_analysis["업종 내 기업 비교"].items():
+                        _heading(parts, fmt, 4, f"{sector} 업종 기업 비교")
+                        for label in ("경쟁력 비교", "투자 매력도"):
+                            _paragraph(parts, fmt, label, bold=True)
+                            _list(parts, fmt, _insight_lines(data.get(label, [])))
                         
-                        f.write("#### 최근 뉴스\n\n")
-                        for insight in data.get("최근 뉴스", []):
-                            f.write(f"- {insight.get('제목', '')}: {insight.get('내용', '')}\n")
-                        f.write("\n")
-                        
-                        f.write("#### 재무 정보\n\n")
-                        for insight in data.get("재무 정보", []):
-                            f.write(f"- {insight.get('제목', '')}: {insight.get('내용', '')}\n")
-                        f.write("\n")
-                        
-                        f.write("#### 투자 의견\n\n")
-                        for insight in data.get("투자 의견", []):
-                            f.write(f"- {insight.get('제목', '')}: {insight.get('내용', '')}\n")
-                        f.write("\n")
-                        
-                        f.write("#### 사업 전략\n\n")
-                        for insight in data.get("사업 전략", []):
-                            f.write(f"- {insight.get('제목', '')}: {insight.get('내용', '')}\n")
-                        f.write("\n")
-                        
-                        if "차트" in data and "technical" in data["차트"]:
-                            f.write(f"![{company} 기술적 분석]({data['차트']['technical']})\n\n")
-                else:
-                    f.write(company_analysis.get("정보", "정보가 없습니다.") + "\n\n")
+                        if "성과 비교 차트" in data and data["성과 비교 차트"]:
+                            _image(parts, fmt, f"{sector} 업종 성과 비교", data['성과 비교 차트'])
+            else:
+                _paragraph(parts, fmt, sector_analysis.get("정보", "정보가 없습니다."))
+        
+        # 기업 분석
+        _heading(parts, fmt, 2, "🏭 기업 분석")
+        if "기업 분석" in report["내용"]:
+            company_analysis = report["내용"]["기업 분석"]
             
-            # 국제 정세 분석
-            if "국제 정세 분석" in report["목차"]:
-                section_index = report["목차"].index("국제 정세 분석") + 1
-                f.write(f"## 🌐 국제 정세 분석\n\n")
-                
-                if "국제 정세 분석" in report["내용"]:
-                    geopolitical_analysis = report["내용"]["국제 정세 분석"]
-                    
-                    # 트럼프 정책 영향
-                    if "트럼프 정책 영향" in geopolitical_analysis:
-                        f.write("### 🇺🇸 트럼프 정책 영향\n\n")
-                        f.write(f"```\n{geopolitical_analysis['트럼프 정책 영향']}\n```\n\n")
-                    
-                    # 산업별 영향
-                    if "산업별 영향" in geopolitical_analysis:
-                        f.write("### 🏭 산업별 영향\n\n")
-                        for industry, analysis in geopolitical_analysis["산업별 영향"].items():
-                            f.write(f"#### {industry} 산업\n\n")
-                            f.write(f"```\n{analysis}\n```\n\n")
+            if isinstance(company_analysis, dict) and company_analysis != {"정보": "기업 분석을 수행하지 않았습니다."}:
+                for company, data in company_analysis.items():
+                    _heading(parts, fmt, 3, company)
+                    for section in ("기업 개요", "최근 뉴스", "재무 정보", "투자 의견", "사업 전략"):
+                        _heading(parts, fmt, 4, section)
+                        _list(parts, fmt, _insight_lines(data.get(section, [])))
                     
-                    # 투자 전략 제안
-                    if "투자 전략 제안" in geopolitical_analysis:
-                        f.write("### 💰 투자 전략 제안\n\n")
-                        f.write(f"```\n{geopolitical_analysis['투자 전략 제안']}\n```\n\n")
+                    if "차트" in data and "technical" in data["차트"]:
+                        _image(parts, fmt, f"{company} 기술적 분석", data['차트']['technical'])
+            else:
+                _paragraph(parts, fmt, company_analysis.get("정보", "정보가 없습니다."))
+        
+        # 국제 정세 분석
+        if "국제 정세 분석" in report["목차"]:
+            _heading(parts, fmt, 2, "🌐 국제 정세 분석")
             
-            # 투자 전략
-            strategy_index = report["목차"].index("투자 전략") + 1
-            f.write(f"## 💼 투자 전략\n\n")
-            if "투자 전략" in report["내용"]:
-                strategy = report["내용"]["투자 전략"]
-                
-                f.write(f"### 시장 전망\n{strategy.get('시장 전망', '')}\n\n")
-                
-                f.write("### 단기 전략\n\n")
-                for item in strategy.get("단기 전략", []):
-                    f.write(f"- {item}\n")
-                f.write("\n")
+            if "국제 정세 분석" in report["내용"]:
+                geopolitical_analysis = report["내용"]["국제 정세 분석"]
                 
-                f.write("### 중장기 전략\n\n")
-                for item in strategy.get("중장기 전략", []):
-                    f.write(f"- {item}\n")
-                f.write("\n")
+                # 트럼프 정책 영향
+                if "트럼프 정책 영향" in geopolitical_analysis:
+                    _heading(parts, fmt, 3, "🇺🇸 트럼프 정책 영향")
+                    _code_block(parts, fmt, geopolitical_analysis['트럼프 정책 영향'])
                 
-                # 트럼프 정책 관련 전략
-                if "트럼프 정책 관련 전략" in strategy:
-                    f.write("### 트럼프 정책 관련 전략\n\n")
-                    for item in strategy.get("트럼프 정책 관련 전략", []):
-                        f.write(f"- {item}\n")
-                    f.write("\n")
+                # 산업별 영향
+                if "산업별 영향" in geopolitical_analysis:
+                    _heading(parts, fmt, 3, "🏭 산업별 영향")
+                    for industry, analysis in geopolitical_analysis["산업별 영향"].items():
+                        _heading(parts, fmt, 4, f"{industry} 산업")
+                        _code_block(parts, fmt, analysis)
                 
-                f.write("### 주목할 포인트\n\n")
-                for item in strategy.get("주목할 포인트", []):
-                    f.write(f"- {item}\n")
-                f.write("\n\n")
+                # 투자 전략 제안
+                if "투자 전략 제안" in geopolitical_analysis:
+                    _heading(parts, fmt, 3, "💰 투자 전략 제안")
+                    _code_block(parts, fmt, geopolitical_analysis['투자 전략 제안'])
+        
+        # 투자 전략
+        _heading(parts, fmt, 2, "💼 투자 전략")
+        if "투자 전략" in report["내용"]:
+            strategy = report["내용"]["투자 전략"]
             
-            # 결론
-            conclusion_index = report["목차"].index("결론") + 1
-            f.write(f"## 📝 결론\n\n")
-            if "결론" in report["내용"]:
-                conclusion = report["내용"]["결론"]
-                
-                f.write(f"### 요약\n{conclusion.get('요약', '')}\n\n")
-                
-                f.write("### 주요 결론\n\n")
-                for item in conclusion.get("주요 결론", []):
-                    f.write(f"- **{item}**\n")
-                f.write("\n")
-                
-                f.write("### 향후 모니터링 포인트\n\n")
-                for item in conclusion.get("향후 모니터링 포인트", []):
-                    f.write(f"- ⚠️ {item}\n")
-                f.write("\n")
+            _heading(parts, fmt, 3, "시장 전망", strategy.get('시장 전망', ''))
+            
+            # 항목이 없는 전략은 제목도 출력하지 않음
+            for key, tail in _STRATEGY_SECTIONS:
+                items = strategy.get(key)
+                if not items:
+                    continue
+                _heading(parts, fmt, 3, key)
+                _list(parts, fmt, items, tail=tail)
         
-        return filepath
\ No newline at end of file
+        # 결론
+        _heading(parts, fmt, 2, "📝 결론")
+        if "결론" in report["내용"]:
+            conclusion = report["내용"]["결론"]
+            
+            _heading(parts, fmt, 3, "요약", conclusion.get('요약', ''))
+            
+            # 항목이 없는 목록은 제목도 출력하지 않음
+            findings = conclusion.get("주요 결론")
+            if findings:
+                _heading(parts, fmt, 3, "주요 결론")
+                _list(parts, fmt, findings, bold=True)
+            
+            watch_points = conclusion.get("향후 모니터링 포인트")
+            if watch_points:
+                _heading(parts, fmt, 3, "향후 모니터링 포인트")
+                _list(parts, fmt, watch_points, prefix="⚠️ ")
+        
+        return "".join(parts)
+    
+    def _build_report_string(self, report):
+        """보고서를 마크다운 문자열로 생성"""
+        return self._render(report, "md")
+    
+    def _save_report_as_markdown(self, report, report_name):
+        """보고서를 마크다운 파일로 저장"""
+        filepath = os.path.join(self.reports_dir, f"{report_name}.md")
+        
+        ensure_dir(str(self.reports_dir))
+        _write_bytes(filepath, self._build_report_string(report).encode("utf-8"))
+        
+        return filepath
+    
+    def _with_markdown(self, results):
+        """마크다운 파일이 아직 저장되지 않았으면 저장하고 결과에 경로 추가"""
+        if "report_path" not in results:
+            results["report_path"] = self._save_report_as_markdown(results["report"], results["report_name"])
+        return results
@@ -1,15 +1,35 @@
 # agents/stock_analyzer.py 수정
 
-import os
-import json
+from concurrent.futures import ThreadPoolExecutor, as_completed
 import numpy as np
 from datetime import datetime
 from pathlib import Path
 
-from config import DATA_DIR, TARGET_COMPANIES
+from config import ANALYSIS_RESULTS_DIR, TARGET_COMPANIES, TARGET_COMPANIES_TOP5
 from tools.stock_data import StockDataFetcher
 from tools.analyzer import StockAnalyzer as TechnicalAnalyzer  # 이름 변경
 from tools.rag_tools import CompanyAnalyzer
+from tools.io_utils import dump_json
+
+# 자주 나오는 numpy 타입 -> 변환 함수 (isinstance 검사 없이 타입으로 바로 조회)
+_NP_DISPATCH = {
+    np.int64: int, np.int32: int,
+    np.float64: float, np.float32: float,
+    np.bool_: bool,
+    np.ndarray: np.ndarray.tolist,
+}
+
+def numpy_encoder(obj):
+    """numpy 값을 JSON으로 직렬화할 수 있는 파이썬 기본 타입으로 변환"""
+    convert = _NP_DISPATCH.get(type(obj))
+    if convert is not None:
+        return convert(obj)
+    # 그 밖의 numpy 정수/실수 타입 (int16, float16 등)
+    if isinstance(obj, np.integer):
+        return int(obj)
+    elif isinstance(obj, np.floating):
+        return float(obj)
+    raise TypeError(f"Object of type {type(obj)} is not JSON serializable")
 
 class StockAnalyzer:
     """
@@ -21,8 +41,7 @@ class StockAnalyzer:
         self.stock_fetcher = StockDataFetcher()
         self.technical_analyzer = TechnicalAnalyzer()  # 이름 변경
         self.company_analyzer = CompanyAnalyzer()
-        self.analysis_dir = DATA_DIR / "analysis_results"
-        os.makedirs(self.analysis_dir, exist_ok=True)
+        self.analysis_dir = ANALYSIS_RESULTS_DIR
         # 상태 정보 추가
         self.state = {
             "status": "idle",
@@ -31,6 +50,30 @@ class StockAnalyzer:
             "results": {}
         }
     
+    def _analyze_one(self, company):
+        """
+        기업 하나의 기업 정보 분석과 기술적 분석 수행
+        
+        Args:
+            company (dict): {"code": 종목 코드, "name": 기업명}
+            
+        Returns:
+            tuple: (종목 코드, 분석 결과)
+        """
+        code = company["code"]
+        name = company["name"]
+        
+        # RAG를 통한 기업 정보 분석
+        company_info = self.company_analyzer.analyze_company(code, name)
+        
+        # 기술적 분석 (주가 데이터는 full_analysis 내부에서 가져옴)
+        technical_analysis = self.technical_analyzer.full_analysis(code, name)  # 이름 변경된 메소드 사용
+        
+        return code, {
+            "company_info": company_info,
+            "technical_analysis": technical_analysis
+        }
+    
     def analyze_stocks(self, query_data, market_research_results=None):
         """
         주식 분석 수행
@@ -53,7 +96,6 @@ class StockAnalyzer:
         # 타겟 기업 분석
         if query_data.get("stock_analysis", False):
             self.state["progress"] = 0.3
-            company_results = {}
             
             # 쿼리에서 타겟 추출
             targets = query_data.get("targets", [])
@@ -76,26 +118,21 @@ class StockAnalyzer:
                             "name": companies[0]["name"]
                         })
             
-            # 기업 분석 수행
+            # 기업 분석 수행 (기업별 분석은 네트워크 대기 위주이므로 스레드로 동시에 수행)
             total_companies = len(companies_to_analyze)
-            for i, company in enumerate(companies_to_analyze):
-                # 상태 업데이트 - 기업 분석 진행도
-                self.state["progress"] = 0.3 + (0.4 * (i / total_companies))
-                
-                code = company["code"]
-                name = company["name"]
-                
-                # RAG를 통한 기업 정보 분석
-                company_info = self.company_analyzer.analyze_company(code, name)
-                
-                # 기술적 분석
-                data = self.stock_fetcher.get_stock_data(code)
-                technical_analysis = self.technical_analyzer.full_analysis(code, name)  # 이름 변경된 메소드 사용
-                
-                company_results[code] = {
-                    "company_info": company_info,
-                    "technical_analysis": technical_analysis
-                }
+            # 결과 순서는 분석 대상 순서로 유지
+            company_results = {company["code"]: None for company in companies_to_analyze}
+            if companies_to_analyze:
+                done = 0
+                with ThreadPoolExecutor(max_workers=min(8, total_companies)) as executor:
+                    futures = [executor.submit(self._analyze_one, company) for company in companies_to_analyze]
+                    for future in as_completed(futures):
+                        code, company_result = future.result()
+                        company_results[code] = company_result
+                        
+                        # 상태 업데이트 - 기업 분석 진행도 (완료 처리는 호출 스레드에서만 수행)
+                        done += 1
+                        self.state["progress"] = 0.3 + (0.4 * (done / total_companies))
             
             results["company_analysis"] = company_results
         
@@ -108,12 +145,13 @@ class StockAnalyzer:
                 if target["type"] == "sector":
                     sector_name = target["name"]
                     
-                    if sector_name in TARGET_COMPANIES:
-                        company_codes = [company["code"] for company in TARGET_COMPANIES[sector_name][:5]]
+                    if sector_name in TARGET_COMPANIES_TOP5:
+                        top5 = TARGET_COMPANIES_TOP5[sector_name]
+                        company_codes = top5["codes"]
                         comparison = self.company_analyzer.compare_companies(company_codes, sector_name)
                         
                         # 성과 비교
-                        company_names = [company["name"] for company in TARGET_COMPANIES[sector_name][:5]]
+                        company_names = top5["names"]
                         performance = self.stock_fetcher.compare_performance(company_codes, company_names)
                         
                         # 수정 후
@@ -129,19 +167,8 @@ class StockAnalyzer:
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         results_file = self.analysis_dir / f"stock_analysis_results_{timestamp}.json"
         
-        def numpy_encoder(obj):
-            if isinstance(obj, np.integer):
-                return int(obj)
-            elif isinstance(obj, np.floating):
-                return float(obj)
-            elif isinstance(obj, np.ndarray):
-                return obj.tolist()
-            elif isinstance(obj, (np.bool_)):
-                return bool(obj)
-            raise TypeError(f"Object of type {type(obj)} is not JSON serializable")
-
-        with open(results_file, "w", encoding="utf-8") as f:
-            json.dump(results, f, ensure_ascii=False, indent=2, default=numpy_encoder)
+        # orjson이 있으면 numpy 값은 C 수준에서 바로 직렬화되고, numpy_encoder는 그 외 경우에만 호출됨
+        dump_json(results_file, results, pretty=True, default=numpy_encoder)
         
         results["results_file"] = str(results_file)
         print(f"주식 분석 완료. 결과 저장 위치: {results_file}")
@@ -1,13 +1,31 @@
 # agents/supervisor.py
 
 import os
-import time
-from copy import deepcopy
+import re
 import json
-from datetime import datetime
+import time
+from dataclasses import asdict
 from pathlib import Path
 
-from config import DEFAULT_STATE, OUTPUTS_DIR, REPORTS_DIR
+from config import KEEP_STATE_HISTORY, OUTPUTS_DIR, REPORTS_DIR, COMPANY_NAME_INDEX, COMPANY_NAME_PATTERN
+from agents.agent_state import make_default_state
+from tools.io_utils import dump_json, dumps_json, write_atomic
+
+# 쿼리 키워드 -> 분석 플래그 매핑
+_KEYWORD_FLAGS = {
+    **dict.fromkeys(("시장", "트렌드", "동향", "추세"), "market_analysis"),
+    **dict.fromkeys(("주식", "종목", "기업", "회사"), "stock_analysis"),
+    **dict.fromkeys(("최신", "최근", "뉴스", "오늘", "이슈"), "current_events"),
+    **dict.fromkeys(("업종", "은행", "증권", "보험", "산업"), "sector_analysis"),
+    **dict.fromkeys(("트럼프", "대통령", "미국"), "has_trump_reference"),
+}
+# 쿼리를 한 번만 훑어 모든 키워드를 찾는 패턴 (전방 탐색으로 "기업종목"처럼 겹친 키워드도 모두 찾음)
+_KEYWORD_PATTERN = re.compile("(?=(" + "|".join(map(re.escape, _KEYWORD_FLAGS)) + "))")
+# 쿼리에서 추출할 업종
+_SECTORS = ("은행", "증권", "보험")
+
+# 상태 파일 최소 저장 간격(초). 그 사이의 변경은 다음 저장 또는 최종 저장에 반영
+_STATE_FLUSH_INTERVAL = 0.5
 
 class Supervisor:
     """
@@ -16,62 +34,108 @@ class Supervisor:
     
     def __init__(self):
         """초기화 메서드"""
-        self.state = deepcopy(DEFAULT_STATE)
-        self.state["supervisor"]["status"] = "active"
-        self.state["supervisor"]["current_task"] = "initializing"
+        self.state = make_default_state()
+        self.state["supervisor"].status = "active"
+        self.state["supervisor"].current_task = "initializing"
+        # 지난 상태는 변경되지 않으므로 복사 대신 직렬화된 JSON 바이트로 보관 (필요할 때 load_state_history로 파싱)
         self.state_history = []
+        # 호출마다 새 파일을 만들지 않고 하나의 상태 파일을 교체하며 저장
+        self.state_file = OUTPUTS_DIR / "state_current.json"
+        self._last_flush = 0.0
         self._save_state()
     
-    def _save_state(self):
-        """현재 상태를 저장하고 상태 기록을 업데이트합니다."""
-        self.state_history.append(deepcopy(self.state))
+    def _save_state(self, final=False):
+        """
+        상태 기록을 업데이트하고 필요할 때만 상태 파일을 저장합니다.
         
-        # 상태를 JSON 파일로 저장
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        state_file = OUTPUTS_DIR / f"State_Definition{len(self.state_history)}.json"
+        Args:
+            final (bool): True이면 저장 간격과 관계없이 들여쓰기한 JSON으로 즉시 저장
+        """
+        if final:
+            self.flush_state(pretty=True)
+            return
         
-        with open(state_file, "w", encoding="utf-8") as f:
-            json.dump(self.state, f, ensure_ascii=False, indent=2)
+        due = time.monotonic() - self._last_flush >= _STATE_FLUSH_INTERVAL
+        if not (KEEP_STATE_HISTORY or due):
+            return
+        
+        # 한 번 직렬화한 바이트를 상태 기록과 중간 저장에 함께 사용
+        try:
+            snapshot = dumps_json(self.state, default=asdict)
+        except TypeError as e:
+            print(f"상태 저장 중 오류 발생: {e}")
+            return
+        
+        if KEEP_STATE_HISTORY:
+            self.state_history.append(snapshot)
+        if due:
+            write_atomic(self.state_file, snapshot)
+            self._last_flush = time.monotonic()
+    
+    def load_state_history(self, index=-1):
+        """
+        상태 기록에서 하나를 dict로 파싱하여 반환
+        
+        Args:
+            index (int): 상태 기록 인덱스 (기본값은 가장 최근 기록)
+            
+        Returns:
+            dict: 해당 시점의 상태
+        """
+        return json.loads(self.state_history[index])
+    
+    def flush_state(self, pretty=True):
+        """
+        현재 상태를 JSON 파일로 저장 (임시 파일에 기록 후 교체)
+        
+        Args:
+            pretty (bool): 사람이 읽을 용도로 들여쓰기하여 저장 (중간 저장은 한 줄로 저장)
+        """
+        try:
+            dump_json(self.state_file, self.state, pretty=pretty, default=asdict)
+        except TypeError as e:
+            print(f"상태 저장 중 오류 발생: {e}")
+        self._last_flush = time.monotonic()
     
     def assign_task(self, agent_name, task):
         """에이전트에 작업 할당"""
-        self.state[agent_name]["status"] = "working"
-        self.state[agent_name]["assigned_task"] = task
-        self.state[agent_name]["progress"] = 0.0
-        self.state["supervisor"]["current_task"] = f"supervising_{agent_name}"
+        self.state[agent_name].status = "working"
+        self.state[agent_name].assigned_task = task
+        self.state[agent_name].progress = 0.0
+        self.state["supervisor"].current_task = f"supervising_{agent_name}"
         self._save_state()
         
         print(f"태스크 할당: {agent_name} -> {task}")
     
     def update_progress(self, agent_name, progress, results=None):
         """에이전트 진행 상황 업데이트"""
-        self.state[agent_name]["progress"] = progress
+        self.state[agent_name].progress = progress
         
         if results:
             if agent_name == "market_researcher":
-                self.state["supervisor"]["market_research_results"].update(results)
+                self.state["supervisor"].market_research_results.update(results)
             elif agent_name == "stock_analyzer":
-                self.state["supervisor"]["stock_analysis_results"].update(results)
+                self.state["supervisor"].stock_analysis_results.update(results)
             elif agent_name == "report_compiler":
-                self.state["supervisor"]["report_draft"].update(results)
+                self.state["supervisor"].report_draft.update(results)
         
         self._save_state()
     
     def complete_task(self, agent_name, results=None):
         """에이전트 작업 완료 처리"""
-        self.state[agent_name]["status"] = "idle"
-        self.state[agent_name]["progress"] = 1.0
+        self.state[agent_name].status = "idle"
+        self.state[agent_name].progress = 1.0
         
         if results:
             if agent_name == "market_researcher":
-                self.state["supervisor"]["market_research_results"].update(results)
+                self.state["supervisor"].market_research_results.update(results)
             elif agent_name == "stock_analyzer":
-                self.state["supervisor"]["stock_analysis_results"].update(results)
+                self.state["supervisor"].stock_analysis_results.update(results)
             elif agent_name == "report_compiler":
-                self.state["supervisor"]["report_draft"].update(results)
+                self.state["supervisor"].report_draft.update(results)
                 self.state["output"]["final_report"] = results.get("report_path", "")
         
-        self._save_state()
+        self._save_state(final=True)
         print(f"태스크 완료: {agent_name}")
     
     def process_query(self, query):
@@ -90,71 +154,76 @@ class Supervisor:
             "market_analysis": False,
             "stock_analysis": False,
             "sector_analysis": False,
+            "current_events": False,
+            "has_trump_reference": False,
+            "geopolitical_analysis": False,
             "report_type": "pdf",
-            "targets": []
+            "targets": [],
+            # 하위 에이전트의 키워드 라우팅에 사용
+            "raw_query": query,
+            "original_query": query
         }
         
-        # 키워드 검색
-        if any(word in query_lower for word in ["시장", "트렌드", "동향", "추세"]):
-            parsed["market_analysis"] = True
+        # 키워드 검색 (쿼리를 한 번만 탐색)
+        found = set(_KEYWORD_PATTERN.findall(query_lower))
+        for keyword in found:
+            parsed[_KEYWORD_FLAGS[keyword]] = True
         
-        if any(word in query_lower for word in ["주식", "종목", "기업", "회사"]):
-            parsed["stock_analysis"] = True
+        # 트럼프 관련 쿼리는 국제 정세 분석 수행
+        parsed["geopolitical_analysis"] = parsed["has_trump_reference"]
         
-        if any(word in query_lower for word in ["업종", "은행", "증권", "보험", "산업"]):
-            parsed["sector_analysis"] = True
-            
-            # 업종 추출
-            for sector in ["은행", "증권", "보험"]:
-                if sector in query_lower:
+        # 업종 추출
+        if parsed["sector_analysis"]:
+            for sector in _SECTORS:
+                if sector in found:
                     parsed["targets"].append({"type": "sector", "name": sector})
         
-        # 타겟 기업 추출 (TARGET_COMPANIES에서 검색)
-        from config import TARGET_COMPANIES
-        for sector, companies in TARGET_COMPANIES.items():
-            for company in companies:
-                if company['name'] in query:
-                    parsed["targets"].append({
-                        "type": "company", 
-                        "name": company['name'], 
-                        "code": company['code'],
-                        "sector": sector
-                    })
+        # 타겟 기업 추출 (미리 컴파일한 패턴으로 쿼리를 한 번만 탐색, 결과는 설정 순서 유지)
+        found = set(COMPANY_NAME_PATTERN.findall(query))
+        for name, (code, sector) in COMPANY_NAME_INDEX.items():
+            if name in found:
+                parsed["targets"].append({
+                    "type": "company", 
+                    "name": name, 
+                    "code": code,
+                    "sector": sector
+                })
         
         self.state["query"]["processed_query"] = parsed
         print(f"쿼리 분석 결과: {parsed}")
     
     def run(self, market_researcher, stock_analyzer, geopolitical_analyst, report_compiler):
+        supervisor_state = self.state["supervisor"]
         try:
             # 상태 업데이트
-            self.state["supervisor"]["status"] = "active"
-            self.state["supervisor"]["current_task"] = "running_analysis"
-            self.state["supervisor"]["progress"] = 0.1
+            supervisor_state.status = "active"
+            supervisor_state.current_task = "running_analysis"
+            supervisor_state.progress = 0.1
             
             # 쿼리 데이터
             query_data = self.state["query"]["processed_query"]  # 올바른 경로
             
             # 1. 시장 조사
-            self.state["supervisor"]["progress"] = 0.2
+            supervisor_state.progress = 0.2
             market_research_results = market_researcher.analyze_market(query_data)
-            self.state["supervisor"]["market_research_results"] = market_research_results
+            supervisor_state.market_research_results = market_research_results
             
             # 2. 주식 분석
-            self.state["supervisor"]["progress"] = 0.4
+            supervisor_state.progress = 0.4
             stock_analysis_results = stock_analyzer.analyze_stocks(query_data, market_research_results)
-            self.state["supervisor"]["stock_analysis_results"] = stock_analysis_results
+            supervisor_state.stock_analysis_results = stock_analysis_results
             
             # 3. 국제 정세 분석 - 트럼프 언급이 있는 경우에만 수행
             if query_data.get("has_trump_reference", False) or query_data.get("geopolitical_analysis", False):
-                self.state["supervisor"]["progress"] = 0.6
+                supervisor_state.progress = 0.6
                 geopolitical_analysis_results = geopolitical_analyst.analyze_geopolitics(query_data)
-                self.state["supervisor"]["geopolitical_analysis_results"] = geopolitical_analysis_results
+                supervisor_state.geopolitical_analysis_results = geopolitical_analysis_results
             else:
                 geopolitical_analysis_results = {"analysis": "국제 정세 분석이 요청되지 않았습니다."}
-                self.state["supervisor"]["geopolitical_analysis_results"] = geopolitical_analysis_results
+                supervisor_state.geopolitical_analysis_results = geopolitical_analysis_results
             
             # 4. 보고서 생성
-            self.state["supervisor"]["progress"] = 0.8
+            supervisor_state.progress = 0.8
             output = report_compiler.generate_report(
                 query_data,
                 market_research_results,
@@ -168,13 +237,13 @@ class Supervisor:
             }
             
             # 완료 상태 업데이트
-            self.state["supervisor"]["status"] = "completed"
-            self.state["supervisor"]["current_task"] = "analysis_complete"
-            self.state["supervisor"]["progress"] = 1.0
+            supervisor_state.status = "completed"
+            supervisor_state.current_task = "analysis_complete"
+            supervisor_state.progress = 1.0
             
             return True
         except Exception as e:
             print(f"분석 실행 중 오류 발생: {str(e)}")
             self.state["error"] = str(e)
-            self.state["supervisor"]["status"] = "error"
+            supervisor_state.status = "error"
             return False
\ No newline at end of file
@@ -8,7 +8,7 @@ from pathlib import Path
 # config 모듈 임포트
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
-from config import OUTPUTS_DIR, REPORTS_DIR, CHARTS_DIR
+import config  # 임포트 시 데이터/출력 디렉토리 생성
 from agents.supervisor import Supervisor
 from agents.market_researcher import MarketResearcher
 from agents.stock_analyzer import StockAnalyzer
@@ -16,13 +16,6 @@ from agents.report_compiler import ReportCompiler
 from agents.geopolitical_analyst import GeopoliticalAnalyst
 
 
-def setup_environment():
-    """환경 설정 및 필요한 디렉토리 생성"""
-    os.makedirs(OUTPUTS_DIR, exist_ok=True)
-    os.makedirs(REPORTS_DIR, exist_ok=True)
-    os.makedirs(CHARTS_DIR, exist_ok=True)
-
-
 def run_analysis(query, output_format="markdown"):
     """
     분석 수행
@@ -41,24 +34,14 @@ def run_analysis(query, output_format="markdown"):
     supervisor = Supervisor()
     market_researcher = MarketResearcher()
     stock_analyzer = StockAnalyzer()
-    report_compiler = ReportCompiler()
+    report_compiler = ReportCompiler(verbose=True, auto_open=True)
     geopolitical_analyst = GeopoliticalAnalyst()
 
     # 쿼리 처리
     supervisor.process_query(query)
 
-    # 트럼프 관련 쿼리 확인
-    has_trump_component = (
-        "트럼프" in query.lower()
-        or "대통령" in query.lower()
-        or "미국" in query.lower()
-    )
-    supervisor.state["query"]["processed_query"][
-        "has_trump_reference"
-    ] = has_trump_component
-    supervisor.state["query"]["processed_query"][
-        "geopolitical_analysis"
-    ] = has_trump_component
+    # 트럼프 관련 쿼리 확인 (쿼리 분석 시 함께 판별)
+    has_trump_component = supervisor.state["query"]["processed_query"]["has_trump_reference"]
 
     # PDF 출력 여부에 따라 다른 워크플로우 실행
     if output_format.lower() == 'pdf':
@@ -115,6 +98,9 @@ def run_analysis(query, output_format="markdown"):
             report_compiler
         )
 
+    # 실행 중 저장 간격에 걸려 기록되지 않은 변경까지 최종 상태로 저장
+    supervisor.flush_state()
+
     if success:
         print("=" * 50)
         print("분석이 성공적으로 완료되었습니다.")
@@ -128,8 +114,6 @@ def run_analysis(query, output_format="markdown"):
 
 def main():
     """메인 함수"""
-    setup_environment()
-
     print("=" * 50)
     print("금융 시장 트렌드 분석 시스템")
     print("=" * 50)
@@ -1,6 +1,7 @@
 # config.py
 
 import os
+import re
 from pathlib import Path
 from dotenv import load_dotenv
 
@@ -18,9 +19,28 @@ BASE_DIR = Path(__file__).parent
 DATA_DIR = BASE_DIR / "data"
 MARKET_REPORTS_DIR = DATA_DIR / "market_reports"
 COMPANY_DOCS_DIR = DATA_DIR / "company_docs"
+CACHE_DIR = DATA_DIR / "cache"
 OUTPUTS_DIR = BASE_DIR / "outputs"
 CHARTS_DIR = OUTPUTS_DIR / "charts"
 REPORTS_DIR = OUTPUTS_DIR / "reports"
+ANALYSIS_RESULTS_DIR = DATA_DIR / "analysis_results"
+GEOPOLITICAL_RESULTS_DIR = DATA_DIR / "geopolitical_results"
+GEOPOLITICAL_ANALYSIS_DIR = DATA_DIR / "geopolitical_analysis"
+
+_dirs_ready = False
+
+def _ensure_dirs():
+    """데이터/출력 디렉토리 생성 (모듈 임포트 시 한 번만 수행)"""
+    global _dirs_ready
+    if _dirs_ready:
+        return
+    for path in (DATA_DIR, MARKET_REPORTS_DIR, COMPANY_DOCS_DIR, CACHE_DIR,
+                 OUTPUTS_DIR, CHARTS_DIR, REPORTS_DIR,
+                 ANALYSIS_RESULTS_DIR, GEOPOLITICAL_RESULTS_DIR, GEOPOLITICAL_ANALYSIS_DIR):
+        path.mkdir(parents=True, exist_ok=True)
+    _dirs_ready = True
+
+_ensure_dirs()
 
 # 분석 대상 기업 설정
 # 한국 금융권 업종별 주요 기업
@@ -63,48 +83,29 @@ TARGET_COMPANIES = {
     ]
 }
 
-DEFAULT_STATE = {
-    "supervisor": {
-        "status": "active",
-        "current_task": "initializing",
-        "progress": 0.0,
-        "market_research_results": {},
-        "stock_analysis_results": {},
-        "geopolitical_analysis_results": {},  # 추가
-        "report_draft": {}
-    },
-    "market_researcher": {
-        "status": "idle",
-        "assigned_task": "",
-        "progress": 0.0,
-        "results": {}
-    },
-    "stock_analyzer": {
-        "status": "idle",
-        "assigned_task": "",
-        "progress": 0.0,
-        "results": {}
-    },
-    "geopolitical_analyst": {  # 추가
-        "status": "idle",
-        "assigned_task": "",
-        "progress": 0.0,
-        "results": {}
-    },
-    "report_compiler": {
-        "status": "idle",
-        "assigned_task": "",
-        "progress": 0.0,
-        "report_draft": {}
-    },
-    "query": {
-        "original_query": "",
-        "processed_query": {},
-        "has_geopolitical_component": False,  # 추가
-        "has_trump_reference": False,  # 추가
-    },
-    "output": {
-        "status": "not_started",
-        "final_report": ""
+# 업종별 상위 5개 기업의 코드/이름 (업종 비교 분석에 사용)
+TARGET_COMPANIES_TOP5 = {
+    sector: {
+        "codes": tuple(company["code"] for company in companies[:5]),
+        "names": tuple(company["name"] for company in companies[:5])
     }
-}
\ No newline at end of file
+    for sector, companies in TARGET_COMPANIES.items()
+}
+
+# 기업명 -> (종목 코드, 업종) 조회 테이블과 쿼리에서 기업명을 한 번에 찾는 패턴
+COMPANY_NAME_INDEX = {
+    company["name"]: (company["code"], sector)
+    for sector, companies in TARGET_COMPANIES.items()
+    for company in companies
+}
+# 종목 코드 -> (기업명, 업종) 조회 테이블
+COMPANY_CODE_INDEX = {
+    company["code"]: (company["name"], sector)
+    for sector, companies in TARGET_COMPANIES.items()
+    for company in companies
+}
+# 긴 이름을 먼저 두어 다른 이름을 포함하는 기업명이 우선 일치하도록 함
+COMPANY_NAME_PATTERN = re.compile("|".join(map(re.escape, sorted(COMPANY_NAME_INDEX, key=len, reverse=True))))
+
+# 상태 기록 유지 여부 (KEEP_STATE_HISTORY=0 이면 상태 변경 기록을 남기지 않음)
+KEEP_STATE_HISTORY = os.getenv("KEEP_STATE_HISTORY", "1") == "1"
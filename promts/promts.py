@@ -31,6 +31,23 @@ INDUSTRY_IMPACT_PROMPT = """
 구체적인 기업 사례와 데이터를 포함하여 분석해주세요.
 """
 
+# 여러 산업 영향 일괄 분석 프롬프트
+INDUSTRY_IMPACT_BATCH_PROMPT = """
+당신은 글로벌 정세가 특정 산업에 미치는 영향을 분석하는 전문가입니다. 트럼프 행정부의 정책 기조가 다음 한국 산업들에 미치는 영향을 각각 분석해주세요:
+
+산업 목록: {industries}
+
+각 산업별 분석 포인트:
+1. 트럼프 행정부의 관련 산업 정책 방향
+2. 관련 산업의 글로벌 공급망에 미치는 영향
+3. 해당 산업 내 주요 한국 기업들의 리스크와 기회
+4. 투자 관점에서의 시사점
+5. 예상되는 시장 반응과 주가 변동성
+
+구체적인 기업 사례와 데이터를 포함하여 분석해주세요.
+응답은 산업명을 키로, 해당 산업의 분석 내용을 문자열 값으로 하는 JSON 객체 하나로만 작성해주세요.
+"""
+
 # 주식 투자 전략 프롬프트
 INVESTMENT_STRATEGY_PROMPT = """
 당신은 국제 정세와 금융 시장 변화에 따른 투자 전략을 수립하는 전문가입니다. 트럼프 행정부의 정책 기조를 고려한 한국 주식 시장 투자 전략을 제시해주세요.
@@ -0,0 +1,9 @@
+# tests/conftest.py
+
+import os
+import sys
+
+# 프로젝트 루트를 경로에 추가 (tools, config 모듈 임포트용)
+_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if _ROOT not in sys.path:
+    sys.path.insert(0, _ROOT)
@@ -0,0 +1,79 @@
+# tests/test_numba_kernels.py
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from tools._numba_kernels import compute_all_indicators, rolling_mean_1d, technical_indicator_series, wilder_rsi_last
+
+
+def _close_with_gaps(n=300, gaps=(0, 10, 11, 150)):
+    """결측(NaN) 봉이 섞인 종가 배열"""
+    close = 100 + np.random.default_rng(0).standard_normal(n).cumsum()
+    close[list(gaps)] = np.nan
+    return close
+
+
+def _pandas_indicators(close):
+    """pandas rolling/ewm으로 계산한 기준 지표 (RSI 제외)"""
+    s = pd.Series(close)
+    ema12 = s.ewm(span=12, adjust=False).mean()
+    ema26 = s.ewm(span=26, adjust=False).mean()
+    macd = ema12 - ema26
+    return (
+        s.rolling(5).mean(), s.rolling(20).mean(), s.rolling(60).mean(), s.rolling(120).mean(),
+        s.rolling(20).std(), ema12, ema26, macd, macd.ewm(span=9, adjust=False).mean()
+    )
+
+
+@pytest.mark.parametrize("gaps", [(), (10,), (0, 10, 11, 150)])
+def test_technical_indicator_series_matches_pandas(gaps):
+    close = _close_with_gaps(gaps=gaps)
+    names = ("MA5", "MA20", "MA60", "MA120", "MA20_STD", "EMA12", "EMA26", "MACD", "Signal")
+    for name, got, expected in zip(names, technical_indicator_series(close), _pandas_indicators(close)):
+        np.testing.assert_allclose(got, expected.to_numpy(), rtol=1e-9, atol=1e-9, equal_nan=True, err_msg=name)
+
+
+@pytest.mark.parametrize("gaps", [(), (10,), (0, 10, 11, 150)])
+def test_rolling_mean_1d_matches_pandas(gaps):
+    close = _close_with_gaps(gaps=gaps)
+    for window in (5, 20):
+        np.testing.assert_allclose(
+            rolling_mean_1d(close, window), pd.Series(close).rolling(window).mean().to_numpy(),
+            rtol=1e-9, atol=1e-9, equal_nan=True
+        )
+
+
+def test_technical_indicator_series_rsi_recovers_after_gap():
+    close = _close_with_gaps(gaps=(10,))
+    rsi = technical_indicator_series(close)[-1]
+    assert np.isnan(rsi[:14]).all()
+    assert np.isfinite(rsi[14:]).all()
+    assert ((rsi[14:] > 0) & (rsi[14:] < 100)).all()
+
+
+@pytest.mark.parametrize("gaps", [(), (5,), (10, 150)])
+def test_wilder_rsi_last_matches_series(gaps):
+    close = _close_with_gaps(gaps=gaps)
+    rsi = technical_indicator_series(close)[-1]
+    for end in (15, 100, len(close)):
+        assert wilder_rsi_last(close[:end], 14) == pytest.approx(rsi[end - 1])
+
+
+def test_compute_all_indicators_empty():
+    empty = np.empty(0)
+    assert all(np.isnan(value) for value in compute_all_indicators(empty, empty, empty))
+
+
+@pytest.mark.parametrize("gap", [50, 90])
+def test_compute_all_indicators_with_gap(gap):
+    close = _close_with_gaps(n=100, gaps=(gap,))
+    high, low = close + 1, close - 1
+    result = compute_all_indicators(close, high, low)
+    s = pd.Series(close)
+    tail = close[-21:]
+    np.testing.assert_allclose(result.ma, s.rolling(20).mean().iat[-1], equal_nan=True)
+    np.testing.assert_allclose(result.vol, (np.diff(tail) / tail[:-1]).std(ddof=1), equal_nan=True)
+    assert result.support == np.nanmin(low[-20:])
+    assert result.resistance == np.nanmax(high[-20:])
+    assert np.isfinite(result.rsi)
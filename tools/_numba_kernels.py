@@ -0,0 +1,495 @@
+# tools/_numba_kernels.py
+
+import os
+from collections import namedtuple
+
+import numpy as np
+
+from config import CACHE_DIR
+
+# cache=True로 컴파일한 커널을 프로젝트 캐시 디렉토리에 저장 (패키지 디렉토리에 쓰기 권한이 없어도 재사용)
+os.environ.setdefault("NUMBA_CACHE_DIR", str(CACHE_DIR / "numba"))
+
+# 커널은 명시적 시그니처로 선언하여 첫 호출이 아닌 임포트 시점에 컴파일 (cache=True로 다음 실행부터는 캐시에서 로드)
+try:
+    from numba import njit, prange
+except ImportError:
+    # numba가 없으면 같은 함수를 순수 파이썬/NumPy로 실행
+    def njit(*args, **kwargs):
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda func: func
+
+    prange = range
+
+# 누적합 재결합/FMA만 허용 (nnan/ninf를 켜면 NaN 채움, NaN 비교, inf 처리가 정의되지 않음)
+_FASTMATH = {"reassoc", "contract"}
+
+
+@njit("float64[:](float64[:], int64)", cache=True, fastmath=_FASTMATH)
+def rolling_mean_1d(arr, window):
+    """
+    이동평균 (누적합을 유지하며 한 번의 순회로 계산)
+
+    NaN은 합에 넣지 않고 구간 안의 NaN 수만 세므로, pandas rolling(window).mean()과 같이
+    NaN이 구간 안에 있는 동안만 NaN이고 구간을 벗어나면 다시 값이 나옵니다.
+
+    Args:
+        arr (numpy.ndarray): float64 1차원 배열
+        window (int): 이동평균 기간
+
+    Returns:
+        numpy.ndarray: 이동평균 (기간이 채워지기 전 구간과 구간 안에 NaN이 있는 위치는 NaN)
+    """
+    n = arr.shape[0]
+    out = np.full(n, np.nan)
+    s = 0.0
+    nan_count = 0
+    for i in range(n):
+        x = arr[i]
+        if x == x:
+            s += x
+        else:
+            nan_count += 1
+        if i >= window:
+            old = arr[i - window]
+            if old == old:
+                s -= old
+            else:
+                nan_count -= 1
+        if i >= window - 1 and nan_count == 0:
+            out[i] = s / window
+    return out
+
+
+@njit("float64(float64[:], int64)", cache=True, fastmath=_FASTMATH)
+def wilder_rsi_last(close, period):
+    """
+    Wilder 방식 RSI의 마지막 값 (한 번의 순회로 계산)
+
+    처음 period개 변화량의 단순 평균으로 시작한 뒤 avg = (avg * (period - 1) + x) / period 로 갱신합니다.
+
+    Args:
+        close (numpy.ndarray): float64 종가 배열
+        period (int): RSI 계산 기간
+
+    Returns:
+        float: 마지막 RSI (데이터가 부족하면 NaN)
+    """
+    n = close.shape[0]
+    if n <= period:
+        return np.nan
+
+    avg_gain = 0.0
+    avg_loss = 0.0
+    for i in range(1, period + 1):
+        # NaN이 걸친 변화량은 상승/하락 모두 0으로 취급
+        delta = close[i] - close[i - 1]
+        if delta > 0:
+            avg_gain += delta
+        elif delta < 0:
+            avg_loss -= delta
+    avg_gain /= period
+    avg_loss /= period
+
+    for i in range(period + 1, n):
+        delta = close[i] - close[i - 1]
+        gain = delta if delta > 0 else 0.0
+        loss = -delta if delta < 0 else 0.0
+        avg_gain = (avg_gain * (period - 1) + gain) / period
+        avg_loss = (avg_loss * (period - 1) + loss) / period
+
+    if avg_loss == 0.0:
+        return 100.0 if avg_gain > 0.0 else np.nan
+    return 100.0 - 100.0 / (1.0 + avg_gain / avg_loss)
+
+
+@njit("float64(float64[:], int64)", cache=True, fastmath=_FASTMATH)
+def linfit_forecast(y, days):
+    """
+    인덱스(0..n-1)에 대한 단순 선형회귀로 days일 후 값을 예측 (닫힌 형태의 최소제곱)
+
+    Args:
+        y (numpy.ndarray): float64 1차원 배열
+        days (int): 예측 일수
+
+    Returns:
+        float: 인덱스 n + days - 1 에서의 예측값
+    """
+    n = y.shape[0]
+    if n < 2:
+        return y[-1]
+
+    sx = n * (n - 1) / 2.0
+    sxx = n * (n - 1) * (2 * n - 1) / 6.0
+    sy = 0.0
+    sxy = 0.0
+    for i in range(n):
+        sy += y[i]
+        sxy += i * y[i]
+
+    slope = (n * sxy - sx * sy) / (n * sxx - sx * sx)
+    intercept = (sy - slope * sx) / n
+    return intercept + slope * (n + days - 1)
+
+
+@njit("Tuple((float64[:], float64[:]))(float64[:], float64[:], int64)", cache=True, fastmath=_FASTMATH)
+def rolling_minmax(low, high, window):
+    """
+    구간 최저가/최고가 시리즈 (단조 덱으로 O(n) 계산)
+
+    덱에는 구간 안에서 최솟값(최댓값) 후보가 될 수 있는 인덱스만 단조 순서로 남기므로
+    각 인덱스는 한 번씩만 들어가고 나옵니다. 하나의 배열에 대해 구하려면 low와 high에 같은 배열을 넘깁니다.
+
+    Args:
+        low (numpy.ndarray): 구간 최솟값을 구할 float64 배열 (저가)
+        high (numpy.ndarray): 구간 최댓값을 구할 float64 배열 (고가)
+        window (int): 참조 기간
+
+    Returns:
+        tuple: (구간 최솟값 배열, 구간 최댓값 배열) - 기간이 채워지기 전 구간은 NaN
+    """
+    n = low.shape[0]
+    out_min = np.full(n, np.nan)
+    out_max = np.full(n, np.nan)
+    dq_min = np.empty(n, dtype=np.int64)
+    dq_max = np.empty(n, dtype=np.int64)
+    h_min = t_min = 0
+    h_max = t_max = 0
+    for i in range(n):
+        while t_min > h_min and low[dq_min[t_min - 1]] >= low[i]:
+            t_min -= 1
+        dq_min[t_min] = i
+        t_min += 1
+        if dq_min[h_min] <= i - window:
+            h_min += 1
+
+        while t_max > h_max and high[dq_max[t_max - 1]] <= high[i]:
+            t_max -= 1
+        dq_max[t_max] = i
+        t_max += 1
+        if dq_max[h_max] <= i - window:
+            h_max += 1
+
+        if i >= window - 1:
+            out_min[i] = low[dq_min[h_min]]
+            out_max[i] = high[dq_max[h_max]]
+    return out_min, out_max
+
+
+@njit("UniTuple(float64, 5)(float64[:], float64[:], float64[:], int64, int64, int64, int64)", cache=True, fastmath=_FASTMATH)
+def _all_indicators(close, high, low, ma_win, rsi_win, vol_win, sr_win):
+    """
+    compute_all_indicators의 계산 본체 (스칼라 튜플 반환)
+
+    NaN 봉은 구간 합에 넣지 않고 구간 안의 NaN 수만 세어, 마지막 구간에 NaN이 있으면 해당 지표를 NaN으로 둡니다.
+    """
+    n = close.shape[0]
+    ma_sum = 0.0
+    ma_nan = 0
+    avg_gain = 0.0
+    avg_loss = 0.0
+    ret_sum = 0.0
+    ret_sq = 0.0
+    ret_nan = 0
+    # 지지선/저항선 (NaN은 건너뛰고 참조 구간의 첫 유효 봉으로 시작)
+    sr_start = max(n - sr_win, 0)
+    support = np.nan
+    resistance = np.nan
+    # 수익률 구간 합을 갱신하려면 구간에서 빠지는 수익률이 필요하므로 미리 계산
+    rets = np.empty(n)
+    if n > 0:
+        rets[0] = np.nan
+
+    for i in range(n):
+        c = close[i]
+
+        # 이동평균 (누적합)
+        if c == c:
+            ma_sum += c
+        else:
+            ma_nan += 1
+        if i >= ma_win:
+            old = close[i - ma_win]
+            if old == old:
+                ma_sum -= old
+            else:
+                ma_nan -= 1
+
+        if i > 0:
+            # RSI (처음 rsi_win개 변화량은 단순 평균, 이후 Wilder 평활)
+            delta = c - close[i - 1]
+            gain = delta if delta > 0 else 0.0
+            loss = -delta if delta < 0 else 0.0
+            if i <= rsi_win:
+                avg_gain += gain / rsi_win
+                avg_loss += loss / rsi_win
+            else:
+                avg_gain = (avg_gain * (rsi_win - 1) + gain) / rsi_win
+                avg_loss = (avg_loss * (rsi_win - 1) + loss) / rsi_win
+
+            # 변동성 (최근 vol_win개 일간 수익률의 합/제곱합)
+            r = delta / close[i - 1]
+            rets[i] = r
+            if r == r:
+                ret_sum += r
+                ret_sq += r * r
+            else:
+                ret_nan += 1
+            if i > vol_win:
+                old = rets[i - vol_win]
+                if old == old:
+                    ret_sum -= old
+                    ret_sq -= old * old
+                else:
+                    ret_nan -= 1
+
+        # 지지선/저항선 (최근 sr_win개 봉의 최저가/최고가)
+        if i >= sr_start:
+            if low[i] < support or support != support:
+                support = low[i]
+            if high[i] > resistance or resistance != resistance:
+                resistance = high[i]
+
+    ma = ma_sum / ma_win if n >= ma_win and ma_nan == 0 else np.nan
+
+    if n <= rsi_win:
+        rsi = np.nan
+    elif avg_loss == 0.0:
+        rsi = 100.0 if avg_gain > 0.0 else np.nan
+    else:
+        rsi = 100.0 - 100.0 / (1.0 + avg_gain / avg_loss)
+
+    if n - 1 >= vol_win and vol_win > 1 and ret_nan == 0:
+        var = (ret_sq - ret_sum * ret_sum / vol_win) / (vol_win - 1)
+        vol = np.sqrt(var) if var > 0.0 else 0.0
+    else:
+        vol = np.nan
+
+    return ma, rsi, vol, support, resistance
+
+
+@njit("UniTuple(float64, 2)(float64, float64, float64, float64)", cache=True, fastmath=_FASTMATH)
+def _ewm_step(prev, old_wt, x, alpha):
+    """
+    pandas ewm(adjust=False) 한 단계 갱신 - (새 평균, 이전 평균 가중치) 반환
+
+    NaN 입력은 평균을 유지하되 이전 평균의 가중치를 줄여 두었다가 다음 값이 들어올 때 반영합니다 (ignore_na=False와 같음).
+    """
+    if prev != prev:
+        # 첫 유효값 전까지는 NaN, 첫 유효값으로 시작
+        return x, 1.0
+    old_wt *= 1.0 - alpha
+    if x != x:
+        return prev, old_wt
+    return (old_wt * prev + alpha * x) / (old_wt + alpha), 1.0
+
+
+@njit("UniTuple(float64[:], 10)(float64[:])", cache=True, fastmath=_FASTMATH)
+def technical_indicator_series(close):
+    """
+    차트용 기술적 지표 시리즈를 한 번의 순회로 계산
+
+    pandas rolling/ewm(adjust=False) 결과와 같은 값을 만들며, 기간이 채워지기 전 구간은 NaN입니다.
+    종가가 비어 있는(NaN) 봉은 구간 합에 넣지 않고 구간 안의 NaN 수만 세므로, NaN이 구간을 벗어나면 다시 값이 나옵니다.
+    RSI는 모멘텀 분석(wilder_rsi_last)과 같은 14일 Wilder 평활 방식이며, NaN이 걸친 변화량은 0으로 취급합니다.
+
+    Args:
+        close (numpy.ndarray): float64 종가 배열
+
+    Returns:
+        tuple: (MA5, MA20, MA60, MA120, MA20_STD, EMA12, EMA26, MACD, Signal, RSI) 배열
+    """
+    n = close.shape[0]
+    ma5 = np.full(n, np.nan)
+    ma20 = np.full(n, np.nan)
+    ma60 = np.full(n, np.nan)
+    ma120 = np.full(n, np.nan)
+    std20 = np.full(n, np.nan)
+    ema12 = np.empty(n)
+    ema26 = np.empty(n)
+    macd = np.empty(n)
+    signal = np.empty(n)
+    rsi = np.full(n, np.nan)
+
+    a12 = 2.0 / 13.0
+    a26 = 2.0 / 27.0
+    a9 = 2.0 / 10.0
+    s5 = s20 = s60 = s120 = 0.0
+    sq20 = 0.0
+    # 구간별 NaN 개수
+    k5 = k20 = k60 = k120 = 0
+    e12 = e26 = sig = np.nan
+    w12 = w26 = w9 = 1.0
+    avg_gain = avg_loss = 0.0
+
+    for i in range(n):
+        x = close[i]
+        if x == x:
+            s5 += x
+            s20 += x
+            s60 += x
+            s120 += x
+            sq20 += x * x
+        else:
+            k5 += 1
+            k20 += 1
+            k60 += 1
+            k120 += 1
+        if i >= 5:
+            old = close[i - 5]
+            if old == old:
+                s5 -= old
+            else:
+                k5 -= 1
+        if i >= 20:
+            old = close[i - 20]
+            if old == old:
+                s20 -= old
+                sq20 -= old * old
+            else:
+                k20 -= 1
+        if i >= 60:
+            old = close[i - 60]
+            if old == old:
+                s60 -= old
+            else:
+                k60 -= 1
+        if i >= 120:
+            old = close[i - 120]
+            if old == old:
+                s120 -= old
+            else:
+                k120 -= 1
+
+        if i >= 4 and k5 == 0:
+            ma5[i] = s5 / 5
+        if i >= 19 and k20 == 0:
+            mean = s20 / 20
+            ma20[i] = mean
+            var = (sq20 - 20 * mean * mean) / 19
+            std20[i] = np.sqrt(var) if var > 0.0 else 0.0
+        if i >= 59 and k60 == 0:
+            ma60[i] = s60 / 60
+        if i >= 119 and k120 == 0:
+            ma120[i] = s120 / 120
+
+        e12, w12 = _ewm_step(e12, w12, x, a12)
+        e26, w26 = _ewm_step(e26, w26, x, a26)
+        ema12[i] = e12
+        ema26[i] = e26
+        macd[i] = e12 - e26
+        sig, w9 = _ewm_step(sig, w9, macd[i], a9)
+        signal[i] = sig
+
+        # RSI (처음 14개 변화량은 단순 평균, 이후 Wilder 평활)
+        if i > 0:
+            delta = x - close[i - 1]
+            gain = delta if delta > 0 else 0.0
+            loss = -delta if delta < 0 else 0.0
+            if i <= 14:
+                avg_gain += gain / 14
+                avg_loss += loss / 14
+            else:
+                avg_gain = (avg_gain * 13 + gain) / 14
+                avg_loss = (avg_loss * 13 + loss) / 14
+            if i >= 14:
+                if avg_loss > 0.0:
+                    rsi[i] = 100.0 - 100.0 / (1.0 + avg_gain / avg_loss)
+                elif avg_gain > 0.0:
+                    rsi[i] = 100.0
+
+    return ma5, ma20, ma60, ma120, std20, ema12, ema26, macd, signal, rsi
+
+
+# compute_all_indicators 결과 (모두 마지막 봉 기준 값, vol은 연간화 전 일간 수익률 표준편차)
+Indicators = namedtuple("Indicators", ["ma", "rsi", "vol", "support", "resistance"])
+
+
+def compute_all_indicators(close, high, low, ma_win=20, rsi_win=14, vol_win=20, sr_win=20):
+    """
+    이동평균, RSI, 변동성, 지지선/저항선을 한 번의 순회로 계산
+
+    Args:
+        close (numpy.ndarray): float64 종가 배열
+        high (numpy.ndarray): float64 고가 배열
+        low (numpy.ndarray): float64 저가 배열
+        ma_win (int): 이동평균 기간
+        rsi_win (int): RSI 계산 기간
+        vol_win (int): 변동성 계산 기간
+        sr_win (int): 지지선/저항선 참조 기간
+
+    Returns:
+        Indicators: 마지막 봉 기준 지표 값
+    """
+    return Indicators._make(_all_indicators(close, high, low, ma_win, rsi_win, vol_win, sr_win))
+
+
+@njit("int64[:](float64[:], float64[:], int64)", cache=True)
+def lttb_indices(x, y, n_out):
+    """
+    Largest-Triangle-Three-Buckets 다운샘플링으로 남길 점의 인덱스 선택
+
+    첫 점과 마지막 점은 항상 남기고, 나머지 구간을 n_out - 2개 버킷으로 나누어
+    버킷마다 직전에 고른 점, 다음 버킷 평균점과 만드는 삼각형 넓이가 가장 큰 점을 고릅니다.
+
+    Args:
+        x (numpy.ndarray): float64 x 좌표 배열 (오름차순)
+        y (numpy.ndarray): float64 y 값 배열
+        n_out (int): 남길 점 수
+
+    Returns:
+        numpy.ndarray: 오름차순 인덱스 (점 수가 n_out 이하이면 전체 인덱스)
+    """
+    n = x.shape[0]
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+
+    out = np.empty(n_out, dtype=np.int64)
+    out[0] = 0
+    every = (n - 2) / (n_out - 2)
+    a = 0
+    for i in range(n_out - 2):
+        # 다음 버킷의 평균점
+        avg_start = int((i + 1) * every) + 1
+        avg_end = min(int((i + 2) * every) + 1, n)
+        avg_x = 0.0
+        avg_y = 0.0
+        for j in range(avg_start, avg_end):
+            avg_x += x[j]
+            avg_y += y[j]
+        avg_x /= avg_end - avg_start
+        avg_y /= avg_end - avg_start
+
+        # 현재 버킷에서 삼각형 넓이가 가장 큰 점
+        best_area = -1.0
+        best = int(i * every) + 1
+        for j in range(int(i * every) + 1, int((i + 1) * every) + 1):
+            area = abs((x[a] - avg_x) * (y[j] - y[a]) - (x[a] - x[j]) * (avg_y - y[a]))
+            if area > best_area:
+                best_area = area
+                best = j
+        out[i + 1] = best
+        a = best
+
+    out[n_out - 1] = n - 1
+    return out
+
+
+@njit("int64[:, :](float64[:], float64[:, :], int64)", cache=True, parallel=True)
+def lttb_indices_cols(x, Y, n_out):
+    """
+    여러 시리즈(열)에 LTTB 다운샘플링을 열별로 병렬 적용
+
+    Args:
+        x (numpy.ndarray): float64 x 좌표 배열 (오름차순)
+        Y (numpy.ndarray): float64 2차원 배열 (행: x 위치, 열: 시리즈)
+        n_out (int): 열마다 남길 점 수 (3 이상, 행 수보다 작아야 함)
+
+    Returns:
+        numpy.ndarray: (n_out, 열 수) 인덱스 배열
+    """
+    out = np.empty((n_out, Y.shape[1]), dtype=np.int64)
+    for k in prange(Y.shape[1]):
+        out[:, k] = lttb_indices(x, Y[:, k], n_out)
+    return out
@@ -5,21 +5,65 @@ import numpy as np
 from datetime import datetime, timedelta
 import os
 import sys
-from pathlib import Path
-from sklearn.linear_model import LinearRegression
-from statsmodels.tsa.arima.model import ARIMA
-from statsmodels.tsa.seasonal import seasonal_decompose
+from bisect import bisect_left
+from functools import lru_cache
 
-# config 모듈 임포트
-try:
-    sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-except NameError:
-    import inspect
-    current_file = Path(inspect.getfile(inspect.currentframe()))
-    sys.path.append(str(current_file.parent.parent))
+# config 모듈 임포트 (프로젝트 루트가 경로에 없을 때만 추가)
+_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if _ROOT not in sys.path:
+    sys.path.append(_ROOT)
 
-from config import TARGET_COMPANIES
+from config import TARGET_COMPANIES, COMPANY_CODE_INDEX
 from tools.stock_data import StockDataFetcher
+from tools._numba_kernels import wilder_rsi_last, linfit_forecast, rolling_minmax, compute_all_indicators
+
+# ARIMA 차수
+_ARIMA_ORDER = (5, 1, 0)
+# 변동성 수준 구간 (경계값은 아래 구간에 포함, NaN은 '낮음')
+_VOL_THRESH = (20.0, 30.0, 40.0)
+_VOL_LABELS = ("낮음", "보통", "높음", "매우 높음")
+# RSI 상태 (int(RSI > 70) - int(RSI < 30) + 1 로 인덱싱, NaN은 '중립')
+_RSI_LABELS = ("과매도", "중립", "과매수")
+# 업종 비교 결과 컬럼 (_sector_metrics가 반환하는 튜플 순서)
+_SECTOR_COLUMNS = ['기업명', '종목코드', '총 수익률(%)', '변동성(%)', '샤프 비율', '최근 모멘텀(%)']
+
+
+@lru_cache(maxsize=32)
+def _fit_arima_params(closes_bytes, order=_ARIMA_ORDER):
+    """
+    ARIMA 모델 적합 파라미터 (같은 종가 배열이면 이전 적합 결과를 재사용)
+    
+    적합 결과 객체(데이터와 필터 행렬 포함) 대신 계수와 잔차 분산(sigma2)만 캐시합니다.
+    
+    Args:
+        closes_bytes (bytes): float64 종가 배열의 원시 바이트
+        order (tuple): ARIMA 차수
+        
+    Returns:
+        tuple: 적합 파라미터 (AR 계수..., sigma2)
+    """
+    # statsmodels는 임포트 비용이 크므로 ARIMA를 처음 적합할 때 임포트
+    from statsmodels.tsa.arima.model import ARIMA
+    
+    closes = np.frombuffer(closes_bytes, dtype=np.float64)
+    return tuple(ARIMA(closes, order=order).fit().params)
+
+def _arima_forecast(closes, days, order=_ARIMA_ORDER):
+    """
+    캐시한 파라미터로 칼만 필터만 다시 돌려 (재적합 없이) days일 예측
+    
+    Args:
+        closes (numpy.ndarray): float64 종가 배열
+        days (int): 예측 일수
+        order (tuple): ARIMA 차수
+        
+    Returns:
+        numpy.ndarray: 예측값 배열
+    """
+    from statsmodels.tsa.arima.model import ARIMA
+    
+    params = np.asarray(_fit_arima_params(closes.tobytes(), order))
+    return ARIMA(closes, order=order).filter(params).forecast(steps=days)
 
 class StockAnalyzer:
     """주식 데이터 분석을 위한 클래스"""
@@ -27,27 +71,32 @@ class StockAnalyzer:
     def __init__(self):
         """초기화 메서드"""
         self.stock_fetcher = StockDataFetcher()
+    
+    def close(self):
+        """데이터 조회용 I/O 스레드 풀 종료"""
+        self.stock_fetcher.close()
         
-    def analyze_trend(self, data, window=20):
+    def analyze_trend(self, data, window=20, indicators=None):
         """
         추세 분석: 이동평균을 통한 주가 추세 분석
         
         Args:
             data (pandas.DataFrame): 주가 데이터
             window (int): 이동평균 기간
+            indicators (Indicators, optional): compute_all_indicators로 미리 계산한 지표
             
         Returns:
             dict: 추세 분석 결과
         """
-        # 데이터 복사
-        df = data.copy()
-        
-        # 이동평균
-        df['MA'] = df['Close'].rolling(window=window).mean()
+        # 마지막 이동평균 값만 필요하므로 전체 이동평균 시리즈를 만들지 않고 마지막 구간만 평균
+        close = data['Close'].to_numpy(dtype=np.float64)
         
         # 추세 판단 (현재가 > 이동평균 => 상승 추세)
-        current_price = df['Close'].iloc[-1]
-        ma_price = df['MA'].iloc[-1]
+        current_price = close[-1]
+        if indicators is not None:
+            ma_price = indicators.ma
+        else:
+            ma_price = close[-window:].mean() if len(close) >= window else np.nan
         
         trend = "상승" if current_price > ma_price else "하락"
         strength = abs(current_price - ma_price) / ma_price * 100
@@ -59,91 +108,89 @@ class StockAnalyzer:
             "이동평균": ma_price
         }
     
-    def analyze_momentum(self, data, period=14):
+    def analyze_momentum(self, data, period=14, indicators=None):
         """
         모멘텀 분석: RSI를 통한 모멘텀 측정
         
         Args:
             data (pandas.DataFrame): 주가 데이터
             period (int): RSI 계산 기간
+            indicators (Indicators, optional): compute_all_indicators로 미리 계산한 지표
             
         Returns:
             dict: 모멘텀 분석 결과
         """
-        # RSI 계산
-        delta = data['Close'].diff()
-        gain = (delta.where(delta > 0, 0)).rolling(window=period).mean()
-        loss = (-delta.where(delta < 0, 0)).rolling(window=period).mean()
-        rs = gain / loss
-        rsi = 100 - (100 / (1 + rs))
-        
-        current_rsi = rsi.iloc[-1]
+        # RSI 계산 (Wilder 평활, 중간 시리즈 없이 마지막 값만 계산)
+        if indicators is not None:
+            current_rsi = indicators.rsi
+        else:
+            current_rsi = wilder_rsi_last(data['Close'].to_numpy(dtype=np.float64), period)
         
         # RSI 해석
-        if current_rsi > 70:
-            status = "과매수"
-        elif current_rsi < 30:
-            status = "과매도"
-        else:
-            status = "중립"
+        status = _RSI_LABELS[int(current_rsi > 70) - int(current_rsi < 30) + 1]
             
         return {
             "RSI": current_rsi,
             "상태": status
         }
     
-    def analyze_volatility(self, data, window=20):
+    def analyze_volatility(self, data, window=20, indicators=None):
         """
         변동성 분석: 주가의 표준편차를 통한 변동성 측정
         
         Args:
             data (pandas.DataFrame): 주가 데이터
             window (int): 계산 기간
+            indicators (Indicators, optional): compute_all_indicators로 미리 계산한 지표
             
         Returns:
             dict: 변동성 분석 결과
         """
-        # 일간 수익률
-        returns = data['Close'].pct_change().dropna()
+        if indicators is not None:
+            daily_std = indicators.vol
+        else:
+            # 마지막 window개 일간 수익률만 계산 (전체 수익률/롤링 시리즈를 만들지 않음)
+            close = data['Close'].to_numpy(dtype=np.float64)
+            if len(close) > window:
+                tail = close[-window - 1:]
+                daily_std = (np.diff(tail) / tail[:-1]).std(ddof=1)
+            else:
+                daily_std = np.nan
         
         # 변동성 (표준편차)
-        volatility = returns.rolling(window=window).std().iloc[-1] * np.sqrt(252) * 100  # 연간화
+        volatility = daily_std * np.sqrt(252) * 100  # 연간화
         
         # 변동성 수준 판단
-        if volatility > 40:
-            level = "매우 높음"
-        elif volatility > 30:
-            level = "높음"
-        elif volatility > 20:
-            level = "보통"
-        else:
-            level = "낮음"
+        level = _VOL_LABELS[bisect_left(_VOL_THRESH, volatility)]
             
         return {
             "변동성": volatility,
             "수준": level
         }
     
-    def analyze_support_resistance(self, data, window=20):
+    def analyze_support_resistance(self, data, window=20, indicators=None):
         """
         지지선/저항선 분석
         
         Args:
             data (pandas.DataFrame): 주가 데이터
             window (int): 참조 기간
+            indicators (Indicators, optional): compute_all_indicators로 미리 계산한 지표
             
         Returns:
             dict: 지지선/저항선 분석 결과
         """
-        recent_data = data.iloc[-window:]
-        
-        # 지지선 (최근 데이터의 최저가 부근)
-        support = recent_data['Low'].min()
-        
-        # 저항선 (최근 데이터의 최고가 부근)
-        resistance = recent_data['High'].max()
+        if indicators is not None:
+            support, resistance = indicators.support, indicators.resistance
+        else:
+            # 부분 DataFrame을 만들지 않고 배열의 마지막 구간만 사용
+            # 지지선 (최근 데이터의 최저가 부근)
+            support = data['Low'].to_numpy(dtype=np.float64)[-window:].min()
+            
+            # 저항선 (최근 데이터의 최고가 부근)
+            resistance = data['High'].to_numpy(dtype=np.float64)[-window:].max()
         
-        current_price = data['Close'].iloc[-1]
+        current_price = float(data['Close'].iat[-1])
         
         return {
             "현재가": current_price,
@@ -153,6 +200,23 @@ class StockAnalyzer:
             "저항선까지": (resistance - current_price) / current_price * 100
         }
     
+    def analyze_support_resistance_series(self, data, window=20):
+        """
+        날짜별 지지선/저항선 시리즈 (차트/히트맵용)
+        
+        Args:
+            data (pandas.DataFrame): 주가 데이터
+            window (int): 참조 기간
+            
+        Returns:
+            tuple: (지지선 배열, 저항선 배열) - 각 날짜까지 window일 저가 최솟값/고가 최댓값
+        """
+        return rolling_minmax(
+            data['Low'].to_numpy(dtype=np.float64),
+            data['High'].to_numpy(dtype=np.float64),
+            window
+        )
+    
     def predict_price(self, data, days=5):
         """
         간단한 주가 예측 (ARIMA 모델 사용)
@@ -164,17 +228,16 @@ class StockAnalyzer:
         Returns:
             dict: 예측 결과
         """
+        # 종가 배열은 한 번만 만들어 ARIMA와 선형회귀 대안에서 함께 사용
+        closes = data['Close'].to_numpy(dtype=np.float64)
+        
         try:
-            # ARIMA 모델 적합
-            model = ARIMA(data['Close'], order=(5, 1, 0))
-            model_fit = model.fit()
-            
-            # 예측
-            forecast = model_fit.forecast(steps=days)
+            # ARIMA 예측 (종가 바이트를 키로 적합 파라미터 캐시)
+            forecast = _arima_forecast(closes, days)
             
             # 결과 포맷팅
-            current_price = data['Close'].iloc[-1]
-            predicted_price = forecast.iloc[-1]
+            current_price = float(data['Close'].iat[-1])
+            predicted_price = forecast[-1]
             
             change = (predicted_price - current_price) / current_price * 100
             
@@ -184,21 +247,13 @@ class StockAnalyzer:
                 "예상 변화율": change,
                 "예측 추세": "상승" if change > 0 else "하락"
             }
-        except:
-            # 간단한 선형회귀 모델을 대안으로 사용
-            x = np.array(range(len(data))).reshape(-1, 1)
-            y = data['Close'].values
-            
-            model = LinearRegression()
-            model.fit(x, y)
-            
-            # 예측
-            x_pred = np.array(range(len(data), len(data) + days)).reshape(-1, 1)
-            y_pred = model.predict(x_pred)
+        except (ImportError, np.linalg.LinAlgError, ValueError) as e:
+            print(f"ARIMA 예측 실패, 선형회귀로 대체합니다: {e}")
+            # 간단한 선형회귀(닫힌 형태 최소제곱)를 대안으로 사용
+            predicted_price = linfit_forecast(closes, days)
             
             # 결과 포맷팅
-            current_price = data['Close'].iloc[-1]
-            predicted_price = y_pred[-1]
+            current_price = float(data['Close'].iat[-1])
             
             change = (predicted_price - current_price) / current_price * 100
             
@@ -225,47 +280,51 @@ class StockAnalyzer:
         if not companies:
             raise ValueError(f"지원하지 않는 업종: {sector}")
         
-        codes = [company['code'] for company in companies]
-        names = [company['name'] for company in companies]
+        # 여러 종목 데이터를 한 번의 병렬 조회로 가져오기
+        names = {company['code']: company['name'] for company in companies}
+        frames = self.stock_fetcher.get_multi(list(names), start, end)
         
-        # 여러 종목 데이터 가져오기
-        result = []
-        
-        for code, name in zip(codes, names):
-            data = self.stock_fetcher.get_stock_data(code, start, end)
-            if data.empty:
-                continue
-                
-            # 수익률 계산
-            returns = data['Close'].pct_change().dropna()
-            
-            # 성과 지표 계산
-            total_return = (data['Close'].iloc[-1] / data['Close'].iloc[0] - 1) * 100
-            volatility = returns.std() * np.sqrt(252) * 100
-            sharpe = (total_return / 100) / (volatility / 100) if volatility != 0 else 0
-            
-            # 최근 모멘텀 (최근 1개월 수익률)
-            recent_data = data.iloc[-20:]
-            recent_return = (recent_data['Close'].iloc[-1] / recent_data['Close'].iloc[0] - 1) * 100
-            
-            result.append({
-                '기업명': name,
-                '종목코드': code,
-                '총 수익률(%)': total_return,
-                '변동성(%)': volatility,
-                '샤프 비율': sharpe,
-                '최근 모멘텀(%)': recent_return
-            })
+        result = [
+            self._sector_metrics(code, names[code], data)
+            for code, data in frames.items()
+            if not data.empty
+        ]
         
         # 데이터프레임으로 변환
-        df = pd.DataFrame(result)
-        df.index = pd.DatetimeIndex(df.index.values, freq='B')  # 'B'는 business day를 의미
+        df = pd.DataFrame(result, columns=_SECTOR_COLUMNS)
         # 총 수익률 기준 정렬
         if not df.empty:
             df = df.sort_values('총 수익률(%)', ascending=False)
         
         return df
     
+    def _sector_metrics(self, code, name, data):
+        """
+        업종 비교용 단일 종목 성과 지표 계산
+        
+        Args:
+            code (str): 종목 코드
+            name (str): 종목명
+            data (pandas.DataFrame): 주가 데이터
+            
+        Returns:
+            tuple: _SECTOR_COLUMNS 순서의 성과 지표
+        """
+        # 수익률 Series를 만들지 않고 종가 배열에서 바로 계산
+        close = data['Close'].to_numpy(dtype=np.float64)
+        returns = np.diff(close) / close[:-1]
+        
+        # 성과 지표 계산
+        total_return = (close[-1] / close[0] - 1) * 100
+        volatility = returns.std(ddof=1) * np.sqrt(252) * 100 if len(returns) > 1 else np.nan
+        sharpe = (total_return / 100) / (volatility / 100) if volatility != 0 else 0
+        
+        # 최근 모멘텀 (최근 1개월 수익률)
+        recent = close[-20:]
+        recent_return = (recent[-1] / recent[0] - 1) * 100
+        
+        return (name, code, total_return, volatility, sharpe, recent_return)
+    
     def full_analysis(self, code, name=None):
         """
         종합 분석: 모든 분석 결과를 종합하여 반환
@@ -279,16 +338,7 @@ class StockAnalyzer:
         """
         if name is None:
             # 종목명 찾기
-            for sector, companies in TARGET_COMPANIES.items():
-                for company in companies:
-                    if company['code'] == code:
-                        name = company['name']
-                        break
-                if name:
-                    break
-            
-            if not name:
-                name = f"종목({code})"
+            name = COMPANY_CODE_INDEX[code][0] if code in COMPANY_CODE_INDEX else f"종목({code})"
         
         # 데이터 가져오기
         data = self.stock_fetcher.get_stock_data(code)
@@ -298,28 +348,36 @@ class StockAnalyzer:
         # 기술적 지표 계산
         tech_data = self.stock_fetcher.calculate_technical_indicators(data)
         
+        # 이동평균/RSI/변동성/지지·저항 지표를 종가·고가·저가 배열 한 번 순회로 계산
+        closes = data['Close'].to_numpy(dtype=np.float64)
+        indicators = compute_all_indicators(
+            closes,
+            data['High'].to_numpy(dtype=np.float64),
+            data['Low'].to_numpy(dtype=np.float64)
+        )
+        
         # 분석 수행
-        trend_analysis = self.analyze_trend(data)
-        momentum_analysis = self.analyze_momentum(data)
-        volatility_analysis = self.analyze_volatility(data)
-        support_resistance = self.analyze_support_resistance(data)
+        trend_analysis = self.analyze_trend(data, indicators=indicators)
+        momentum_analysis = self.analyze_momentum(data, indicators=indicators)
+        volatility_analysis = self.analyze_volatility(data, indicators=indicators)
+        support_resistance = self.analyze_support_resistance(data, indicators=indicators)
         price_prediction = self.predict_price(data)
         
         # 최근 성과 계산
-        recent_return_1m = (data['Close'].iloc[-1] / data['Close'].iloc[-20] - 1) * 100 if len(data) >= 20 else None
-        recent_return_3m = (data['Close'].iloc[-1] / data['Close'].iloc[-60] - 1) * 100 if len(data) >= 60 else None
-        recent_return_6m = (data['Close'].iloc[-1] / data['Close'].iloc[-120] - 1) * 100 if len(data) >= 120 else None
-        recent_return_1y = (data['Close'].iloc[-1] / data['Close'].iloc[-250] - 1) * 100 if len(data) >= 250 else None
+        recent_return_1m = (closes[-1] / closes[-20] - 1) * 100 if len(closes) >= 20 else None
+        recent_return_3m = (closes[-1] / closes[-60] - 1) * 100 if len(closes) >= 60 else None
+        recent_return_6m = (closes[-1] / closes[-120] - 1) * 100 if len(closes) >= 120 else None
+        recent_return_1y = (closes[-1] / closes[-250] - 1) * 100 if len(closes) >= 250 else None
         
         # MACD 시그널
-        latest_macd = tech_data['MACD'].iloc[-1]
-        latest_signal = tech_data['Signal'].iloc[-1]
+        latest_macd = tech_data['MACD'].iat[-1]
+        latest_signal = tech_data['Signal'].iat[-1]
         macd_status = "매수 신호" if latest_macd > latest_signal else "매도 신호"
         
         # 볼린저 밴드 상태
-        latest_close = tech_data['Close'].iloc[-1]
-        latest_upper = tech_data['Upper_Band'].iloc[-1]
-        latest_lower = tech_data['Lower_Band'].iloc[-1]
+        latest_close = tech_data['Close'].iat[-1]
+        latest_upper = tech_data['Upper_Band'].iat[-1]
+        latest_lower = tech_data['Lower_Band'].iat[-1]
         
         if latest_close > latest_upper:
             bb_status = "과매수"
@@ -333,8 +391,8 @@ class StockAnalyzer:
             "기본 정보": {
                 "종목명": name,
                 "종목코드": code,
-                "현재가": data['Close'].iloc[-1],
-                "분석일자": datetime.now().strftime('%Y-%m-%d')
+                "현재가": float(data['Close'].iat[-1]),
+                "분석일자": datetime.now().date().isoformat()
             },
             "추세 분석": trend_analysis,
             "모멘텀 분석": momentum_analysis,
@@ -350,6 +408,7 @@ class StockAnalyzer:
             "기술적 지표": {
                 "MACD 신호": macd_status,
                 "볼린저 밴드": bb_status,
-                "RSI": tech_data['RSI'].iloc[-1] if 'RSI' in tech_data.columns else None
+                # 모멘텀 분석과 같은 Wilder RSI 값을 보고
+                "RSI": momentum_analysis["RSI"]
             }
         }
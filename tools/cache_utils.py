@@ -0,0 +1,160 @@
+# tools/cache_utils.py
+
+import os
+import json
+import time
+import hashlib
+import functools
+import threading
+from concurrent.futures import Future
+from pathlib import Path
+
+from tools.io_utils import dump_json, load_json
+
+
+def _cache_key(name, args, kwargs):
+    """함수 이름과 인자로 캐시 키(해시) 생성"""
+    raw = json.dumps([name, args, kwargs], ensure_ascii=False, sort_keys=True, default=str)
+    return hashlib.blake2b(raw.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def _read_cache(cache_file, ttl):
+    """유효 시간 안의 캐시 파일을 읽어 (적중 여부, 값) 반환 (SKIP_CACHE=1 이면 항상 미적중)"""
+    if os.getenv("SKIP_CACHE") != "1" and cache_file.exists():
+        if time.time() - cache_file.stat().st_mtime < ttl:
+            try:
+                return True, load_json(cache_file)
+            except ValueError:
+                pass  # 손상된 캐시는 무시하고 새로 계산
+    return False, None
+
+
+def cached_call(cache_dir, key, ttl, compute):
+    """
+    키에 해당하는 캐시 파일이 유효하면 재사용하고, 없으면 계산하여 저장
+
+    캐시 파일은 해시 앞 두 글자 하위 디렉토리에 나누어 저장합니다. 빈 결과(실패 등)는 저장하지 않습니다.
+
+    Args:
+        cache_dir (str | Path): 캐시 파일 저장 디렉토리
+        key (Any): JSON으로 직렬화 가능한 캐시 키 (예: 요청 파라미터)
+        ttl (int): 캐시 유효 시간(초)
+        compute (Callable[[], Any]): 결과 계산 함수
+
+    Returns:
+        Any: 캐시되었거나 새로 계산된 결과
+    """
+    digest = _cache_key("cached_call", [key], {})
+    cache_file = Path(cache_dir) / digest[:2] / f"{digest}.json"
+
+    hit, value = _read_cache(cache_file, ttl)
+    if hit:
+        return value
+
+    result = compute()
+    if result:
+        os.makedirs(cache_file.parent, exist_ok=True)
+        dump_json(cache_file, result)
+    return result
+
+
+def disk_memoize(cache_dir, ttl=3600, exclude=(), should_cache=bool):
+    """
+    함수 결과를 파일로 저장해 두었다가 같은 인자로 호출되면 재사용하는 데코레이터
+
+    환경 변수 SKIP_CACHE=1 이 설정되어 있으면 캐시를 읽지 않고 새로 계산합니다.
+    should_cache가 거짓을 반환하는 결과(기본값: 빈 결과)는 저장하지 않아 다음 호출에서 다시 계산합니다.
+
+    Args:
+        cache_dir (str | Path): 캐시 파일 저장 디렉토리
+        ttl (int): 캐시 유효 시간(초)
+        exclude (Iterable[str]): 캐시 키에서 제외할 키워드 인자 이름 (예: 결과 파일명용 실행 시각)
+        should_cache (Callable[[Any], bool]): 결과를 저장할지 판단하는 함수
+
+    Returns:
+        Callable: 데코레이터
+    """
+    cache_dir = Path(cache_dir)
+    exclude = frozenset(exclude)
+
+    def decorator(func):
+        name = getattr(func, "__qualname__", repr(func))
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            key_kwargs = {k: v for k, v in kwargs.items() if k not in exclude}
+            cache_file = cache_dir / f"{_cache_key(name, args, key_kwargs)}.json"
+
+            hit, value = _read_cache(cache_file, ttl)
+            if hit:
+                return value
+
+            result = func(*args, **kwargs)
+            if should_cache(result):
+                os.makedirs(cache_dir, exist_ok=True)
+                dump_json(cache_file, result)
+            return result
+
+        return wrapper
+
+    return decorator
+
+
+class RequestCache:
+    """
+    하나의 사용자 쿼리를 처리하는 동안 에이전트들이 공유하는 결과 캐시
+
+    같은 키를 여러 스레드에서 동시에 요청하면 처음 요청한 쪽만 계산하고 나머지는 그 결과를 기다립니다.
+    """
+
+    def __init__(self):
+        """초기화 메서드"""
+        self._lock = threading.Lock()
+        self._futures = {}
+
+    def get_or_compute(self, key, compute):
+        """
+        키에 해당하는 결과를 반환하고, 없으면 계산하여 저장
+
+        Args:
+            key (Hashable): 캐시 키 (예: (도구 이름, 인자))
+            compute (Callable[[], Any]): 결과 계산 함수
+
+        Returns:
+            Any: 캐시되었거나 새로 계산된 결과
+        """
+        with self._lock:
+            future = self._futures.get(key)
+            owner = future is None
+            if owner:
+                future = Future()
+                self._futures[key] = future
+
+        if owner:
+            try:
+                future.set_result(compute())
+            except BaseException as e:
+                # 실패한 결과는 캐시하지 않고 다음 요청에서 다시 계산
+                with self._lock:
+                    self._futures.pop(key, None)
+                future.set_exception(e)
+                raise
+
+        return future.result()
+
+    def discard(self, key):
+        """저장된 결과 삭제 (다음 요청에서 다시 계산)"""
+        with self._lock:
+            self._futures.pop(key, None)
+
+    def set(self, key, value):
+        """계산된 결과를 직접 저장"""
+        future = Future()
+        future.set_result(value)
+        with self._lock:
+            self._futures[key] = future
+
+    def __contains__(self, key):
+        with self._lock:
+            future = self._futures.get(key)
+        return future is not None and future.done() and future.exception() is None
@@ -2,22 +2,32 @@
 
 import os
 import json
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
 import requests
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Optional
 
-# config 모듈 임포트
 import sys
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from config import DATA_DIR
+# config 모듈 임포트 (프로젝트 루트가 경로에 없을 때만 추가)
+_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if _ROOT not in sys.path:
+    sys.path.append(_ROOT)
+
+from config import GEOPOLITICAL_ANALYSIS_DIR, MODEL_NAME
 from promts.promts import (
     GEOPOLITICAL_ANALYSIS_PROMPT,
     INDUSTRY_IMPACT_PROMPT,
+    INDUSTRY_IMPACT_BATCH_PROMPT,
     INVESTMENT_STRATEGY_PROMPT
 )
 
+def _timestamp():
+    """결과 파일명에 사용하는 현재 시각"""
+    return datetime.now().strftime("%Y%m%d_%H%M%S")
+
+
 class GeopoliticalAnalyzer:
     """
     국제 정세가 금융 시장에 미치는 영향을 분석하는 클래스
@@ -25,24 +35,30 @@ class GeopoliticalAnalyzer:
     
     def __init__(self):
         """초기화 메서드"""
-        self.analysis_dir = DATA_DIR / "geopolitical_analysis"
-        os.makedirs(self.analysis_dir, exist_ok=True)
+        # 디렉토리는 config 임포트 시 생성되므로 호출마다 확인하지 않음
+        self.analysis_dir = GEOPOLITICAL_ANALYSIS_DIR
         self.llm = self._initialize_llm()
         
     def _initialize_llm(self):
-        """LLM 초기화 - Langchain 또는 직접 OpenAI API 호출"""
-        # 여기서는 간단히 구현. 실제로는 Langchain이나 직접 OpenAI API 연동 필요
+        """LLM 초기화 - 클라이언트 하나를 만들어 모든 호출(스레드 포함)에서 재사용"""
         try:
-            from langchain.llms import OpenAI
-            return OpenAI(temperature=0.2)
+            from langchain_openai import ChatOpenAI
+            return ChatOpenAI(model=MODEL_NAME, temperature=0.2, max_retries=3)
         except ImportError:
             print("Langchain을 사용할 수 없습니다. 기본 요약 로직을 사용합니다.")
             return None
+    
+    def _complete(self, prompt: str) -> str:
+        """프롬프트를 LLM에 보내 응답 텍스트 반환"""
+        return self.llm.invoke(prompt).content
             
-    def analyze_trump_impact(self) -> Dict[str, Any]:
+    def analyze_trump_impact(self, run_ts: Optional[str] = None) -> Dict[str, Any]:
         """
         트럼프 행정부의 정책이 한국 금융 시장에 미치는 영향 분석
         
+        Args:
+            run_ts (str, optional): 결과 파일명에 사용할 분석 실행 시각 (없으면 현재 시각)
+            
         Returns:
             Dict[str, Any]: 분석 결과
         """
@@ -50,29 +66,28 @@ class GeopoliticalAnalyzer:
         
         # LLM이 있으면 프롬프트 사용
         if self.llm:
-            analysis = self.llm(GEOPOLITICAL_ANALYSIS_PROMPT)
+            analysis = self._complete(GEOPOLITICAL_ANALYSIS_PROMPT)
         else:
             # 기본 분석 제공
             analysis = "트럼프 행정부의 정책은 한국 금융 시장에 다양한 영향을 미칠 것으로 예상됩니다..."
         
         # 결과 저장
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        results_file = self.analysis_dir / f"trump_analysis_{timestamp}.txt"
+        results_file = self.analysis_dir / f"trump_analysis_{run_ts or _timestamp()}.txt"
         
-        with open(results_file, "w", encoding="utf-8") as f:
-            f.write(analysis)
+        results_file.write_text(analysis, encoding="utf-8")
         
         return {
             "analysis": analysis,
             "results_file": str(results_file)
         }
     
-    def analyze_industry_impact(self, industry: str) -> Dict[str, Any]:
+    def analyze_industry_impact(self, industry: str, run_ts: Optional[str] = None) -> Dict[str, Any]:
         """
         특정 산업에 대한 트럼프 정책 영향 분석
         
         Args:
             industry (str): 분석할 산업명 (예: 반도체, 자동차, 금융)
+            run_ts (str, optional): 결과 파일명에 사용할 분석 실행 시각 (없으면 현재 시각)
             
         Returns:
             Dict[str, Any]: 분석 결과
@@ -84,17 +99,15 @@ class GeopoliticalAnalyzer:
         
         # LLM이 있으면 프롬프트 사용
         if self.llm:
-            analysis = self.llm(prompt)
+            analysis = self._complete(prompt)
         else:
             # 기본 분석 제공
             analysis = f"트럼프 행정부의 정책은 {industry} 산업에 다양한 영향을 미칠 것으로 예상됩니다..."
         
         # 결과 저장
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        results_file = self.analysis_dir / f"{industry}_impact_{timestamp}.txt"
+        results_file = self.analysis_dir / f"{industry}_impact_{run_ts or _timestamp()}.txt"
         
-        with open(results_file, "w", encoding="utf-8") as f:
-            f.write(analysis)
+        results_file.write_text(analysis, encoding="utf-8")
         
         return {
             "industry": industry,
@@ -102,10 +115,79 @@ class GeopoliticalAnalyzer:
             "results_file": str(results_file)
         }
     
-    def generate_investment_strategy(self) -> Dict[str, Any]:
+    def analyze_industry_impact_batch(self, industries: List[str],
+                                      run_ts: Optional[str] = None) -> Dict[str, Dict[str, Any]]:
+        """
+        여러 산업에 대한 트럼프 정책 영향을 한 번의 LLM 호출로 분석
+        
+        Args:
+            industries (List[str]): 분석할 산업명 목록
+            run_ts (str, optional): 결과 파일명에 사용할 분석 실행 시각 (없으면 현재 시각)
+            
+        Returns:
+            Dict[str, Dict[str, Any]]: 산업별 분석 결과
+        """
+        if not industries:
+            return {}
+        # 일괄 분석과 개별 분석 보완 결과가 같은 시각의 파일명을 사용하도록 한 번만 정함
+        run_ts = run_ts or _timestamp()
+        if len(industries) == 1:
+            return {industries[0]: self.analyze_industry_impact(industries[0], run_ts=run_ts)}
+        
+        print(f"{', '.join(industries)} 산업에 대한 트럼프 정책 영향 일괄 분석 중...")
+        
+        analyses = {}
+        if self.llm:
+            prompt = INDUSTRY_IMPACT_BATCH_PROMPT.format(industries=", ".join(industries))
+            response = self._complete(prompt)
+            try:
+                # 응답 앞뒤의 설명 문구를 제외하고 JSON 객체 부분만 파싱
+                parsed = json.loads(response[response.index("{"):response.rindex("}") + 1])
+                if isinstance(parsed, dict):
+                    analyses = {k: str(v) for k, v in parsed.items() if k in industries}
+            except ValueError:
+                print("일괄 분석 응답을 파싱할 수 없습니다. 산업별로 개별 분석합니다.")
+        else:
+            # 기본 분석 제공
+            analyses = {
+                industry: f"트럼프 행정부의 정책은 {industry} 산업에 다양한 영향을 미칠 것으로 예상됩니다..."
+                for industry in industries
+            }
+        
+        # 응답에서 누락된 산업은 개별 분석으로 보완 (LLM 호출은 I/O 대기 위주이므로 스레드로 동시에 수행)
+        missing = [industry for industry in industries if industry not in analyses]
+        fallback = {}
+        if missing:
+            with ThreadPoolExecutor(max_workers=min(8, len(missing))) as executor:
+                fallback = dict(zip(missing, executor.map(
+                    lambda industry: self.analyze_industry_impact(industry, run_ts=run_ts), missing
+                )))
+        
+        # 결과 저장 (입력 순서 유지)
+        results = {}
+        for industry in industries:
+            if industry in fallback:
+                results[industry] = fallback[industry]
+                continue
+            
+            results_file = self.analysis_dir / f"{industry}_impact_{run_ts}.txt"
+            results_file.write_text(analyses[industry], encoding="utf-8")
+            
+            results[industry] = {
+                "industry": industry,
+                "analysis": analyses[industry],
+                "results_file": str(results_file)
+            }
+        
+        return results
+    
+    def generate_investment_strategy(self, run_ts: Optional[str] = None) -> Dict[str, Any]:
         """
         트럼프 정책 기조를 고려한 투자 전략 생성
         
+        Args:
+            run_ts (str, optional): 결과 파일명에 사용할 분석 실행 시각 (없으면 현재 시각)
+            
         Returns:
             Dict[str, Any]: 투자 전략
         """
@@ -113,17 +195,15 @@ class GeopoliticalAnalyzer:
         
         # LLM이 있으면 프롬프트 사용
         if self.llm:
-            strategy = self.llm(INVESTMENT_STRATEGY_PROMPT)
+            strategy = self._complete(INVESTMENT_STRATEGY_PROMPT)
         else:
             # 기본 전략 제공
             strategy = "트럼프 행정부의 정책을 고려한 투자 전략은 다음과 같습니다..."
         
         # 결과 저장
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        results_file = self.analysis_dir / f"investment_strategy_{timestamp}.txt"
+        results_file = self.analysis_dir / f"investment_strategy_{run_ts or _timestamp()}.txt"
         
-        with open(results_file, "w", encoding="utf-8") as f:
-            f.write(strategy)
+        results_file.write_text(strategy, encoding="utf-8")
         
         return {
             "strategy": strategy,
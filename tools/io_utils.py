@@ -0,0 +1,180 @@
+# tools/io_utils.py
+
+import os
+import json
+import threading
+from functools import lru_cache
+from pathlib import Path
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+
+@lru_cache(maxsize=None)
+def ensure_dir(path):
+    """
+    디렉토리 생성 (프로세스당 경로별 1회만 수행)
+
+    Args:
+        path (str): 생성할 디렉토리 경로
+    """
+    Path(path).mkdir(parents=True, exist_ok=True)
+
+
+def dumps_json(obj, pretty=False, default=None):
+    """
+    객체를 JSON 바이트로 직렬화
+
+    Args:
+        obj (Any): 직렬화할 객체
+        pretty (bool): 들여쓰기 여부
+        default (Callable, optional): 기본으로 직렬화할 수 없는 객체를 변환하는 함수
+
+    Returns:
+        bytes: UTF-8 JSON 바이트
+    """
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+        if pretty:
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(obj, default=default, option=option)
+    # json.dump는 토큰마다 write를 호출하므로 문자열로 만든 뒤 한 번에 기록
+    return json.dumps(obj, ensure_ascii=False, indent=2 if pretty else None, default=default).encode("utf-8")
+
+
+def dump_json(path, obj, compress=False, pretty=False, default=None):
+    """
+    분석 결과를 JSON 파일로 저장
+
+    orjson이 설치되어 있으면 orjson으로 직렬화하고, 없으면 표준 json 모듈을 사용합니다.
+    임시 파일에 기록한 뒤 rename하므로 읽는 쪽에서 쓰다 만 파일을 보지 않습니다.
+
+    Args:
+        path (str | Path): 저장할 파일 경로
+        obj (Any): 저장할 객체
+        compress (bool): True이고 zstandard가 설치되어 있으면 `.json.zst`로 압축 저장
+        pretty (bool): 사람이 읽을 용도로 들여쓰기하여 저장 (기본값은 압축된 한 줄 출력)
+        default (Callable, optional): 기본으로 직렬화할 수 없는 객체를 변환하는 함수
+
+    Returns:
+        Path: 실제로 저장된 파일 경로
+    """
+    payload = dumps_json(obj, pretty, default)
+
+    path = Path(path)
+    if compress and zstandard is not None:
+        payload = zstandard.ZstdCompressor(level=3).compress(payload)
+        path = path.with_name(path.name + ".zst")
+
+    return write_atomic(path, payload)
+
+
+def write_atomic(path, payload):
+    """
+    바이트를 임시 파일에 기록한 뒤 rename하여 원자적으로 저장
+
+    Args:
+        path (str | Path): 저장할 파일 경로
+        payload (bytes): 저장할 바이트
+
+    Returns:
+        Path: 저장된 파일 경로
+    """
+    path = Path(path)
+    # 완성된 바이트를 TextIOWrapper 없이 바이너리 모드로 한 번에 기록
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    tmp.write_bytes(payload)
+    os.replace(tmp, path)
+    return path
+
+
+def load_json(path):
+    """
+    JSON 파일 로드 (`.zst`로 끝나면 압축 해제 후 로드)
+
+    Args:
+        path (str | Path): 읽을 파일 경로
+
+    Returns:
+        Any: 로드된 객체
+    """
+    path = Path(path)
+    payload = path.read_bytes()
+    if path.suffix == ".zst":
+        if zstandard is None:
+            raise ImportError("zstandard 패키지가 필요합니다.")
+        payload = zstandard.ZstdDecompressor().decompress(payload)
+    return loads_json(payload)
+
+
+def loads_json(payload):
+    """
+    JSON 바이트/문자열 파싱 (orjson이 있으면 orjson 사용)
+
+    Args:
+        payload (bytes | str): JSON 데이터
+
+    Returns:
+        Any: 파싱된 객체
+    """
+    if orjson is not None:
+        return orjson.loads(payload)
+    return json.loads(payload)
+
+
+class NdjsonWriter:
+    """
+    레코드를 계산되는 즉시 NDJSON 파일에 한 줄씩 추가하는 기록기
+
+    여러 스레드에서 동시에 write를 호출해도 줄이 섞이지 않도록 잠금을 사용합니다.
+    """
+
+    def __init__(self, path):
+        """
+        Args:
+            path (str | Path): 기록할 NDJSON 파일 경로
+        """
+        self.path = Path(path)
+        self._file = open(self.path, "ab")
+        self._lock = threading.Lock()
+
+    def write(self, record):
+        """레코드 하나를 한 줄로 직렬화하여 한 번의 write로 추가"""
+        line = dumps_json(record) + b"\n"
+        with self._lock:
+            self._file.write(line)
+            self._file.flush()
+
+    def close(self):
+        """파일 닫기"""
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def iter_ndjson(path):
+    """
+    NDJSON 파일의 레코드를 한 줄씩 읽어 반환
+
+    Args:
+        path (str | Path): 읽을 NDJSON 파일 경로
+
+    Yields:
+        Any: 각 줄의 레코드
+    """
+    loads = orjson.loads if orjson is not None else json.loads
+    with open(path, "rb") as f:
+        for line in f:
+            if line.strip():
+                yield loads(line)
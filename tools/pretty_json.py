@@ -0,0 +1,38 @@
+# tools/pretty_json.py
+
+"""
+저장된 분석 결과(JSON / .json.zst / .ndjson)를 들여쓰기하여 출력하는 CLI
+
+사용법:
+    python -m tools.pretty_json data/market_reports/market_research_results_<timestamp>.json.zst
+"""
+
+import sys
+import json
+import argparse
+
+from tools.io_utils import load_json, iter_ndjson
+
+
+def main():
+    parser = argparse.ArgumentParser(description="분석 결과 JSON 파일을 보기 좋게 출력합니다.")
+    parser.add_argument("paths", nargs="+", help="출력할 JSON 파일 경로 (.json, .json.zst 또는 .ndjson)")
+    parser.add_argument("-o", "--output", help="출력을 저장할 파일 경로 (지정하지 않으면 표준 출력)")
+    args = parser.parse_args()
+
+    texts = []
+    for path in args.paths:
+        # NDJSON은 레코드 단위로 출력
+        records = iter_ndjson(path) if path.endswith(".ndjson") else [load_json(path)]
+        texts.extend(json.dumps(record, ensure_ascii=False, indent=2) for record in records)
+    output = "\n".join(texts) + "\n"
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(output)
+    else:
+        sys.stdout.write(output)
+
+
+if __name__ == "__main__":
+    main()
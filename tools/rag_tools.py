@@ -2,31 +2,48 @@
 
 import os
 import sys
-import json
+import shutil
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 import requests
-import pandas as pd
-from datetime import datetime, timedelta
-from pathlib import Path
-from typing import List, Dict, Any, Optional
-from bs4 import BeautifulSoup
-from dotenv import load_dotenv
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from datetime import datetime
+from typing import List, Dict, Any, Optional, Tuple
 
-# .env 파일 로드
-load_dotenv()
+# config 모듈 임포트 (프로젝트 루트가 경로에 없을 때만 추가)
+_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if _ROOT not in sys.path:
+    sys.path.append(_ROOT)
 
-# config 모듈 임포트
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from config import CACHE_DIR, MARKET_REPORTS_DIR, COMPANY_DOCS_DIR, TARGET_COMPANIES_TOP5, COMPANY_CODE_INDEX
+from tools.cache_utils import cached_call, RequestCache
+from tools.io_utils import dump_json, dumps_json, loads_json
 
-from config import DATA_DIR, MARKET_REPORTS_DIR, COMPANY_DOCS_DIR, TARGET_COMPANIES
-
-# 필요한 디렉토리 생성
-os.makedirs(MARKET_REPORTS_DIR, exist_ok=True)
-os.makedirs(COMPANY_DOCS_DIR, exist_ok=True)
+# Tavily 검색 결과 캐시 디렉토리
+_SEARCH_CACHE_DIR = CACHE_DIR / "tavily"
+# 검색 결과에서 보관하는 필드 (점수, 원문 등 사용하지 않는 필드는 캐시/결과 파일에 남기지 않음)
+_RESULT_FIELDS = ("title", "url", "content")
 
 
 class TavilySearchTool:
     """Tavily API를 사용하여 웹 검색을 수행하는 클래스"""
     
+    # 검색 대상 금융 사이트
+    _INCLUDE_DOMAINS = (
+        # 글로벌 금융 사이트
+        "finance.yahoo.com", "bloomberg.com", "cnbc.com", "ft.com", 
+        "wsj.com", "reuters.com", "investing.com", "marketwatch.com",
+        
+        # 한국 금융 사이트
+        "finance.naver.com", "stock.naver.com", "hankyung.com", "mk.co.kr",
+        "edaily.co.kr", "sedaily.com", "fnnews.com", "fnguide.com", 
+        "infostock.co.kr", "investing.kr", "paxnet.co.kr", "cbs.co.kr",
+        "news.naver.com", "news.daum.net", "thebell.co.kr"
+    )
+    # 요청 본문 끝에 붙이는 미리 직렬화한 include_domains 필드 (검색마다 도메인 목록을 다시 인코딩하지 않음)
+    _INCLUDE_DOMAINS_TAIL = b',"include_domains":' + dumps_json(_INCLUDE_DOMAINS) + b'}'
+    
     def __init__(self, api_key=None):
         """
         Tavily 검색 도구 초기화
@@ -43,15 +60,36 @@ class TavilySearchTool:
         # 에러 메시지 설정
         if not self.api_key:
             print("경고: Tavily API 키가 설정되지 않았습니다. 환경 변수 TAVILY_API_KEY를 설정하세요.")
+        
+        # 연결을 재사용하도록 세션 하나로 모든 검색 요청 전송 (일시적 오류는 재시도)
+        retry = Retry(
+            total=3,
+            backoff_factor=0.3,
+            status_forcelist=[429, 500, 502, 503, 504],
+            allowed_methods=frozenset(["POST"])
+        )
+        self._session = requests.Session()
+        self._session.mount("https://", HTTPAdapter(pool_connections=10, pool_maxsize=20, max_retries=retry))
+        self._session.headers.update({
+            "Content-Type": "application/json",
+            "Authorization": f"Bearer {self.api_key}"
+        })
+        # 같은 프로세스에서 반복되는 동일 검색은 디스크 캐시도 거치지 않고 재사용 (동시 요청은 한 번만 전송)
+        self._memo = RequestCache()
+        # 한 분석에 필요한 독립 검색들을 동시에 보내는 스레드 풀 (스레드는 처음 사용할 때 생성됨)
+        self._pool = ThreadPoolExecutor(max_workers=8, thread_name_prefix="tavily")
 
-    def search(self, query: str, max_results: int = 5, search_depth: str = "basic") -> List[Dict]:
+    def search(self, query: str, max_results: int = 5, search_depth: str = "basic", ttl: int = 3600,
+               restrict_domains: bool = True) -> List[Dict]:
         """
-        Tavily API를 사용하여 웹 검색 수행
+        Tavily API를 사용하여 웹 검색 수행 (같은 요청은 ttl 동안 디스크 캐시에서 재사용)
         
         Args:
             query (str): 검색 쿼리
             max_results (int): 반환할 최대 결과 수
             search_depth (str): 검색 깊이 ("basic" 또는 "advanced")
+            ttl (int): 검색 결과 캐시 유효 시간(초)
+            restrict_domains (bool): 금융 사이트(_INCLUDE_DOMAINS)로 검색 범위 제한 여부
             
         Returns:
             List[Dict]: 검색 결과 목록
@@ -60,41 +98,40 @@ class TavilySearchTool:
             print("오류: Tavily API 키가 없습니다. 환경 변수 TAVILY_API_KEY를 설정하세요.")
             return []
         
-        # 한국 금융 사이트 포함
-        include_domains = [
-            # 글로벌 금융 사이트
-            "finance.yahoo.com", "bloomberg.com", "cnbc.com", "ft.com", 
-            "wsj.com", "reuters.com", "investing.com", "marketwatch.com",
-            
-            # 한국 금융 사이트
-            "finance.naver.com", "stock.naver.com", "hankyung.com", "mk.co.kr",
-            "edaily.co.kr", "sedaily.com", "fnnews.com", "fnguide.com", 
-            "infostock.co.kr", "investing.kr", "paxnet.co.kr", "cbs.co.kr",
-            "news.naver.com", "news.daum.net", "thebell.co.kr"
-        ]
-        
-        # Tavily API 요청 파라미터
+        # Tavily API 요청 파라미터 (금융 사이트 제한은 전송할 때 미리 직렬화한 필드로 추가)
         payload = {
-            "api_key": self.api_key,
             "query": query,
             "search_depth": search_depth,
-            "max_results": max_results,
-            "include_domains": include_domains
-        }
-        
-        headers = {
-            "Content-Type": "application/json"
+            "max_results": max_results
         }
         
+        key = (query, max_results, search_depth, restrict_domains)
+        results = self._memo.get_or_compute(
+            key, lambda: cached_call(_SEARCH_CACHE_DIR, [payload, restrict_domains], ttl,
+                                     lambda: self._post(payload, restrict_domains))
+        )
+        if not results:
+            # 실패(빈 결과)는 기억하지 않고 다음 호출에서 다시 시도
+            self._memo.discard(key)
+        # 호출한 쪽에서 목록을 수정해도 저장된 결과가 바뀌지 않도록 복사본 반환
+        return list(results)
+    
+    def _post(self, payload: Dict[str, Any], restrict_domains: bool = True) -> List[Dict]:
+        """검색 요청 전송 (실패 시 빈 목록 반환)"""
+        body = dumps_json(payload)
+        if restrict_domains:
+            # 한국 금융 사이트 포함 (닫는 중괄호를 떼고 미리 직렬화한 필드를 붙임)
+            body = body[:-1] + self._INCLUDE_DOMAINS_TAIL
         try:
-            response = requests.post(self.base_url, json=payload, headers=headers)
+            response = self._session.post(self.base_url, data=body, timeout=(3.05, 30))
             response.raise_for_status()  # HTTP 오류 체크
-            result_data = response.json()
+            result_data = loads_json(response.content)
             
-            # API 응답 형식에 따라 결과 추출
-            if "results" in result_data:
-                return result_data["results"]
-            return []
+            # API 응답 형식에 따라 결과 추출 (사용하는 필드만 남김)
+            return [
+                {field: item[field] for field in _RESULT_FIELDS if field in item}
+                for item in result_data.get("results", ())
+            ]
             
         except Exception as e:
             print(f"Tavily API 호출 중 오류 발생: {e}")
@@ -102,13 +139,60 @@ class TavilySearchTool:
                 print(f"응답 내용: {e.response.text}")
             return []
 
+    def search_many(self, searches: List[Tuple], search_depth: str = "basic") -> List[List[Dict]]:
+        """
+        서로 독립적인 여러 검색을 동시에 수행 (네트워크 대기 시간이 겹치도록 세션을 공유하는 스레드로 전송)
+        
+        Args:
+            searches (List[Tuple]): (검색 쿼리, 최대 결과 수[, 캐시 유효 시간(초)]) 목록
+            search_depth (str): 검색 깊이 ("basic" 또는 "advanced")
+            
+        Returns:
+            List[List[Dict]]: 입력 순서대로의 검색 결과 목록
+        """
+        return list(self._pool.map(
+            lambda item: self.search(item[0], item[1], search_depth, *item[2:]),
+            searches
+        ))
+    
+    def clear_cache(self):
+        """메모리와 디스크에 캐시된 검색 결과 삭제"""
+        self._memo = RequestCache()
+        shutil.rmtree(_SEARCH_CACHE_DIR, ignore_errors=True)
+
+
+def has_search_results(result):
+    """
+    분석 결과에 검색 결과가 하나라도 있는지 확인 (검색 실패/빈 응답은 캐시하지 않기 위해 사용)
+
+    Args:
+        result (list | dict): 검색 결과 목록 또는 섹션별 {"결과": [...]}를 담은 분석 결과
+
+    Returns:
+        bool: 검색 결과가 하나라도 있으면 True
+    """
+    if isinstance(result, list):
+        return bool(result)
+    return any(isinstance(section, dict) and section.get("결과") for section in result.values())
+
+
+@lru_cache(maxsize=1)
+def _default_search_tool():
+    """검색 도구를 따로 받지 않은 분석 도구들이 공유하는 TavilySearchTool (처음 사용할 때 생성)"""
+    return TavilySearchTool()
+
 
 class MarketTrendAnalyzer:
     """금융 시장 트렌드 분석 도구"""
     
-    def __init__(self):
-        """Market Trend Analyzer 초기화"""
-        self.search_tool = TavilySearchTool()
+    def __init__(self, search_tool: Optional[TavilySearchTool] = None):
+        """
+        Market Trend Analyzer 초기화
+        
+        Args:
+            search_tool (TavilySearchTool, optional): 사용할 검색 도구. 없으면 프로세스 공용 도구를 사용합니다.
+        """
+        self.search_tool = search_tool if search_tool is not None else _default_search_tool()
         self.reports_dir = MARKET_REPORTS_DIR
         
     def analyze_market_trend(self, market_type: str = "금융시장", days: int = 7) -> Dict[str, Any]:
@@ -126,20 +210,27 @@ class MarketTrendAnalyzer:
         
         # 시장 동향 검색
         trend_query = f"{market_type} 최근 동향 분석"
-        trend_results = self.search_tool.search(trend_query, max_results=5)
         
         # 키워드 검색
         keyword_query = f"{market_type} 주요 이슈 키워드"
-        keyword_results = self.search_tool.search(keyword_query, max_results=3)
         
         # 전문가 전망 검색
         forecast_query = f"{market_type} 전문가 전망 분석"
-        forecast_results = self.search_tool.search(forecast_query, max_results=3)
+        
+        # 검색들은 서로 독립적이므로 동시에 수행
+        trend_results, keyword_results, forecast_results = self.search_tool.search_many([
+            (trend_query, 5),
+            (keyword_query, 3),
+            (forecast_query, 3),
+        ])
+        
+        # 분석일자와 파일명에 같은 시각 사용
+        now = datetime.now()
         
         # 결과 취합
         result = {
             "시장유형": market_type,
-            "분석일자": datetime.now().strftime("%Y-%m-%d"),
+            "분석일자": now.strftime("%Y-%m-%d"),
             "검색기간": f"{days}일",
             "시장동향": {
                 "검색쿼리": trend_query,
@@ -156,7 +247,7 @@ class MarketTrendAnalyzer:
         }
         
         # 결과 저장
-        self._save_trend_analysis(result, market_type)
+        self._save_trend_analysis(result, market_type, now)
         
         return result
     
@@ -174,26 +265,31 @@ class MarketTrendAnalyzer:
         
         # 업종 동향 검색
         trend_query = f"{sector} 업종 최근 동향 분석"
-        trend_results = self.search_tool.search(trend_query, max_results=5)
         
         # 업종 내 주요 기업 검색
-        if sector in TARGET_COMPANIES:
-            companies = [company['name'] for company in TARGET_COMPANIES[sector][:5]]
-            companies_str = ", ".join(companies)
+        if sector in TARGET_COMPANIES_TOP5:
+            companies_str = ", ".join(TARGET_COMPANIES_TOP5[sector]["names"])
             companies_query = f"{companies_str} 기업 최근 소식"
-            companies_results = self.search_tool.search(companies_query, max_results=5)
         else:
             companies_query = f"{sector} 주요 기업 최근 소식"
-            companies_results = self.search_tool.search(companies_query, max_results=5)
         
         # 업종 투자 전망 검색
         forecast_query = f"{sector} 업종 투자 전망"
-        forecast_results = self.search_tool.search(forecast_query, max_results=3)
+        
+        # 검색들은 서로 독립적이므로 동시에 수행
+        trend_results, companies_results, forecast_results = self.search_tool.search_many([
+            (trend_query, 5),
+            (companies_query, 5),
+            (forecast_query, 3),
+        ])
+        
+        # 분석일자와 파일명에 같은 시각 사용
+        now = datetime.now()
         
         # 결과 취합
         result = {
             "업종": sector,
-            "분석일자": datetime.now().strftime("%Y-%m-%d"),
+            "분석일자": now.strftime("%Y-%m-%d"),
             "업종동향": {
                 "검색쿼리": trend_query,
                 "결과": trend_results
@@ -209,27 +305,27 @@ class MarketTrendAnalyzer:
         }
         
         # 결과 저장
-        self._save_trend_analysis(result, f"{sector}_업종")
+        self._save_trend_analysis(result, f"{sector}_업종", now)
         
         return result
     
-    def _save_trend_analysis(self, result: Dict[str, Any], prefix: str) -> str:
+    def _save_trend_analysis(self, result: Dict[str, Any], prefix: str, now: Optional[datetime] = None) -> str:
         """
         트렌드 분석 결과를 파일로 저장
         
         Args:
             result (Dict[str, Any]): 분석 결과
             prefix (str): 파일명 접두사
+            now (datetime, optional): 분석 시각 (없으면 현재 시각)
             
         Returns:
             str: 저장된 파일 경로
         """
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        timestamp = (now or datetime.now()).strftime("%Y%m%d_%H%M%S")
         filename = f"{prefix}_트렌드분석_{timestamp}.json"
         filepath = os.path.join(self.reports_dir, filename)
         
-        with open(filepath, 'w', encoding='utf-8') as f:
-            json.dump(result, f, ensure_ascii=False, indent=2)
+        dump_json(filepath, result, pretty=True)
         
         print(f"분석 결과가 {filepath}에 저장되었습니다.")
         return filepath
@@ -238,9 +334,14 @@ class MarketTrendAnalyzer:
 class CompanyAnalyzer:
     """기업 분석 도구"""
     
-    def __init__(self):
-        """Company Analyzer 초기화"""
-        self.search_tool = TavilySearchTool()
+    def __init__(self, search_tool: Optional[TavilySearchTool] = None):
+        """
+        Company Analyzer 초기화
+        
+        Args:
+            search_tool (TavilySearchTool, optional): 사용할 검색 도구. 없으면 프로세스 공용 도구를 사용합니다.
+        """
+        self.search_tool = search_tool if search_tool is not None else _default_search_tool()
         self.company_docs_dir = COMPANY_DOCS_DIR
     
     def analyze_company(self, code: str, name: Optional[str] = None) -> Dict[str, Any]:
@@ -257,46 +358,43 @@ class CompanyAnalyzer:
         # 기업명 검색
         sector_name = "미분류"
         if not name:
-            for sector, companies in TARGET_COMPANIES.items():
-                for company in companies:
-                    if company['code'] == code:
-                        name = company['name']
-                        sector_name = sector
-                        break
-                if name:
-                    break
-        
-        if not name:
-            name = f"종목({code})"
+            name, sector_name = COMPANY_CODE_INDEX.get(code, (f"종목({code})", "미분류"))
         
         print(f"{name} 기업 분석 중...")
         
         # 기업 정보 검색
         info_query = f"{name} 기업 개요 사업영역"
-        info_results = self.search_tool.search(info_query, max_results=3)
         
         # 최근 뉴스 검색
         news_query = f"{name} 최근 뉴스 소식"
-        news_results = self.search_tool.search(news_query, max_results=5)
         
         # 재무 정보 검색
         financial_query = f"{name} 재무제표 실적"
-        financial_results = self.search_tool.search(financial_query, max_results=3)
         
         # 투자 의견 검색
         investment_query = f"{name} 주식 투자의견 목표가"
-        investment_results = self.search_tool.search(investment_query, max_results=3)
         
         # 사업 전략 검색
         strategy_query = f"{name} 사업 전략 방향"
-        strategy_results = self.search_tool.search(strategy_query, max_results=3)
+        
+        # 검색들은 서로 독립적이므로 동시에 수행
+        info_results, news_results, financial_results, investment_results, strategy_results = self.search_tool.search_many([
+            (info_query, 3, 86400),  # 기업 개요/전략은 자주 바뀌지 않으므로 하루 동안 재사용
+            (news_query, 5, 3600),
+            (financial_query, 3),
+            (investment_query, 3),
+            (strategy_query, 3, 86400),
+        ])
+        
+        # 분석일자와 파일명에 같은 시각 사용
+        now = datetime.now()
         
         # 결과 취합
         result = {
             "기업코드": code,
             "기업명": name,
             "업종": sector_name,
-            "분석일자": datetime.now().strftime("%Y-%m-%d"),
+            "분석일자": now.strftime("%Y-%m-%d"),
             "기업정보": {
                 "검색쿼리": info_query,
                 "결과": info_results
@@ -320,7 +418,7 @@ class CompanyAnalyzer:
         }
         
         # 결과 저장
-        self._save_company_analysis(result)
+        self._save_company_analysis(result, now)
         
         return result
     
@@ -338,32 +436,17 @@ class CompanyAnalyzer:
         # 기업명 리스트 생성
         companies = []
         for code in company_codes:
-            name = None
-            company_sector = sector
+            name, company_sector = COMPANY_CODE_INDEX.get(code, (None, None))
             
-            if not sector:
-                for s, company_list in TARGET_COMPANIES.items():
-                    for company in company_list:
-                        if company['code'] == code:
-                            name = company['name']
-                            company_sector = s
-                            break
-                    if name:
-                        break
-            
-            if not name:
-                if sector:
-                    for company in TARGET_COMPANIES.get(sector, []):
-                        if company['code'] == code:
-                            name = company['name']
-                            break
-                
-                if not name:
-                    name = f"종목({code})"
+            if sector:
+                # 업종이 주어지면 해당 업종에 속한 기업만 이름을 사용
+                if company_sector != sector:
+                    name = None
+                company_sector = sector
             
             companies.append({
                 "code": code,
-                "name": name,
+                "name": name or f"종목({code})",
                 "sector": company_sector or "미분류"
             })
         
@@ -373,23 +456,30 @@ class CompanyAnalyzer:
         
         # 기업 비교 검색
         comparison_query = f"{companies_str} 기업 비교 분석"
-        comparison_results = self.search_tool.search(comparison_query, max_results=5)
         
         # 업종 내 경쟁력 검색
         if sector:
             competition_query = f"{sector} 업종 내 {companies_str} 경쟁력 비교"
         else:
             competition_query = f"{companies_str} 기업 경쟁력 비교"
-        competition_results = self.search_tool.search(competition_query, max_results=3)
         
         # 투자 매력도 검색
         investment_query = f"{companies_str} 투자 매력도 비교"
-        investment_results = self.search_tool.search(investment_query, max_results=3)
+        
+        # 검색들은 서로 독립적이므로 동시에 수행
+        comparison_results, competition_results, investment_results = self.search_tool.search_many([
+            (comparison_query, 5),
+            (competition_query, 3),
+            (investment_query, 3),
+        ])
+        
+        # 분석일자와 파일명에 같은 시각 사용
+        now = datetime.now()
         
         # 결과 취합
         result = {
             "비교기업": companies,
-            "분석일자": datetime.now().strftime("%Y-%m-%d"),
+            "분석일자": now.strftime("%Y-%m-%d"),
             "업종": sector or "복합업종",
             "비교분석": {
                 "검색쿼리": comparison_query,
@@ -406,33 +496,32 @@ class CompanyAnalyzer:
         }
         
         # 결과 저장
-        filename = f"기업비교분석_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+        filename = f"기업비교분석_{now.strftime('%Y%m%d_%H%M%S')}.json"
         filepath = os.path.join(self.company_docs_dir, filename)
         
-        with open(filepath, 'w', encoding='utf-8') as f:
-            json.dump(result, f, ensure_ascii=False, indent=2)
+        dump_json(filepath, result, pretty=True)
         
         print(f"비교 분석 결과가 {filepath}에 저장되었습니다.")
         return result
     
-    def _save_company_analysis(self, result: Dict[str, Any]) -> str:
+    def _save_company_analysis(self, result: Dict[str, Any], now: Optional[datetime] = None) -> str:
         """
         기업 분석 결과를 파일로 저장
         
         Args:
             result (Dict[str, Any]): 분석 결과
+            now (datetime, optional): 분석 시각 (없으면 현재 시각)
             
         Returns:
             str: 저장된 파일 경로
         """
         code = result["기업코드"]
         name = result["기업명"]
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        timestamp = (now or datetime.now()).strftime("%Y%m%d_%H%M%S")
         filename = f"{code}_{name}_분석_{timestamp}.json"
         filepath = os.path.join(self.company_docs_dir, filename)
         
-        with open(filepath, 'w', encoding='utf-8') as f:
-            json.dump(result, f, ensure_ascii=False, indent=2)
+        dump_json(filepath, result, pretty=True)
         
         print(f"기업 분석 결과가 {filepath}에 저장되었습니다.")
         return filepath
@@ -443,9 +532,14 @@ class FinancialRagToolkit:
     
     def __init__(self):
         """Financial RAG Toolkit 초기화"""
-        self.market_analyzer = MarketTrendAnalyzer()
-        self.company_analyzer = CompanyAnalyzer()
-        self.search_tool = TavilySearchTool()
+        # 프로세스 공용 검색 도구(HTTP 세션) 하나를 하위 분석 도구와 공유
+        self.search_tool = _default_search_tool()
+        self.market_analyzer = MarketTrendAnalyzer(self.search_tool)
+        self.company_analyzer = CompanyAnalyzer(self.search_tool)
+    
+    def clear_cache(self):
+        """디스크에 캐시된 검색 결과 삭제"""
+        self.search_tool.clear_cache()
     
     def search_financial_info(self, query: str, max_results: int = 10) -> List[Dict]:
         """
@@ -459,7 +553,8 @@ class FinancialRagToolkit:
             List[Dict]: 검색 결과
         """
         print(f"금융 정보 검색 중: '{query}'")
-        results = self.search_tool.search(query, max_results=max_results)
+        # 자유 검색어이므로 금융 사이트로 제한하지 않고 폭넓게 검색
+        results = self.search_tool.search(query, max_results=max_results, restrict_domains=False)
         return results
     
     def analyze_investment_theme(self, theme: str) -> Dict[str, Any]:
@@ -476,24 +571,31 @@ class FinancialRagToolkit:
         
         # 테마 개요 검색
         overview_query = f"{theme} 투자 테마 개요"
-        overview_results = self.search_tool.search(overview_query, max_results=3)
         
         # 관련 기업 검색
         companies_query = f"{theme} 관련 주요 기업"
-        companies_results = self.search_tool.search(companies_query, max_results=5)
         
         # 시장 전망 검색
         forecast_query = f"{theme} 투자 테마 전망"
-        forecast_results = self.search_tool.search(forecast_query, max_results=3)
         
         # 투자 전략 검색
         strategy_query = f"{theme} 테마 투자 전략"
-        strategy_results = self.search_tool.search(strategy_query, max_results=3)
+        
+        # 검색들은 서로 독립적이므로 동시에 수행
+        overview_results, companies_results, forecast_results, strategy_results = self.search_tool.search_many([
+            (overview_query, 3),
+            (companies_query, 5),
+            (forecast_query, 3),
+            (strategy_query, 3),
+        ])
+        
+        # 분석일자와 파일명에 같은 시각 사용
+        now = datetime.now()
         
         # 결과 취합
         result = {
             "투자테마": theme,
-            "분석일자": datetime.now().strftime("%Y-%m-%d"),
+            "분석일자": now.strftime("%Y-%m-%d"),
             "테마개요": {
                 "검색쿼리": overview_query,
                 "결과": overview_results
@@ -513,12 +615,11 @@ class FinancialRagToolkit:
         }
         
         # 결과 저장
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        timestamp = now.strftime("%Y%m%d_%H%M%S")
         filename = f"{theme}_테마분석_{timestamp}.json"
         filepath = os.path.join(MARKET_REPORTS_DIR, filename)
         
-        with open(filepath, 'w', encoding='utf-8') as f:
-            json.dump(result, f, ensure_ascii=False, indent=2)
+        dump_json(filepath, result, pretty=True)
         
         print(f"테마 분석 결과가 {filepath}에 저장되었습니다.")
         return result
@@ -554,24 +655,31 @@ class FinancialRagToolkit:
         
         # 주제 개요 검색
         overview_query = f"{topic} 개요 설명"
-        overview_results = self.search_tool.search(overview_query, max_results=3)
         
         # 주요 정보 검색
         main_query = f"{topic} 중요 정보 분석"
-        main_results = self.search_tool.search(main_query, max_results=5)
         
         # 전문가 의견 검색
         expert_query = f"{topic} 전문가 의견"
-        expert_results = self.search_tool.search(expert_query, max_results=3)
         
         # 결론 및 권장사항 검색
         conclusion_query = f"{topic} 결론 전망"
-        conclusion_results = self.search_tool.search(conclusion_query, max_results=2)
+        
+        # 검색들은 서로 독립적이므로 동시에 수행
+        overview_results, main_results, expert_results, conclusion_results = self.search_tool.search_many([
+            (overview_query, 3),
+            (main_query, 5),
+            (expert_query, 3),
+            (conclusion_query, 2),
+        ])
+        
+        # 분석일자와 파일명에 같은 시각 사용
+        now = datetime.now()
         
         # 결과 취합
         report = {
             "제목": f"{topic} 금융 보고서",
-            "작성일": datetime.now().strftime("%Y-%m-%d"),
+            "작성일": now.strftime("%Y-%m-%d"),
             "개요": {
                 "검색쿼리": overview_query,
                 "결과": overview_results
@@ -591,12 +699,11 @@ class FinancialRagToolkit:
         }
         
         # 결과 저장
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        timestamp = now.strftime("%Y%m%d_%H%M%S")
         filename = f"{topic}_보고서_{timestamp}.json"
         filepath = os.path.join(MARKET_REPORTS_DIR, filename)
         
-        with open(filepath, 'w', encoding='utf-8') as f:
-            json.dump(report, f, ensure_ascii=False, indent=2)
+        dump_json(filepath, report, pretty=True)
         
         print(f"금융 보고서가 {filepath}에 저장되었습니다.")
         return report
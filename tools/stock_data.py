@@ -1,31 +1,125 @@
 # tools/stock_data.py
 
-import FinanceDataReader as fdr
 import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
 import os
 import sys
-from pathlib import Path
+import pickle
+import shutil
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 
-# config 모듈 임포트
-try:
-    sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-except NameError:
-    import inspect
-    current_file = Path(inspect.getfile(inspect.currentframe()))
-    sys.path.append(str(current_file.parent.parent))
+# config 모듈 임포트 (프로젝트 루트가 경로에 없을 때만 추가)
+_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if _ROOT not in sys.path:
+    sys.path.append(_ROOT)
+
+from config import TARGET_COMPANIES, CACHE_DIR
+from tools._numba_kernels import technical_indicator_series
+from tools.io_utils import write_atomic
+
+# 주가 데이터 디스크 캐시 디렉토리 (종목 코드별 하위 디렉토리)
+_STOCK_CACHE_DIR = CACHE_DIR / "fdr"
+# 수익률 계산 기간 -> 기간(Period) 단위
+_RETURN_PERIODS = {'weekly': 'W', 'monthly': 'M', 'yearly': 'Y'}
+# 장 마감 후 시세가 확정되는 시각 (로컬 시간 = 한국 시간 기준)
+_MARKET_CLOSE_HOUR = 16
+# 메모리/디스크 캐시에 float32로 보관하는 가격 컬럼 (원 단위 정수 가격은 float32로 정확히 표현됨)
+_PRICE_COLUMNS = ('Open', 'High', 'Low', 'Close', 'Adj Close')
+
+
+@lru_cache(maxsize=1)
+def _fdr():
+    """FinanceDataReader 모듈 (임포트 비용이 크므로 처음 데이터를 조회할 때 로드)"""
+    import FinanceDataReader as fdr
+    return fdr
+
+
+def _downcast_ohlcv(data):
+    """가격 컬럼은 float32로, 거래량은 값이 들어가는 가장 작은 정수형으로 변환"""
+    data = data.astype({c: np.float32 for c in _PRICE_COLUMNS if c in data.columns})
+    if 'Volume' in data.columns and pd.api.types.is_integer_dtype(data['Volume']):
+        data['Volume'] = pd.to_numeric(data['Volume'], downcast='integer')
+    return data
+
+
+def _with_price_dtype(data, dtype):
+    """캐시된 데이터를 요청한 가격 dtype으로 반환 (캐시 dtype과 같으면 얕은 복사본)"""
+    if np.dtype(dtype) == np.float32:
+        return data.copy(deep=False)
+    return data.astype({c: dtype for c in _PRICE_COLUMNS if c in data.columns})
+
+
+def _stock_cache_path(code, start, end):
+    """주가 데이터 캐시 파일 경로"""
+    return _STOCK_CACHE_DIR / code / f"{start}_{end}.pkl"
+
+
+def _prune_stock_cache(path):
+    """
+    같은 종목의 캐시 중 지난 날짜의 최근 구간(종료일 당일에 받은 파일) 삭제
+
+    기본 조회 구간(최근 1년)은 날마다 시작/종료일이 바뀌어 새 파일로 저장되므로,
+    종료일 당일에 받았고 종료일이 지난 파일은 다시 조회되지 않아 정리합니다.
+    종료일 이후에 받은 과거 구간 파일은 바뀌지 않는 데이터이므로 남겨 둡니다.
+    """
+    today = datetime.now().strftime('%Y-%m-%d')
+    for old in path.parent.glob("*.pkl"):
+        # 파일명: <시작일>_<종료일>.pkl (YYYY-MM-DD 문자열 비교)
+        end = old.stem.rpartition("_")[2]
+        if old == path or end >= today:
+            continue
+        try:
+            fetched_on = datetime.fromtimestamp(old.stat().st_mtime).strftime('%Y-%m-%d')
+        except FileNotFoundError:
+            continue
+        if fetched_on == end:
+            old.unlink(missing_ok=True)
+
+
+def _is_stock_cache_fresh(path, end):
+    """
+    캐시된 주가 데이터가 아직 유효한지 확인
+    
+    종료일 장 마감 이후에 받은 데이터는 시세가 바뀌지 않으므로 항상 유효하고,
+    그 전에 받은 데이터는 오늘 장 마감 전에 오늘 받은 것일 때만 유효합니다.
+    (종료일 당일 장중에 받은 과거 구간 데이터는 마지막 봉이 확정되지 않았으므로 다시 받음)
+    """
+    fetched_at = datetime.fromtimestamp(path.stat().st_mtime)
+    end_close = datetime.strptime(end, '%Y-%m-%d').replace(hour=_MARKET_CLOSE_HOUR)
+    if fetched_at >= end_close:
+        return True
+    
+    now = datetime.now()
+    if fetched_at.date() != now.date():
+        return False
+    market_close = now.replace(hour=_MARKET_CLOSE_HOUR, minute=0, second=0, microsecond=0)
+    return now < market_close
 
-from config import TARGET_COMPANIES
 
 class StockDataFetcher:
     """주식 데이터를 가져오고 처리하는 클래스"""
     
     def __init__(self):
         """초기화 메서드"""
-        pass
+        # (종목 코드, 시작일, 종료일) -> 주가 데이터. 같은 실행 중 반복 조회 시 재사용
+        self._data_cache = {}
+        self._cache_lock = threading.Lock()
+        # 여러 종목 조회에 재사용하는 I/O 스레드 풀 (스레드는 처음 작업을 제출할 때 생성됨)
+        self._io_pool = ThreadPoolExecutor(max_workers=16, thread_name_prefix="stock-io")
     
-    def get_stock_data(self, code, start=None, end=None):
+    def close(self):
+        """I/O 스레드 풀 종료"""
+        self._io_pool.shutdown(wait=False)
+    
+    def __del__(self):
+        pool = getattr(self, "_io_pool", None)
+        if pool is not None:
+            pool.shutdown(wait=False)
+    
+    def get_stock_data(self, code, start=None, end=None, dtype='float32'):
         """
         주식 코드에 해당하는 데이터를 가져옴
         
@@ -33,6 +127,7 @@ class StockDataFetcher:
             code (str): 주식 코드
             start (str): 시작일자 (YYYY-MM-DD)
             end (str): 종료일자 (YYYY-MM-DD)
+            dtype (str): 가격 컬럼 dtype (캐시는 float32로 보관, float64가 필요하면 'float64')
             
         Returns:
             pandas.DataFrame: 주식 데이터
@@ -44,14 +139,72 @@ class StockDataFetcher:
             # 기본값: 1년 전
             start = (datetime.now() - timedelta(days=365)).strftime('%Y-%m-%d')
         
+        key = (code, start, end)
+        with self._cache_lock:
+            cached = self._data_cache.get(key)
+        if cached is not None:
+            # 호출한 쪽에서 컬럼을 추가해도 캐시가 바뀌지 않도록 복사본 반환
+            return _with_price_dtype(cached, dtype)
+        
+        # 디스크 캐시 확인 (SKIP_CACHE=1 이면 사용하지 않음)
+        cache_path = _stock_cache_path(code, start, end)
+        if os.getenv("SKIP_CACHE") != "1" and cache_path.exists() and _is_stock_cache_fresh(cache_path, end):
+            try:
+                data = _downcast_ohlcv(pd.read_pickle(cache_path))
+                with self._cache_lock:
+                    self._data_cache[key] = data
+                return _with_price_dtype(data, dtype)
+            except Exception:
+                pass  # 손상된 캐시는 무시하고 다시 가져옴
+        
         # FinanceDataReader로 데이터 가져오기
         try:
-            data = fdr.DataReader(code, start, end)
+            data = _fdr().DataReader(code, start, end)
+            # 실패(빈 데이터)는 캐시하지 않고 다음 호출에서 다시 시도
+            if not data.empty:
+                data = _downcast_ohlcv(data)
+                with self._cache_lock:
+                    self._data_cache[key] = data
+                cache_path.parent.mkdir(parents=True, exist_ok=True)
+                write_atomic(cache_path, pickle.dumps(data, protocol=pickle.HIGHEST_PROTOCOL))
+                _prune_stock_cache(cache_path)
+                return _with_price_dtype(data, dtype)
             return data
         except Exception as e:
             print(f"데이터 가져오기 실패 ({code}): {e}")
             return pd.DataFrame()  # 빈 데이터프레임 반환
     
+    def clear_stock_cache(self, code=None):
+        """
+        캐시된 주가 데이터 삭제
+        
+        Args:
+            code (str, optional): 삭제할 종목 코드. 없으면 전체 삭제
+        """
+        with self._cache_lock:
+            if code is None:
+                self._data_cache.clear()
+            else:
+                for key in [key for key in self._data_cache if key[0] == code]:
+                    del self._data_cache[key]
+        shutil.rmtree(_STOCK_CACHE_DIR if code is None else _STOCK_CACHE_DIR / code, ignore_errors=True)
+    
+    def get_multi(self, codes, start=None, end=None):
+        """
+        여러 주식 코드의 데이터를 병렬로 가져옴
+        
+        Args:
+            codes (list): 주식 코드 리스트
+            start (str): 시작일자 (YYYY-MM-DD)
+            end (str): 종료일자 (YYYY-MM-DD)
+            
+        Returns:
+            dict: 종목 코드 -> 주가 데이터 (입력 순서 유지, 실패한 종목은 빈 데이터프레임)
+        """
+        codes = list(dict.fromkeys(codes))
+        frames = self._io_pool.map(lambda code: self.get_stock_data(code, start, end), codes)
+        return dict(zip(codes, frames))
+    
     def get_multiple_stocks(self, codes, start=None, end=None):
         """
         여러 주식 코드에 해당하는 종가 데이터를 한 번에 가져옴
@@ -64,16 +217,16 @@ class StockDataFetcher:
         Returns:
             pandas.DataFrame: 각 주식의 종가를 컬럼으로 갖는 데이터프레임
         """
-        result = pd.DataFrame()
-        
-        for code in codes:
-            data = self.get_stock_data(code, start, end)
-            if not data.empty:
-                if result.empty:
-                    result.index = data.index
-                result[code] = data['Close']
+        closes = {
+            code: data['Close']
+            for code, data in self.get_multi(codes, start, end).items()
+            if not data.empty
+        }
+        if not closes:
+            return pd.DataFrame()
         
-        return result
+        # 컬럼을 하나씩 추가하지 않고 한 번에 합친 뒤 첫 종목의 날짜 기준으로 정렬
+        return pd.concat(closes, axis=1).reindex(next(iter(closes.values())).index)
     
     def get_index_data(self, index_code='KS11', start=None, end=None):
         """
@@ -100,58 +253,60 @@ class StockDataFetcher:
         Returns:
             pandas.DataFrame: 수익률 데이터
         """
-        if period == 'daily':
-            return data['Close'].pct_change().dropna()
-        
-        elif period == 'weekly':
-            return data['Close'].resample('W').last().pct_change().dropna()
+        close = data['Close']
         
-        elif period == 'monthly':
-            return data['Close'].resample('M').last().pct_change().dropna()
+        if period == 'daily':
+            values = close.to_numpy(dtype=np.float64)
+            index = close.index
         
-        elif period == 'yearly':
-            return data['Close'].resample('Y').last().pct_change().dropna()
+        elif period in _RETURN_PERIODS:
+            # 기간별 마지막 종가 (라벨은 resample과 같이 기간의 마지막 날짜)
+            last = close.groupby(close.index.to_period(_RETURN_PERIODS[period])).last()
+            values = last.to_numpy(dtype=np.float64)
+            index = last.index.to_timestamp(how='end').normalize()
         
         else:
             raise ValueError(f"지원하지 않는 기간: {period}")
+        
+        return pd.Series(values[1:] / values[:-1] - 1, index=index[1:], name=close.name)
     
-    def calculate_technical_indicators(self, data):
+    def calculate_technical_indicators(self, data, dtype='float32', columns=None):
         """
         기술적 지표 계산
         
         Args:
             data (pandas.DataFrame): 주가 데이터
+            dtype (str): 추가되는 지표 컬럼 dtype (계산은 float64로 수행)
+            columns (Iterable[str], optional): 추가할 지표 컬럼 (없으면 전체). 나머지 컬럼은 그대로 유지
             
         Returns:
             pandas.DataFrame: 기술적 지표가 추가된 데이터
         """
-        df = data.copy()
-        
-        # 이동평균
-        df['MA5'] = df['Close'].rolling(window=5).mean()
-        df['MA20'] = df['Close'].rolling(window=20).mean()
-        df['MA60'] = df['Close'].rolling(window=60).mean()
-        df['MA120'] = df['Close'].rolling(window=120).mean()
-        
-        # 볼린저 밴드 (20일 기준)
-        df['MA20_STD'] = df['Close'].rolling(window=20).std()
-        df['Upper_Band'] = df['MA20'] + (df['MA20_STD'] * 2)
-        df['Lower_Band'] = df['MA20'] - (df['MA20_STD'] * 2)
-        
-        # MACD
-        df['EMA12'] = df['Close'].ewm(span=12, adjust=False).mean()
-        df['EMA26'] = df['Close'].ewm(span=26, adjust=False).mean()
-        df['MACD'] = df['EMA12'] - df['EMA26']
-        df['Signal'] = df['MACD'].ewm(span=9, adjust=False).mean()
-        
-        # RSI (14일 기준)
-        delta = df['Close'].diff()
-        gain = (delta.where(delta > 0, 0)).rolling(window=14).mean()
-        loss = (-delta.where(delta < 0, 0)).rolling(window=14).mean()
-        rs = gain / loss
-        df['RSI'] = 100 - (100 / (1 + rs))
-        
-        return df
+        # 이동평균(5/20/60/120일), 20일 표준편차, MACD(12/26/9), RSI(14일)를 종가 배열 한 번 순회로 계산
+        ma5, ma20, ma60, ma120, std20, ema12, ema26, macd, signal, rsi = technical_indicator_series(
+            data['Close'].to_numpy(dtype=np.float64)
+        )
+        
+        # 요청한 컬럼을 한 번에 추가 (원본은 변경하지 않음)
+        indicators = {
+            'MA5': ma5,
+            'MA20': ma20,
+            'MA60': ma60,
+            'MA120': ma120,
+            # 볼린저 밴드 (20일 기준)
+            'MA20_STD': std20,
+            'Upper_Band': ma20 + std20 * 2,
+            'Lower_Band': ma20 - std20 * 2,
+            # MACD
+            'EMA12': ema12,
+            'EMA26': ema26,
+            'MACD': macd,
+            'Signal': signal,
+            # RSI (14일 Wilder 평활)
+            'RSI': rsi
+        }
+        names = indicators if columns is None else columns
+        return data.assign(**{name: indicators[name].astype(dtype, copy=False) for name in names})
     
     def get_sector_data(self, sector):
         """
@@ -166,19 +321,18 @@ class StockDataFetcher:
         if sector not in TARGET_COMPANIES:
             raise ValueError(f"지원하지 않는 업종: {sector}")
         
-        result = {}
-        for company in TARGET_COMPANIES[sector]:
-            code = company['code']
-            name = company['name']
-            data = self.get_stock_data(code)
-            result[code] = {
-                'name': name,
-                'data': data
-            }
+        companies = TARGET_COMPANIES[sector]
+        frames = self.get_multi([company['code'] for company in companies])
         
-        return result
+        return {
+            company['code']: {
+                'name': company['name'],
+                'data': frames[company['code']]
+            }
+            for company in companies
+        }
     
-    def compare_performance(self, codes, names=None, start=None, end=None):
+    def compare_performance(self, codes, names=None, start=None, end=None, prices=None):
         """
         여러 종목의 성과 비교 (첫 날 기준 정규화)
         
@@ -187,6 +341,7 @@ class StockDataFetcher:
             names (list): 종목명 리스트 (없으면 코드 사용)
             start (str): 시작일자 (YYYY-MM-DD)
             end (str): 종료일자 (YYYY-MM-DD)
+            prices (pandas.DataFrame, optional): 이미 가져온 종가 데이터 (get_multiple_stocks 결과). 있으면 다시 가져오지 않음
             
         Returns:
             pandas.DataFrame: 정규화된 성과 데이터
@@ -195,16 +350,19 @@ class StockDataFetcher:
             names = codes
         
         # 데이터 가져오기
-        df = self.get_multiple_stocks(codes, start, end)
+        df = prices if prices is not None else self.get_multiple_stocks(codes, start, end)
         if df.empty:
             return df
         
-        # 첫날 기준 정규화
-        normalized_df = pd.DataFrame(index=df.index)
+        # 코드 -> 표시할 이름 (입력 순서 유지, 데이터가 있는 종목만)
+        columns = {}
         for i, code in enumerate(codes):
             if code in df.columns:
-                name = names[i] if i < len(names) else code
-                normalized_df[name] = df[code] / df[code].iloc[0] * 100
+                columns.setdefault(code, names[i] if i < len(names) else code)
+        
+        # 첫날 기준 정규화 (컬럼별 계산 대신 전체 값에 한 번에 적용)
+        closes = df[list(columns)].astype(np.float64)
+        normalized_df = closes.div(closes.iloc[0]).mul(100).set_axis(list(columns.values()), axis=1)
                 
         # 반환하기 전에 인덱스를 문자열로 변환
         if not normalized_df.empty and isinstance(normalized_df.index, pd.DatetimeIndex):
@@ -1,40 +1,170 @@
 # tools/visualizer.py
 
-import pandas as pd
+import io
+import os
 import numpy as np
+import matplotlib
+# GUI 백엔드 탐색을 피하기 위해 pyplot 임포트 전에 비대화형 백엔드 지정 (MPLBACKEND로 변경 가능)
+matplotlib.use(os.getenv("MPLBACKEND", "Agg"))
 import matplotlib.pyplot as plt
 import matplotlib.ticker as ticker
-import seaborn as sns
-import os
+import matplotlib.dates as mdates
+from matplotlib.collections import LineCollection, PolyCollection
 import sys
-from pathlib import Path
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial, lru_cache
 from datetime import datetime, timedelta
-import matplotlib.font_manager as fm
 
-# config 모듈 임포트
-try:
-    sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-except NameError:
-    import inspect
-    current_file = Path(inspect.getfile(inspect.currentframe()))
-    sys.path.append(str(current_file.parent.parent))
+# config 모듈 임포트 (프로젝트 루트가 경로에 없을 때만 추가)
+_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if _ROOT not in sys.path:
+    sys.path.append(_ROOT)
 
-from config import OUTPUTS_DIR, CHARTS_DIR, TARGET_COMPANIES
+from config import OUTPUTS_DIR, CHARTS_DIR, TARGET_COMPANIES_TOP5, COMPANY_CODE_INDEX
 from tools.stock_data import StockDataFetcher
+from tools._numba_kernels import rolling_mean_1d, lttb_indices, lttb_indices_cols
+from tools.io_utils import ensure_dir, write_atomic
+
+
+# 저장하는 차트 기본 해상도와 이미지 인코딩 옵션 (PNG는 압축 수준을 낮춰 인코딩 시간 단축)
+_CHART_DPI = 120
+_PNG_OPTIONS = {"compress_level": 1}
+_WEBP_OPTIONS = {"quality": 85, "method": 6}
+# 기술적 지표 차트에 사용하는 컬럼
+_INDICATOR_COLUMNS = ('Close', 'MA20', 'MA60', 'Upper_Band', 'Lower_Band', 'MACD', 'Signal', 'RSI')
+# 상관계수 칸 배경 상대 휘도가 이 값보다 밝으면 검은 글씨, 어두우면 흰 글씨로 표시
+_ANNOT_LUMINANCE = 0.408
+# pyplot의 전역 Figure 관리자는 스레드 안전하지 않으므로 Figure 생성만 직렬화 (그리기/저장은 Figure별로 병렬 수행)
+_PYPLOT_LOCK = threading.Lock()
+
+
+@lru_cache(maxsize=1)
+def _configure_fonts():
+    """한글 폰트 설정 (프로세스당 1회, 처음 StockVisualizer를 만들 때 적용)"""
+    plt.rcParams['font.family'] = 'Malgun Gothic'
+    plt.rcParams['axes.unicode_minus'] = False
+
+
+def _format_amount(x, pos):
+    """금액/거래량 눈금 레이블 (천 단위 구분)"""
+    return f"{x:,.0f}"
+
+
+def _format_percent(x, pos):
+    """수익률 눈금 레이블"""
+    return f"{x:,.1f}%"
+
 
-# 한글 폰트 설정
-plt.rcParams['font.family'] = 'Malgun Gothic'
-plt.rcParams['axes.unicode_minus'] = False
+def _encode_figure(fig, save_path, dpi):
+    """Figure를 이미지 바이트로 인코딩 (저장 경로 확장자가 .webp이면 WebP, 아니면 PNG)"""
+    fmt = "webp" if str(save_path).lower().endswith(".webp") else "png"
+    buf = io.BytesIO()
+    fig.savefig(buf, format=fmt, dpi=dpi, pil_kwargs=_WEBP_OPTIONS if fmt == "webp" else _PNG_OPTIONS)
+    return buf.getvalue()
+
+
+def _plot_indices(fig, dpi, *series):
+    """
+    저장 해상도에서 Figure 가로 픽셀 수의 두 배보다 긴 시리즈를 LTTB로 줄일 때 남길 인덱스
+    
+    여러 시리즈를 주면 시리즈별로 고른 인덱스의 합집합을 반환하여 모든 시리즈를 같은 x 위치에 그립니다.
+    
+    Args:
+        fig (matplotlib.figure.Figure): 그릴 Figure
+        dpi (int): 저장 해상도
+        *series (numpy.ndarray): float64 값 배열 (길이가 같아야 함)
+        
+    Returns:
+        slice | numpy.ndarray: 전체 구간(slice) 또는 남길 인덱스 배열
+    """
+    n = len(series[0])
+    limit = int(fig.get_size_inches()[0] * dpi * 2)
+    if n <= limit:
+        return slice(None)
+    
+    x = np.arange(n, dtype=np.float64)
+    if len(series) == 1:
+        return lttb_indices(x, series[0], limit)
+    # 시리즈가 여러 개면 열별로 병렬 계산
+    return np.unique(lttb_indices_cols(x, np.column_stack(series), limit))
 
 class StockVisualizer:
     """주식 데이터 시각화를 위한 클래스"""
     
     def __init__(self):
         """초기화 메서드"""
+        _configure_fonts()
         self.outputs_dir = OUTPUTS_DIR
         self.charts_dir = CHARTS_DIR
-        os.makedirs(self.charts_dir, exist_ok=True)
         self.stock_fetcher = StockDataFetcher()
+        # 저장 해상도 (.webp 경로로 저장하면 WebP로 인코딩)
+        self.dpi = _CHART_DPI
+        # 차트 종류 -> (Figure, Axes). 파일로 저장하는 차트는 매번 새로 만들지 않고 비워서 재사용
+        self._figures = {}
+        # 인코딩한 차트 이미지를 파일로 쓰는 스레드 풀 (스레드는 처음 저장할 때 생성됨)
+        self._io_pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix="chart-io")
+        # 대시보드 생성 중에는 파일 쓰기를 기다리지 않고 모아 두었다가 마지막에 한 번에 기다림
+        self._pending_writes = None
+    
+    def close(self):
+        """재사용하던 Figure 닫기 및 파일 쓰기 스레드 풀 종료 (남은 쓰기는 완료될 때까지 대기)"""
+        for fig, _ in self._figures.values():
+            plt.close(fig)
+        self._figures.clear()
+        self._io_pool.shutdown(wait=True)
+    
+    def _write_chart(self, fig, save_path):
+        """
+        차트를 그리는 스레드에서 이미지로 인코딩하고 파일 쓰기는 I/O 스레드에 맡김
+        
+        대시보드 생성 중이 아니면 파일이 저장될 때까지 기다립니다.
+        """
+        future = self._io_pool.submit(write_atomic, save_path, _encode_figure(fig, save_path, self.dpi))
+        pending = self._pending_writes
+        if pending is None:
+            future.result()
+        else:
+            pending.append(future)
+    
+    def _figure(self, kind, save_path, nrows=1, **kwargs):
+        """
+        차트를 그릴 Figure와 Axes 반환
+        
+        파일로 저장하는 경우 차트 종류별로 한 번 만든 Figure의 Axes를 비워서 재사용하고,
+        화면에 표시하는 경우에는 새로 만듭니다. 배치는 Figure에 설정한 constrained layout이 그릴 때마다 맞춥니다.
+        
+        Args:
+            kind (str): 차트 종류 (캐시 키)
+            save_path (str): 저장 경로
+            nrows (int): 세로로 배치할 Axes 수
+            **kwargs: plt.subplots 인자 (figsize 등)
+            
+        Returns:
+            tuple: (Figure, Axes 또는 Axes 배열)
+        """
+        kwargs.setdefault("layout", "constrained")
+        if not save_path:
+            with _PYPLOT_LOCK:
+                return plt.subplots(nrows, **kwargs)
+        
+        cached = self._figures.get(kind)
+        if cached is None:
+            with _PYPLOT_LOCK:
+                cached = self._figures[kind] = plt.subplots(nrows, **kwargs)
+        else:
+            for ax in np.atleast_1d(cached[1]):
+                ax.cla()
+        return cached
+    
+    def _save_or_show(self, fig, save_path):
+        """차트를 파일로 저장하거나 (재사용 Figure는 닫지 않음) 화면에 표시한 뒤 닫음"""
+        if save_path:
+            self._write_chart(fig, save_path)
+            return save_path
+        plt.show()
+        plt.close(fig)
+        return None
     
     def plot_stock_price(self, data, title=None, ma_periods=None, save_path=None):
         """
@@ -52,17 +182,19 @@ class StockVisualizer:
         if ma_periods is None:
             ma_periods = [20, 60]
         
-        fig, ax = plt.subplots(figsize=(12, 6))
+        fig, ax = self._figure("price", save_path, figsize=(12, 6))
         
-        # 주가 그래프
-        ax.plot(data.index, data['Close'], label='종가', linewidth=2)
+        # 주가 그래프 (점이 많으면 종가 기준으로 줄인 위치에만 그림)
+        close = data['Close'].to_numpy(dtype=np.float64)
+        keep = _plot_indices(fig, self.dpi, close)
+        index = data.index.to_numpy()[keep]
+        ax.plot(index, close[keep], label='종가', linewidth=2)
         
-        # 이동평균선
+        # 이동평균선 (이미 계산된 컬럼이 없으면 직접 계산하며, 넘겨받은 데이터는 변경하지 않음)
         for period in ma_periods:
             ma_col = f'MA{period}'
-            if ma_col not in data.columns:
-                data[ma_col] = data['Close'].rolling(window=period).mean()
-            ax.plot(data.index, data[ma_col], label=f'{period}일 이동평균', linestyle='--')
+            ma = data[ma_col].to_numpy() if ma_col in data.columns else rolling_mean_1d(close, period)
+            ax.plot(index, ma[keep], label=f'{period}일 이동평균', linestyle='--')
         
         # 그래프 스타일 설정
         ax.set_title(title if title else '주가 차트', fontsize=16)
@@ -76,19 +208,9 @@ class StockVisualizer:
         fig.autofmt_xdate()
         
         # 금액 단위 설정
-        ax.yaxis.set_major_formatter(ticker.StrMethodFormatter('{x:,.0f}'))
-        
-        plt.tight_layout()
+        ax.yaxis.set_major_formatter(_format_amount)
         
-        # 파일 저장
-        if save_path:
-            plt.savefig(save_path, dpi=300)
-            plt.close()
-            return save_path
-        else:
-            plt.show()
-            plt.close()
-            return None
+        return self._save_or_show(fig, save_path)
     
     def plot_volume_chart(self, data, title=None, save_path=None):
         """
@@ -102,14 +224,17 @@ class StockVisualizer:
         Returns:
             str: 저장된 파일 경로 또는 None
         """
-        fig, ax = plt.subplots(figsize=(12, 6))
+        fig, ax = self._figure("volume", save_path, figsize=(12, 6))
         
-        # 거래량 바 차트
-        ax.bar(data.index, data['Volume'], alpha=0.7, label='거래량', color='dodgerblue')
+        # 거래량 바 차트 (점이 많으면 거래량 기준으로 줄인 위치에만 그림)
+        volume = data['Volume'].to_numpy(dtype=np.float64)
+        keep = _plot_indices(fig, self.dpi, volume)
+        index = data.index.to_numpy()[keep]
+        ax.bar(index, volume[keep], alpha=0.7, label='거래량', color='dodgerblue')
         
         # 20일 이동평균 거래량
-        vol_ma = data['Volume'].rolling(window=20).mean()
-        ax.plot(data.index, vol_ma, color='red', label='20일 이동평균 거래량', linewidth=2)
+        vol_ma = rolling_mean_1d(volume, 20)
+        ax.plot(index, vol_ma[keep], color='red', label='20일 이동평균 거래량', linewidth=2)
         
         # 그래프 스타일 설정
         ax.set_title(title if title else '거래량 차트', fontsize=16)
@@ -123,19 +248,9 @@ class StockVisualizer:
         fig.autofmt_xdate()
         
         # 거래량 단위 설정
-        ax.yaxis.set_major_formatter(ticker.StrMethodFormatter('{x:,.0f}'))
-        
-        plt.tight_layout()
+        ax.yaxis.set_major_formatter(_format_amount)
         
-        # 파일 저장
-        if save_path:
-            plt.savefig(save_path, dpi=300)
-            plt.close()
-            return save_path
-        else:
-            plt.show()
-            plt.close()
-            return None
+        return self._save_or_show(fig, save_path)
     
     def plot_candlestick_chart(self, data, title=None, ma_periods=None, save_path=None):
         """
@@ -157,37 +272,43 @@ class StockVisualizer:
         if len(data) > 60:
             data = data.iloc[-60:]
         
-        fig, ax = plt.subplots(figsize=(14, 7))
+        fig, ax = self._figure("candlestick", save_path, figsize=(14, 7))
         
-        # 캔들스틱 데이터 생성
+        # 캔들스틱 데이터 생성 (봉마다 막대를 만들지 않고 몸통/꼬리를 각각 하나의 컬렉션으로 그림)
         width = 0.6
-        width2 = 0.05
-        
-        # 상승
-        up = data[data.Close >= data.Open]
-        # 하락
-        down = data[data.Close < data.Open]
-        
-        # 캔들 몸통 색상
-        col1 = 'red'
-        col2 = 'blue'
-        
-        # 상승봉
-        ax.bar(up.index, up.Close-up.Open, width, bottom=up.Open, color=col1, alpha=0.8)
-        ax.bar(up.index, up.High-up.Close, width2, bottom=up.Close, color=col1, alpha=0.8)
-        ax.bar(up.index, up.Low-up.Open, width2, bottom=up.Open, color=col1, alpha=0.8)
-        
-        # 하락봉
-        ax.bar(down.index, down.Close-down.Open, width, bottom=down.Open, color=col2, alpha=0.8)
-        ax.bar(down.index, down.High-down.Open, width2, bottom=down.Open, color=col2, alpha=0.8)
-        ax.bar(down.index, down.Low-down.Close, width2, bottom=down.Close, color=col2, alpha=0.8)
-        
-        # 이동평균선
+        x = mdates.date2num(data.index.to_numpy())
+        opens = data['Open'].to_numpy(dtype=np.float64)
+        closes = data['Close'].to_numpy(dtype=np.float64)
+        highs = data['High'].to_numpy(dtype=np.float64)
+        lows = data['Low'].to_numpy(dtype=np.float64)
+        
+        # 캔들 색상 (상승: 빨강, 하락: 파랑)
+        colors = np.where(closes >= opens, 'red', 'blue')
+        
+        # 꼬리 (저가 ~ 고가)
+        wicks = np.stack([np.column_stack([x, lows]), np.column_stack([x, highs])], axis=1)
+        ax.add_collection(LineCollection(wicks, colors=colors, linewidths=1, alpha=0.8))
+        
+        # 몸통 (시가 ~ 종가 사각형)
+        left, right = x - width / 2, x + width / 2
+        bottom, top = np.minimum(opens, closes), np.maximum(opens, closes)
+        bodies = np.stack([
+            np.column_stack([left, bottom]),
+            np.column_stack([left, top]),
+            np.column_stack([right, top]),
+            np.column_stack([right, bottom]),
+        ], axis=1)
+        ax.add_collection(PolyCollection(bodies, facecolors=colors, edgecolors=colors, alpha=0.8))
+        
+        # 컬렉션은 축 범위를 갱신하지 않으므로 날짜 축 지정 후 한 번에 조정
+        ax.xaxis_date()
+        ax.autoscale_view()
+        
+        # 이동평균선 (이미 계산된 컬럼이 없으면 직접 계산하며, 넘겨받은 데이터는 변경하지 않음)
         for period in ma_periods:
             ma_col = f'MA{period}'
-            if ma_col not in data.columns:
-                data[ma_col] = data['Close'].rolling(window=period).mean()
-            ax.plot(data.index, data[ma_col], label=f'{period}일 이동평균', linestyle='--')
+            ma = data[ma_col].to_numpy() if ma_col in data.columns else rolling_mean_1d(closes, period)
+            ax.plot(x, ma, label=f'{period}일 이동평균', linestyle='--')
         
         # 그래프 스타일 설정
         ax.set_title(title if title else '캔들스틱 차트', fontsize=16)
@@ -201,19 +322,9 @@ class StockVisualizer:
         fig.autofmt_xdate()
         
         # 금액 단위 설정
-        ax.yaxis.set_major_formatter(ticker.StrMethodFormatter('{x:,.0f}'))
-        
-        plt.tight_layout()
+        ax.yaxis.set_major_formatter(_format_amount)
         
-        # 파일 저장
-        if save_path:
-            plt.savefig(save_path, dpi=300)
-            plt.close()
-            return save_path
-        else:
-            plt.show()
-            plt.close()
-            return None
+        return self._save_or_show(fig, save_path)
     
     def plot_technical_indicators(self, data, title=None, save_path=None):
         """
@@ -227,39 +338,46 @@ class StockVisualizer:
         Returns:
             str: 저장된 파일 경로 또는 None
         """
-        # 데이터 준비
-        if 'RSI' not in data.columns or 'MACD' not in data.columns:
-            data = self.stock_fetcher.calculate_technical_indicators(data)
-        
-        # 최근 6개월 데이터만 표시
-        if len(data) > 120:
-            data = data.iloc[-120:]
+        # 데이터 준비 (없는 지표 컬럼만 추가하고 이미 있는 컬럼은 그대로 사용)
+        missing = [column for column in _INDICATOR_COLUMNS if column not in data.columns]
+        if missing:
+            data = self.stock_fetcher.calculate_technical_indicators(data, columns=missing)
+        
+        # 최근 6개월 데이터만 잘라낸 뒤 필요한 컬럼을 배열로 한 번에 변환
+        data = data.iloc[-120:]
+        index = data.index.to_numpy()
+        close, ma20, ma60, upper, lower, macd, signal, rsi = (
+            data[list(_INDICATOR_COLUMNS)].to_numpy(dtype=np.float64).T
+        )
         
         # 그래프 생성
-        fig, (ax1, ax2, ax3) = plt.subplots(3, 1, figsize=(14, 12), gridspec_kw={'height_ratios': [3, 1, 1]})
+        fig, (ax1, ax2, ax3) = self._figure(
+            "indicators", save_path, 3, figsize=(14, 12), gridspec_kw={'height_ratios': [3, 1, 1]}
+        )
         
         # 주가 및 이동평균선
-        ax1.plot(data.index, data['Close'], label='종가', color='black')
-        ax1.plot(data.index, data['MA20'], label='20일 이동평균', color='blue', linestyle='--')
-        ax1.plot(data.index, data['MA60'], label='60일 이동평균', color='red', linestyle='--')
+        ax1.plot(index, close, label='종가', color='black')
+        ax1.plot(index, ma20, label='20일 이동평균', color='blue', linestyle='--')
+        ax1.plot(index, ma60, label='60일 이동평균', color='red', linestyle='--')
         
         # 볼린저 밴드
-        ax1.plot(data.index, data['Upper_Band'], label='상단 밴드', color='green', linestyle='-')
-        ax1.plot(data.index, data['Lower_Band'], label='하단 밴드', color='green', linestyle='-')
-        ax1.fill_between(data.index, data['Upper_Band'], data['Lower_Band'], color='green', alpha=0.1)
+        ax1.plot(index, upper, label='상단 밴드', color='green', linestyle='-')
+        ax1.plot(index, lower, label='하단 밴드', color='green', linestyle='-')
+        ax1.fill_between(index, upper, lower, color='green', alpha=0.1)
         
         # MACD
-        ax2.plot(data.index, data['MACD'], label='MACD', color='blue')
-        ax2.plot(data.index, data['Signal'], label='시그널', color='red')
-        ax2.bar(data.index, data['MACD'] - data['Signal'], label='히스토그램', alpha=0.5, color='gray')
+        ax2.plot(index, macd, label='MACD', color='blue')
+        ax2.plot(index, signal, label='시그널', color='red')
+        ax2.bar(index, macd - signal, label='히스토그램', alpha=0.5, color='gray')
         ax2.axhline(y=0, color='black', linestyle='-', alpha=0.3)
         
         # RSI
-        ax3.plot(data.index, data['RSI'], label='RSI', color='purple')
+        ax3.plot(index, rsi, label='RSI', color='purple')
         ax3.axhline(y=70, color='red', linestyle='--', alpha=0.5)
         ax3.axhline(y=30, color='green', linestyle='--', alpha=0.5)
-        ax3.fill_between(data.index, data['RSI'], 70, where=(data['RSI'] >= 70), color='red', alpha=0.3)
-        ax3.fill_between(data.index, data['RSI'], 30, where=(data['RSI'] <= 30), color='green', alpha=0.3)
+        # 과매수/과매도 구간 음영 (where 마스크로 구간을 나누지 않고 기준선에서 잘라낸 값으로 한 번에 채움)
+        ax3.fill_between(index, 70, np.maximum(rsi, 70), color='red', alpha=0.3)
+        ax3.fill_between(index, np.minimum(rsi, 30), 30, color='green', alpha=0.3)
         ax3.set_ylim([0, 100])
         
         # 그래프 설정
@@ -282,22 +400,12 @@ class StockVisualizer:
             ax.xaxis.set_major_locator(ticker.MaxNLocator(10))
         
         # 금액 단위 설정
-        ax1.yaxis.set_major_formatter(ticker.StrMethodFormatter('{x:,.0f}'))
+        ax1.yaxis.set_major_formatter(_format_amount)
         
         fig.autofmt_xdate()
-        plt.tight_layout()
-        
-        # 파일 저장
-        if save_path:
-            plt.savefig(save_path, dpi=300)
-            plt.close()
-            return save_path
-        else:
-            plt.show()
-            plt.close()
-            return None
+        return self._save_or_show(fig, save_path)
     
-    def plot_stock_comparison(self, data, title=None, save_path=None):
+    def plot_stock_comparison(self, data, title=None, save_path=None, ax=None):
         """
         여러 종목 비교 시각화
         
@@ -305,15 +413,25 @@ class StockVisualizer:
             data (pandas.DataFrame): 종목별 정규화된 성과 데이터
             title (str): 차트 제목
             save_path (str): 저장 경로
+            ax (matplotlib.axes.Axes, optional): 재사용할 Axes. 지정하면 지우고 다시 그리며 Figure는 닫지 않음
             
         Returns:
             str: 저장된 파일 경로 또는 None
         """
-        fig, ax = plt.subplots(figsize=(12, 6))
+        if ax is None:
+            fig, ax = self._figure("comparison", save_path, figsize=(12, 6))
+            owns_figure = True
+        else:
+            ax.clear()
+            fig = ax.figure
+            owns_figure = False
         
-        # 각 종목별 그래프
-        for column in data.columns:
-            ax.plot(data.index, data[column], label=column)
+        # 각 종목별 그래프 (점이 많으면 종목별로 고른 위치의 합집합에만 그림)
+        values = data.to_numpy(dtype=np.float64)
+        keep = _plot_indices(fig, self.dpi, *values.T)
+        index = data.index.to_numpy()[keep]
+        for i, column in enumerate(data.columns):
+            ax.plot(index, values[keep, i], label=column)
         
         # 그래프 스타일 설정
         ax.set_title(title if title else '종목 비교', fontsize=16)
@@ -327,24 +445,24 @@ class StockVisualizer:
         fig.autofmt_xdate()
         
         # 수익률 단위 설정
-        ax.yaxis.set_major_formatter(ticker.StrMethodFormatter('{x:,.1f}%'))
+        ax.yaxis.set_major_formatter(_format_percent)
         
         # 기준선 (100%) 추가
         ax.axhline(y=100, color='black', linestyle='-', alpha=0.3)
         
-        plt.tight_layout()
-        
-        # 파일 저장
-        if save_path:
-            plt.savefig(save_path, dpi=300)
-            plt.close()
-            return save_path
-        else:
-            plt.show()
-            plt.close()
+        # 호출한 쪽에서 넘긴 Figure는 호출한 쪽에서 닫음 (배치 엔진이 없는 Figure만 직접 배치)
+        if not owns_figure:
+            if fig.get_layout_engine() is None:
+                fig.tight_layout()
+            if save_path:
+                self._write_chart(fig, save_path)
+                return save_path
             return None
+        
+        return self._save_or_show(fig, save_path)
     
-    def plot_correlation_matrix(self, codes, names=None, start=None, end=None, title=None, save_path=None):
+    def plot_correlation_matrix(self, codes, names=None, start=None, end=None, title=None, save_path=None,
+                                prices=None):
         """
         종목 간 상관관계 행렬 시각화
         
@@ -355,12 +473,13 @@ class StockVisualizer:
             end (str): 종료일자 (YYYY-MM-DD)
             title (str): 차트 제목
             save_path (str): 저장 경로
+            prices (pandas.DataFrame, optional): 이미 가져온 종가 데이터 (get_multiple_stocks 결과). 있으면 다시 가져오지 않음
             
         Returns:
             str: 저장된 파일 경로 또는 None
         """
         # 데이터 가져오기
-        df = self.stock_fetcher.get_multiple_stocks(codes, start, end)
+        df = prices if prices is not None else self.stock_fetcher.get_multiple_stocks(codes, start, end)
         
         if df.empty:
             return None
@@ -372,28 +491,45 @@ class StockVisualizer:
         col_map = {code: name for code, name in zip(codes, names) if code in df.columns}
         df = df.rename(columns=col_map)
         
-        # 수익률 계산
-        returns = df.pct_change().dropna()
-        
-        # 상관관계 계산
-        corr = returns.corr()
-        
-        # 그래프 그리기
-        plt.figure(figsize=(10, 8))
-        sns.heatmap(corr, annot=True, cmap='coolwarm', fmt='.2f', linewidths=0.5, vmin=-1, vmax=1)
-        
-        plt.title(title if title else '종목 간 상관관계', fontsize=16)
-        plt.tight_layout()
-        
-        # 파일 저장
-        if save_path:
-            plt.savefig(save_path, dpi=300)
-            plt.close()
-            return save_path
-        else:
-            plt.show()
-            plt.close()
-            return None
+        # 일간 수익률 계산 (결측 가격은 직전 가격으로 채우고, 결측 수익률이 있는 날은 제외)
+        prices = df.ffill().to_numpy(dtype=np.float64)
+        returns = prices[1:] / prices[:-1] - 1
+        returns = returns[~np.isnan(returns).any(axis=1)]
+        
+        # 상관관계 계산 (컬럼 쌍별 반복 대신 행렬 연산 한 번)
+        corr = np.atleast_2d(np.corrcoef(returns, rowvar=False))
+        labels = list(df.columns)
+        n = len(labels)
+        
+        # 그래프 그리기 (컬러바 Axes가 추가되므로 재사용할 때 Figure 전체를 비우고 다시 배치)
+        fig, ax = self._figure("correlation", save_path, figsize=(10, 8))
+        if len(fig.axes) > 1:
+            fig.clear()
+            ax = fig.add_subplot()
+            self._figures["correlation"] = (fig, ax)
+        im = ax.imshow(corr, cmap='coolwarm', vmin=-1, vmax=1, aspect='auto')
+        fig.colorbar(im, ax=ax)
+        
+        # 종목명 눈금과 칸 구분선
+        ax.set_xticks(range(n), labels, rotation=45, ha='right')
+        ax.set_yticks(range(n), labels)
+        ax.set_xticks(np.arange(n + 1) - 0.5, minor=True)
+        ax.set_yticks(np.arange(n + 1) - 0.5, minor=True)
+        ax.grid(which='minor', color='white', linewidth=0.5)
+        ax.tick_params(which='both', length=0)
+        for spine in ax.spines.values():
+            spine.set_visible(False)
+        
+        # 상관계수 표시 (칸 배경의 상대 휘도에 따라 글자색 선택)
+        rgb = im.cmap(im.norm(corr))[..., :3]
+        rgb = np.where(rgb <= 0.03928, rgb / 12.92, ((rgb + 0.055) / 1.055) ** 2.4)
+        dark = rgb @ np.array([0.2126, 0.7152, 0.0722]) <= _ANNOT_LUMINANCE
+        for i, j in np.ndindex(corr.shape):
+            ax.text(j, i, f"{corr[i, j]:.2f}", ha='center', va='center',
+                    color='white' if dark[i, j] else 'black')
+        
+        ax.set_title(title if title else '종목 간 상관관계', fontsize=16)
+        return self._save_or_show(fig, save_path)
     
     def plot_sector_performance(self, sector_data, title=None, save_path=None):
         """
@@ -410,41 +546,26 @@ class StockVisualizer:
         # 성과 데이터 정렬
         data = sector_data.sort_values('총 수익률(%)', ascending=True)
         
-        fig, ax = plt.subplots(figsize=(10, 8))
+        fig, ax = self._figure("sector", save_path, figsize=(10, 8))
         
         # 수평 막대 그래프
-        bars = ax.barh(data['기업명'], data['총 수익률(%)'], color='dodgerblue', alpha=0.7)
+        bars = ax.barh(data['기업명'].to_numpy(), data['총 수익률(%)'].to_numpy(), color='dodgerblue', alpha=0.7)
         
         # 그래프 스타일 설정
         ax.set_title(title if title else '업종별 성과', fontsize=16)
         ax.set_xlabel('총 수익률 (%)', fontsize=12)
         ax.grid(True, linestyle='--', alpha=0.7, axis='x')
         
-        # 값 레이블 추가
-        for bar in bars:
-            width = bar.get_width()
-            label_x_pos = width if width >= 0 else 0
-            ax.text(label_x_pos, bar.get_y() + bar.get_height()/2, f'{width:.1f}%', 
-                    va='center', ha='left' if width >= 0 else 'right',
-                    fontsize=9, color='black')
+        # 값 레이블 추가 (막대 끝에 배치, 음수 막대는 왼쪽 끝에 오른쪽 정렬)
+        ax.bar_label(bars, fmt='{:.1f}%', padding=2, fontsize=9, color='black')
         
         # 수익률 표시 형식
-        ax.xaxis.set_major_formatter(ticker.StrMethodFormatter('{x:,.1f}%'))
+        ax.xaxis.set_major_formatter(_format_percent)
         
         # 기준선 (0%) 추가
         ax.axvline(x=0, color='black', linestyle='-', alpha=0.3)
         
-        plt.tight_layout()
-        
-        # 파일 저장
-        if save_path:
-            plt.savefig(save_path, dpi=300)
-            plt.close()
-            return save_path
-        else:
-            plt.show()
-            plt.close()
-            return None
+        return self._save_or_show(fig, save_path)
     
     def create_stock_dashboard(self, code, name=None, period=365, save_prefix=None):
         """
@@ -459,17 +580,10 @@ class StockVisualizer:
         Returns:
             dict: 차트 파일 경로 목록
         """
+        # 종목 코드로 기업명/업종 조회 (대상 기업이 아니면 업종 없음)
+        known_name, sector = COMPANY_CODE_INDEX.get(code, (None, None))
         if not name:
-            for sector, companies in TARGET_COMPANIES.items():
-                for company in companies:
-                    if company['code'] == code:
-                        name = company['name']
-                        break
-                if name:
-                    break
-        
-        if not name:
-            name = f"종목({code})"
+            name = known_name or f"종목({code})"
         
         # 데이터 가져오기
         start_date = (datetime.now() - timedelta(days=period)).strftime('%Y-%m-%d')
@@ -486,59 +600,57 @@ class StockVisualizer:
         chart_paths = {}
         
         if save_prefix:
-            # 캔들스틱 차트
-            candlestick_path = os.path.join(self.charts_dir, f"{save_prefix}_candlestick.png")
-            chart_paths['candlestick'] = self.plot_candlestick_chart(
-                data, title=f"{name} 캔들스틱 차트", save_path=candlestick_path
-            )
-            
-            # 거래량 차트
-            volume_path = os.path.join(self.charts_dir, f"{save_prefix}_volume.png")
-            chart_paths['volume'] = self.plot_volume_chart(
-                data, title=f"{name} 거래량 차트", save_path=volume_path
-            )
+            # 차트 디렉토리는 처음 저장할 때 생성 (프로세스당 1회)
+            ensure_dir(str(self.charts_dir))
             
-            # 기술적 지표 차트
-            indicators_path = os.path.join(self.charts_dir, f"{save_prefix}_indicators.png")
-            chart_paths['indicators'] = self.plot_technical_indicators(
-                tech_data, title=f"{name} 기술적 지표", save_path=indicators_path
-            )
+            # 차트 종류 -> (그리기 함수, 데이터, 제목). 차트마다 별도 Figure를 사용하므로 스레드에서 동시에 그려서 저장
+            charts = {
+                'candlestick': (self.plot_candlestick_chart, data, f"{name} 캔들스틱 차트"),
+                'volume': (self.plot_volume_chart, data, f"{name} 거래량 차트"),
+                'indicators': (self.plot_technical_indicators, tech_data, f"{name} 기술적 지표"),
+            }
             
             # 같은 업종 종목 비교
-            sector = None
-            for s, companies in TARGET_COMPANIES.items():
-                for company in companies:
-                    if company['code'] == code:
-                        sector = s
-                        break
-                if sector:
-                    break
-            
             if sector:
                 # 상위 5개 기업 코드 추출
-                compare_codes = [company['code'] for company in TARGET_COMPANIES[sector][:5]]
-                compare_names = [company['name'] for company in TARGET_COMPANIES[sector][:5]]
+                compare_codes = list(TARGET_COMPANIES_TOP5[sector]["codes"])
+                compare_names = list(TARGET_COMPANIES_TOP5[sector]["names"])
                 
                 if code not in compare_codes:
                     compare_codes[-1] = code
                     compare_names[-1] = name
                 
-                # 성과 비교 데이터
+                # 종가는 한 번만 모아서 성과 비교와 상관관계 차트에 함께 사용
+                compare_prices = self.stock_fetcher.get_multiple_stocks(compare_codes, start_date, end_date)
                 compare_data = self.stock_fetcher.compare_performance(
-                    compare_codes, compare_names, start=start_date, end=end_date
+                    compare_codes, compare_names, start=start_date, end=end_date, prices=compare_prices
                 )
                 
                 if not compare_data.empty:
-                    comparison_path = os.path.join(self.charts_dir, f"{save_prefix}_comparison.png")
-                    chart_paths['comparison'] = self.plot_stock_comparison(
-                        compare_data, title=f"{sector} 업종 주요 기업 성과 비교", save_path=comparison_path
+                    charts['comparison'] = (
+                        self.plot_stock_comparison, compare_data, f"{sector} 업종 주요 기업 성과 비교"
                     )
-                    
-                    correlation_path = os.path.join(self.charts_dir, f"{save_prefix}_correlation.png")
-                    chart_paths['correlation'] = self.plot_correlation_matrix(
-                        compare_codes, compare_names, start=start_date, end=end_date,
-                        title=f"{sector} 업종 주요 기업 상관관계", save_path=correlation_path
+                    charts['correlation'] = (
+                        partial(self.plot_correlation_matrix, names=compare_names, prices=compare_prices),
+                        compare_codes, f"{sector} 업종 주요 기업 상관관계"
                     )
+            
+            # 차트 인코딩과 파일 쓰기가 겹치도록 쓰기는 모든 차트를 그린 뒤 한 번에 기다림
+            self._pending_writes = []
+            try:
+                with ThreadPoolExecutor(max_workers=len(charts), thread_name_prefix="chart") as pool:
+                    futures = {
+                        kind: pool.submit(
+                            plot, arg, title=title,
+                            save_path=os.path.join(self.charts_dir, f"{save_prefix}_{kind}.png")
+                        )
+                        for kind, (plot, arg, title) in charts.items()
+                    }
+                chart_paths = {kind: future.result() for kind, future in futures.items()}
+                for write in self._pending_writes:
+                    write.result()
+            finally:
+                self._pending_writes = None
         else:
             # 화면에 차트 표시
             self.plot_candlestick_chart(data, title=f"{name} 캔들스틱 차트")